@@ -0,0 +1,504 @@
+import asyncio
+import contextlib
+import json
+import re
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, NamedTuple, Pattern
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import app_func
+import metrics
+
+"""
+Локальний HTTP/JSON API над однією спільною AddressBook у пам'яті (`main.py --serve`).
+
+Сервер написано на asyncio без сторонніх залежностей. Читання (пошук, списки,
+дні народження) виконуються паралельно в пулі потоків під спільним замком читачів.
+Усі зміни стають у чергу, яку обробляє єдина задача-писач: вона забирає з черги
+пачку змін і застосовує її під ексклюзивним замком, тож читач ніколи не бачить
+напівзмінену книгу, а збереження робиться один раз на пачку.
+
+Маршрути (тіла запитів і відповідей — JSON):
+    GET    /contacts?page=N&per_page=M        усі контакти посторінково
+    POST   /contacts                          {"name", "phone", "birthday"} — додати / оновити телефон
+    GET    /contacts/<ім'я>                   один контакт
+    PATCH  /contacts/<ім'я>                   {"name", "phone", "email", "address"} — редагувати
+    DELETE /contacts/<ім'я>                   видалити
+    POST   /contacts/<ім'я>/notes             {"text", "tags"} — додати нотатку
+    PUT    /contacts/<ім'я>/notes/<індекс>    {"text", "tags"} — редагувати нотатку
+    DELETE /contacts/<ім'я>/notes/<індекс>    видалити нотатку
+    GET    /find?q=...&page=N&per_page=M      пошук контактів за підрядком
+    GET    /birthdays?days=N                  найближчі дні народження
+    GET    /notes/search?q=...&limit=K        пошук нотаток (слова AND / OR або #тег)
+    GET    /notes/by-tag                      нотатки, згруповані за тегами
+"""
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+READ_WORKERS = 4  # потоків для паралельних читань
+WRITE_BATCH = 64  # скільки змін писач застосовує за одне захоплення замка
+MAX_BODY = 1 << 20  # найбільше тіло запиту, байтів
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+class ApiError(Exception):
+    """
+    Помилка запиту, що повертається клієнту з HTTP-статусом `status`.
+    Додаткові поля (наприклад, suggestions) потрапляють у JSON відповіді.
+    """
+
+    def __init__(self, status: int, message: str, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+class ReadWriteLock:
+    """
+    Замок читачів-писача для asyncio: одночасно або будь-скільки читачів, або один писач.
+    Писач, що чекає, не пропускає нових читачів, тож потік читань не морить його голодом.
+    """
+
+    def __init__(self):
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextlib.asynccontextmanager
+    async def reading(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._writing and not self._writers_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def writing(self):
+        async with self._condition:
+            self._writers_waiting += 1
+            try:
+                await self._condition.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class Request(NamedTuple):
+    path_args: tuple  # частини шляху з маршруту (ім'я контакту, індекс нотатки)
+    query: dict
+    body: dict
+
+
+# --- Перетворення в JSON ---
+
+def note_to_json(note) -> dict:
+    return {"text": note.text, "tags": list(note.tags)}
+
+
+def contact_to_json(contact) -> dict:
+    return {
+        "name": contact.name,
+        "phone": contact.phone,
+        "birthday": contact.birthday.strftime("%d.%m.%Y") if contact.birthday else None,
+        "email": contact.email,
+        "address": contact.address,
+        "notes": [note_to_json(note) for note in contact.notes],
+    }
+
+
+def _positive_int(query: dict, name: str, default):
+    value = query.get(name)
+    if value is None:
+        return default
+    if not value.isdigit() or int(value) <= 0:
+        raise ApiError(400, f"Помилка: Параметр {name} має бути додатним числом.")
+    return int(value)
+
+
+def _required(source: dict, name: str) -> str:
+    value = source.get(name)
+    if not isinstance(value, str) or not value.strip():
+        raise ApiError(400, f"Помилка: Не вказано поле '{name}'.")
+    return value.strip()
+
+
+def _optional(body: dict, name: str):
+    value = body.get(name)
+    if value is not None and not isinstance(value, str):
+        raise ApiError(400, f"Помилка: Поле '{name}' має бути рядком.")
+    return value or None
+
+
+def _existing(book, name: str):
+    contact = book.get_contact(name)
+    if contact is None:
+        raise ApiError(404, f"Помилка: Контакт '{name}' не знайдено.", suggestions=book.suggest_names(name))
+    return contact
+
+
+def _note_tokens(body: dict) -> list:
+    """
+    Аргументи команд add-note / edit-note з тіла {"text": ..., "tags": [...]}.
+    """
+    text = _required(body, "text")
+    tags = body.get("tags") or []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ApiError(400, "Помилка: Поле 'tags' має бути списком рядків.")
+    tags = [tag.strip() for tag in tags if tag.strip()]
+    return [text, "tags:" + ",".join(tags)] if tags else [text]
+
+
+def _command_result(message: str) -> dict:
+    if message.startswith(app_func.ERROR_PREFIXES):
+        raise ApiError(400, message)
+    return {"message": message}
+
+
+# --- Читання (виконуються паралельно під замком читачів) ---
+
+def _page(records, query: dict) -> dict:
+    page = _positive_int(query, "page", 1)
+    per_page = _positive_int(query, "per_page", app_func.DEFAULT_PAGE_SIZE)
+    selected = islice(records, (page - 1) * per_page, page * per_page)
+    return {"page": page, "per_page": per_page, "contacts": [contact_to_json(c) for c in selected]}
+
+
+def list_contacts(book, request: Request) -> dict:
+    result = _page(iter(book.data.values()), request.query)
+    result["total"] = len(book.data)
+    return result
+
+
+def get_contact(book, request: Request) -> dict:
+    return contact_to_json(_existing(book, request.path_args[0]))
+
+
+def find_contacts(book, request: Request) -> dict:
+    query = _required(request.query, "q").lower()
+    return _page(app_func.iter_matching_contacts(query, book), request.query)
+
+
+def upcoming_birthdays(book, request: Request) -> dict:
+    days = _positive_int(request.query, "days", 7)
+    return {"days": days, "birthdays": book.get_upcoming_birthdays(days)}
+
+
+def search_notes(book, request: Request) -> dict:
+    query = _required(request.query, "q").lower()
+    limit = _positive_int(request.query, "limit", None)
+    try:
+        total, matches = app_func.find_notes(query, book, limit)
+    except ValueError as e:
+        raise ApiError(400, f"Помилка: {e}")
+    return {"total": total, "notes": [{"contact": name, **note_to_json(note)} for name, note in matches]}
+
+
+def notes_by_tag(book, request: Request) -> dict:
+    tag_index = book.index("tags")
+    return {"tags": {
+        tag: [{"contact": name, **note_to_json(note)} for name, note in tag_index.notes(tag)]
+        for tag in tag_index.tags()
+    }}
+
+
+# --- Зміни (виконуються по черзі єдиним писачем) ---
+
+def add_contact(book, request: Request) -> dict:
+    body = request.body
+    name, phone = _required(body, "name"), _required(body, "phone")
+    # Новий контакт без дня народження команда add не створює.
+    birthday = _optional(body, "birthday") if name in book.data else _required(body, "birthday")
+    return _command_result(app_func.add_contact(name, phone, birthday, book))
+
+
+def edit_contact(book, request: Request) -> dict:
+    name = request.path_args[0]
+    _existing(book, name)
+    fields = [_optional(request.body, field) or "-" for field in ("name", "phone", "email", "address")]
+    return _command_result(app_func.edit_contact(name, *fields, book))
+
+
+def delete_contact(book, request: Request) -> dict:
+    name = request.path_args[0]
+    _existing(book, name)
+    return _command_result(app_func.delete_contact(name, book))
+
+
+def add_note(book, request: Request) -> dict:
+    name = request.path_args[0]
+    _existing(book, name)
+    return _command_result(app_func.add_note([name, *_note_tokens(request.body)], book))
+
+
+def edit_note(book, request: Request) -> dict:
+    name, index = request.path_args
+    _existing(book, name)
+    return _command_result(app_func.edit_note([name, index, *_note_tokens(request.body)], book))
+
+
+def delete_note(book, request: Request) -> dict:
+    name, index = request.path_args
+    _existing(book, name)
+    return _command_result(app_func.delete_note([name, index], book))
+
+
+class Route(NamedTuple):
+    method: str
+    pattern: Pattern
+    handler: Callable[[object, Request], dict]
+    write: bool = False
+
+
+ROUTES = (
+    Route("GET", re.compile(r"/contacts"), list_contacts),
+    Route("POST", re.compile(r"/contacts"), add_contact, write=True),
+    Route("GET", re.compile(r"/contacts/([^/]+)"), get_contact),
+    Route("PATCH", re.compile(r"/contacts/([^/]+)"), edit_contact, write=True),
+    Route("DELETE", re.compile(r"/contacts/([^/]+)"), delete_contact, write=True),
+    Route("POST", re.compile(r"/contacts/([^/]+)/notes"), add_note, write=True),
+    Route("PUT", re.compile(r"/contacts/([^/]+)/notes/([^/]+)"), edit_note, write=True),
+    Route("DELETE", re.compile(r"/contacts/([^/]+)/notes/([^/]+)"), delete_note, write=True),
+    Route("GET", re.compile(r"/find"), find_contacts),
+    Route("GET", re.compile(r"/birthdays"), upcoming_birthdays),
+    Route("GET", re.compile(r"/notes/search"), search_notes),
+    Route("GET", re.compile(r"/notes/by-tag"), notes_by_tag),
+)
+
+
+def match_route(method: str, path: str):
+    """
+    Повертає (маршрут, розкодовані частини шляху) або кидає ApiError 404 / 405.
+    """
+    path_matched = False
+    for route in ROUTES:
+        match = route.pattern.fullmatch(path)
+        if match is None:
+            continue
+        if route.method == method:
+            return route, tuple(unquote(part) for part in match.groups())
+        path_matched = True
+    if path_matched:
+        raise ApiError(405, f"Помилка: Метод {method} не підтримується для {path}.")
+    raise ApiError(404, f"Помилка: Невідомий шлях {path}.")
+
+
+class ApiServer:
+    """
+    HTTP/JSON сервер над спільною книгою. Запуск: `asyncio.run(ApiServer(book).serve())`;
+    з іншого потоку зупиняється через shutdown().
+    Якщо для книги ввімкнено автозбереження, писач лише будить його; інакше
+    кожна пачка змін записується на диск одразу.
+    """
+
+    def __init__(self, book, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 read_workers: int = READ_WORKERS):
+        self.book = book
+        self.host = host
+        self.port = port
+        self.latency = metrics.LatencyHistogram()
+        self._pool = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="api-read")
+        # Окремий потік писача: довгі читання в пулі не затримують застосування змін.
+        self._write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-write")
+        self._lock = None
+        self._writes = None
+        self._writer = None
+        self._server = None
+        self._connections = set()
+        self._loop = None
+        self._stopping = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._lock = ReadWriteLock()
+        self._writes = asyncio.Queue()
+        self._stopping = asyncio.Event()
+        self._writer = asyncio.create_task(self._write_loop())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        """
+        Перестає приймати з'єднання, закриває відкриті й дочікується застосування
+        всіх змін, що вже стоять у черзі.
+        """
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        await self._writes.join()
+        self._writer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._writer
+        self._pool.shutdown()
+        self._write_pool.shutdown()
+
+    async def serve(self, ready: Callable = None):
+        """
+        Запускає сервер і працює до SIGINT / SIGTERM / SIGHUP або виклику shutdown().
+        `ready(server)` викликається, щойно сервер почав слухати порт.
+        """
+        await self.start()
+        if threading.current_thread() is threading.main_thread():
+            for signal_name in ("SIGINT", "SIGTERM", "SIGHUP"):
+                if hasattr(signal, signal_name):
+                    with contextlib.suppress(NotImplementedError):  # Windows
+                        self._loop.add_signal_handler(getattr(signal, signal_name), self._stopping.set)
+        if ready is not None:
+            ready(self)
+        # Поки сервер працює, чужі зміни підтягує лише писач (див. _apply_writes).
+        with app_func.writer_sync(self.book):
+            try:
+                await self._stopping.wait()
+            finally:
+                await self.stop()
+
+    def shutdown(self):
+        """
+        Просить сервер зупинитися (можна викликати з будь-якого потоку, повторно теж).
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    # --- Писач ---
+
+    async def _write_loop(self):
+        while True:
+            batch = [await self._writes.get()]
+            while len(batch) < WRITE_BATCH and not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+            try:
+                async with self._lock.writing():
+                    results = await self._loop.run_in_executor(self._write_pool, self._apply_writes, batch)
+                for (_, _, future), result in zip(batch, results):
+                    if future.done():
+                        continue  # клієнт відключився, а зміна все одно застосована
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+
+    def _apply_writes(self, batch) -> list:
+        """
+        Застосовує пачку змін одну за одною (кожна — окремий крок undo)
+        і зберігає їх разом. Повертає результат або виняток для кожної зміни.
+        Зміни інших процесів підтягуються тут, під замком писача: читачі в цей
+        момент не обходять book.data, а фоновий запис сам не синхронізує (writer_sync).
+        """
+        saver = self.book._autosaver
+        results = []
+        with saver.lock if saver is not None else contextlib.nullcontext():
+            try:
+                app_func.sync_data(self.book)
+            except Exception as e:
+                return [e] * len(batch)
+            with app_func.deferred_saves(self.book):
+                for handler, request, _ in batch:
+                    try:
+                        with self.book.undoable():
+                            results.append(handler(self.book, request))
+                    except Exception as e:
+                        results.append(e)
+        return results
+
+    # --- HTTP ---
+
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        started = time.perf_counter()
+        try:
+            url = urlsplit(target)
+            route, path_args = match_route(method, url.path)
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                raise ApiError(400, "Помилка: Тіло запиту не є коректним JSON.")
+            if not isinstance(payload, dict):
+                raise ApiError(400, "Помилка: Тіло запиту має бути JSON-об'єктом.")
+            request = Request(path_args, dict(parse_qsl(url.query)), payload)
+
+            if route.write:
+                future = self._loop.create_future()
+                await self._writes.put((route.handler, request, future))
+                status, result = 200, await future
+            else:
+                async with self._lock.reading():
+                    result = await self._loop.run_in_executor(self._pool, route.handler, self.book, request)
+                status = 200
+        except ApiError as e:
+            status, result = e.status, {"error": str(e), **e.extra}
+        except Exception as e:
+            status, result = 500, {"error": f"Помилка: {e}"}
+        self.latency.add(time.perf_counter() - started)
+        return status, result
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(asyncio.current_task())
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                length = headers.get("content-length", "0")
+                if len(parts) != 3 or not length.isdigit():
+                    await self._respond(writer, 400, {"error": "Помилка: Некоректний HTTP-запит."}, False)
+                    break
+                if int(length) > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "Помилка: Завелике тіло запиту."}, False)
+                    break
+                method, target, version = parts
+                body = await reader.readexactly(int(length)) if int(length) else b""
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+                status, result = await self._dispatch(method.upper(), target, body)
+                await self._respond(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, result: dict, keep_alive: bool):
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
@@ -1,8 +1,20 @@
 from collections import UserDict
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
-import pickle
+import calendar
 import os
 import re
+import sys
+import threading
+
+import autosave
+import book_format
+import history
+import indexes
+import mapped_storage
+import metrics
+import sqlite_storage
+import storage
 
 """
 Модуль архітектора (Людина 1) + логіка Людини 2 (додавання контактів, дні народження) + Людина 3 (пошук і виведення).
@@ -24,6 +36,9 @@ class Contact:
         birthday (datetime.date): Дата народження.
     """
 
+    # Без __dict__ на кожен екземпляр: менше пам'яті та компактніший pickle.
+    __slots__ = ("name", "phone", "notes", "email", "address", "birthday")
+
     def __init__(self, name: str):
         self.name = name
         self.phone = None
@@ -32,6 +47,26 @@ class Contact:
         self.address = None
         self.birthday = None
 
+    @classmethod
+    def restore(cls, name, phone, email, address, birthday, notes):
+        """
+        Створює контакт з уже перевірених полів (під час читання сховища), без валідації.
+        """
+        contact = cls.__new__(cls)
+        contact.name, contact.phone, contact.email = name, phone, email
+        contact.address, contact.birthday, contact.notes = address, birthday, notes
+        return contact
+
+    @staticmethod
+    def validate_phone(phone: str):
+        """
+        Перевіряє номер телефону, не змінюючи контакт.
+        Raises:
+            ValueError: Якщо телефон не складається з 10 цифр.
+        """
+        if not phone.isdigit() or len(phone) != 10:
+            raise ValueError("Телефон повинен містити рівно 10 цифр.")
+
     def add_phone(self, phone: str):
         """
         Встановлює новий номер телефону для контакту після перевірки.
@@ -40,8 +75,7 @@ class Contact:
         Raises:
             ValueError: Якщо телефон не складається з 10 цифр.
         """
-        if not phone.isdigit() or len(phone) != 10:
-            raise ValueError("Телефон повинен містити рівно 10 цифр.")
+        self.validate_phone(phone)
         self.phone = phone
 
     def add_birthday(self, birthday_str: str):
@@ -72,10 +106,36 @@ class Contact:
     def set_address(self, address: str):
         self.address = address
 
+    def __getstate__(self):
+        return (self.name, self.phone, self.notes, self.email, self.address, self.birthday)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # Старі знімки (до __slots__) зберігали __dict__ екземпляра.
+            state = (state.get("name"), state.get("phone"), state.get("notes", []),
+                     state.get("email"), state.get("address"), state.get("birthday"))
+        self.name, self.phone, self.notes, self.email, self.address, self.birthday = state
+
     def __str__(self):
         return f"Contact(name={self.name}, phone={self.phone}, notes={len(self.notes)})"
 
 
+DEFAULT_DATA_FILE = "data/addressbook.pkl"
+
+
+INDEX_FACTORIES = {
+    "trigram": indexes.TrigramIndex,
+    "phone": indexes.phone_index,
+    "email": indexes.email_index,
+    "name": indexes.name_index,
+    "birthday": indexes.birthday_index,
+    "tags": indexes.TagIndex,
+    "text": indexes.TextIndex,
+    "fuzzy": indexes.FuzzyNameIndex,
+    "prefix": indexes.PrefixIndex,
+}
+
+
 class AddressBook(UserDict):
     """
     Клас для зберігання об'єктів Contact.
@@ -85,12 +145,165 @@ class AddressBook(UserDict):
     """
     def __init__(self):
         super().__init__()
+        self._changed = {}  # імена змінених контактів у порядку першої зміни
+        self._storage = None
+        self._save_deferred = 0
+        self._writer_sync = 0
+        self._indexes = None
+        self._index_lock = threading.Lock()
+        self._history = history.ChangeLog()
+        self._autosaver = None
+
+    def __getstate__(self):
+        # У знімок потрапляють лише контакти; службовий стан відновлюється при завантаженні.
+        data = self.data if isinstance(self.data, dict) else dict(self.data.items())
+        return {"data": data}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._changed = {}
+        self._storage = None
+        self._save_deferred = 0
+        self._writer_sync = 0
+        self._indexes = None
+        self._index_lock = threading.Lock()
+        self._history = history.ChangeLog()
+        self._autosaver = None
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._history.in_transaction
+
+    def undoable(self):
+        """
+        Контекстний менеджер: усі зміни всередині блоку — один крок для undo.
+        """
+        return self._history.command()
+
+    def before_change(self, name: str):
+        """
+        Запам'ятовує стан контакту перед зміною для undo / rollback.
+        Викликається перед будь-якою зміною контакту «на місці».
+        """
+        self._history.record(name, self.data.get(name))
+
+    def touch(self, name: str):
+        """
+        Позначає контакт як змінений (для журналу змін) і оновлює індекси.
+        Викликається після будь-якої зміни контакту «на місці».
+        """
+        self._changed[name] = None
+        if self._autosaver is not None:
+            self._autosaver.notify()
+        if self._indexes:
+            contact = self.data.get(name)
+            for index in self._indexes.values():
+                index.update(name, contact)
+
+    def reindex(self, names=None):
+        """
+        Оновлює індекси після змін, що прийшли з диска (інший процес), без позначення
+        контактів зміненими. names=None — книгу перечитано: індекси будуються заново.
+        """
+        with self._index_lock:
+            if names is None:
+                self._indexes = None
+            elif self._indexes:
+                for name in names:
+                    contact = self.data.get(name)
+                    for index in self._indexes.values():
+                        index.update(name, contact)
+
+    def index(self, kind: str):
+        """
+        Повертає індекс заданого типу (див. INDEX_FACTORIES). Кожен індекс будується
+        ліниво при першому зверненні до нього, тож завантаження книги та команди,
+        яким він не потрібен, не витрачають на нього час.
+        """
+        index = self._indexes.get(kind) if self._indexes else None
+        if index is not None:
+            return index
+        # Паралельні читачі (режим --serve) не будують той самий індекс двічі.
+        with self._index_lock:
+            if self._indexes is None:
+                self._indexes = {}
+            index = self._indexes.get(kind)
+            if index is None:
+                # Сховище з готовими таблицями пошуку (.pabm) віддає індекс без побудови.
+                prebuilt = getattr(self.data, "prebuilt_index", None)
+                index = prebuilt(kind) if prebuilt is not None else None
+                if index is None:
+                    index = INDEX_FACTORIES[kind]()
+                    build = getattr(index, "build", None)
+                    if build is not None:
+                        build(self.data.items())
+                    else:
+                        for name, contact in self.data.items():
+                            index.update(name, contact)
+                self._indexes[kind] = index
+        return index
+
+    def find_by_phone(self, phone: str):
+        """
+        Повертає список контактів з точно таким номером телефону (лише для читання, див. peek).
+        """
+        return [self.peek(name) for name in self.index("phone").get(phone)]
+
+    def find_by_email(self, email: str):
+        """
+        Повертає список контактів з таким email (без урахування регістру, лише для читання).
+        """
+        return [self.peek(name) for name in self.index("email").get(email.casefold())]
+
+    def find_by_name(self, name: str):
+        """
+        Повертає список контактів, ім'я яких збігається з `name` без урахування регістру
+        (лише для читання).
+        """
+        return [self.peek(key) for key in self.index("name").get(name.casefold())]
+
+    def suggest_names(self, name: str, limit: int = 3):
+        """
+        Повертає до `limit` імен контактів, схожих на `name` (можливі описки).
+        """
+        return self.index("fuzzy").lookup(name, limit)
+
+    def complete_names(self, prefix: str, limit: int = None):
+        """
+        Повертає імена контактів, що починаються з `prefix` (без урахування регістру),
+        у алфавітному порядку — не більше `limit`.
+        """
+        return self.index("prefix").complete(prefix, limit)
+
+    def complete_tags(self, prefix: str, limit: int = None):
+        """
+        Повертає теги нотаток (у нижньому регістрі), що починаються з `prefix`.
+        """
+        return self.index("tags").complete(prefix.lower(), limit)
+
+    def search_candidates(self, query: str, snapshot: bool = False):
+        """
+        Повертає ітератор контактів, які можуть містити підрядок `query`
+        (у нижньому регістрі), у порядку книги. Для коротких запитів — усі контакти.
+        snapshot=True — кандидати беруться зі списку імен, знятого одразу (див. peek_many),
+        тож ітератор можна призупиняти, поки книга змінюється.
+        """
+        names = self.index("trigram").candidates(query)
+        if names is None:
+            if not snapshot:
+                return iter(self.data.values())
+            names = list(self.data)
+        if snapshot:
+            return self.peek_many(names)
+        return (self.peek(name) for name in names)
 
     def add_contact(self, contact: Contact):
         """
         Додає або оновлює контакт у словнику за ім’ям.
         """
+        self.before_change(contact.name)
         self.data[contact.name] = contact
+        self.touch(contact.name)
 
     def get_contact(self, name: str):
         """
@@ -98,12 +311,31 @@ class AddressBook(UserDict):
         """
         return self.data.get(name)
 
+    def peek(self, name: str):
+        """
+        Повертає контакт лише для читання. Сховище .pabm декодує його з відображення
+        без кешування — зміни такого об'єкта не потрапляють у книгу.
+        """
+        peek = getattr(self.data, "peek", None)
+        return peek(name) if peek is not None else self.data[name]
+
+    def peek_many(self, names):
+        """
+        Генератор контактів лише для читання (див. peek) за знятим заздалегідь
+        списком імен; контакти, видалені після знімка, пропускаються.
+        """
+        for name in names:
+            if name in self.data:
+                yield self.peek(name)
+
     def delete_contact(self, name: str):
         """
         Видаляє контакт з книги за ім’ям.
         """
         if name in self.data:
+            self.before_change(name)
             del self.data[name]
+            self.touch(name)
 
     def find(self, name: str):
         """
@@ -114,18 +346,31 @@ class AddressBook(UserDict):
     def get_upcoming_birthdays(self, days: int = 7):
         """
         Повертає список словників з іменами контактів і датами привітань,
-        якщо день народження у найближчі `days` днів.
+        якщо день народження у найближчі `days` днів, у хронологічному порядку.
         Переносить ДН з вихідних на понеділок.
+        Використовує календарний індекс, тож вартість — O(days + кількість збігів).
         """
         today = datetime.today().date()
         end_date = today + timedelta(days=days)
+        birthdays = self.index("birthday")
         result = []
-
-        for contact in self.data.values():
-            if contact.birthday:
-                bday = contact.birthday.replace(year=today.year)
-                if bday < today:
-                    bday = bday.replace(year=today.year + 1)
+        seen = set()
+
+        # Найближчий ДН кожного контакту лежить у межах року від сьогодні,
+        # тому достатньо пройти не більше 366 календарних днів.
+        for offset in range(min(days, 365) + 1):
+            bday = today + timedelta(days=offset)
+            keys = [(bday.month, bday.day)]
+            if (bday.month, bday.day) == (3, 1) and not calendar.isleap(bday.year):
+                keys.append((2, 29))  # у невисокосний рік 29 лютого святкуємо 1 березня
+
+            for key in keys:
+                if key in seen:
+                    continue
+                seen.add(key)
+                names = birthdays.get(key)
+                if not names:
+                    continue
 
                 congratulation_date = bday
                 if bday.weekday() == 5:  # Saturday
@@ -133,11 +378,12 @@ class AddressBook(UserDict):
                 elif bday.weekday() == 6:  # Sunday
                     congratulation_date = bday + timedelta(days=1)
 
-                if today <= congratulation_date <= end_date:
-                    result.append({
-                        "name": contact.name,
-                        "congratulation_date": congratulation_date.strftime("%Y.%m.%d")
-                    })
+                if congratulation_date <= end_date:
+                    for name in names:
+                        result.append({
+                            "name": self.peek(name).name,
+                            "congratulation_date": congratulation_date.strftime("%Y.%m.%d")
+                        })
 
         return result
 
@@ -145,26 +391,186 @@ class AddressBook(UserDict):
         return "\n".join(str(contact) for contact in self.data.values())
 
 
-def save_data(address_book: AddressBook, filename: str = "data/addressbook.pkl"):
+def open_storage(filename: str):
+    """
+    Повертає сховище для файлу за його розширенням:
+    .db/.sqlite — SQLite, .pabm — незмінний знімок для mmap із журналом змін,
+    інше — бінарний знімок (book_format) із журналом змін.
+    """
+    if sqlite_storage.is_sqlite_path(filename):
+        return sqlite_storage.SqliteStorage(filename, Contact, Note)
+    if mapped_storage.is_mapped_path(filename):
+        return mapped_storage.MappedStorage(filename, BOOK_FACTORIES)
+    return storage.SnapshotStorage(filename, BOOK_FACTORIES)
+
+
+def save_data(address_book: AddressBook, filename: str = None, force: bool = False):
+    """
+    Зберігає об'єкт AddressBook (за замовчуванням — у сховище, з якого його завантажено).
+    Якщо книга вже прив'язана до цього сховища, записуються лише змінені контакти:
+    рядки SQLite або записи журналу змін (O(1) байтів на мутацію).
+    Інакше файл `filename` повністю перезаписується, і книга прив'язується до нього.
+    Усередині deferred_saves() звичайні збереження пропускаються (крім force=True),
+    а з увімкненим автозбереженням лише будять фоновий потік, що запише зміни.
+    """
+    if filename is None and not force:
+        if address_book._save_deferred:
+            return
+        if address_book._autosaver is not None:
+            address_book._autosaver.notify()
+            return
+
+    with metrics.METRICS.timer("save_data"):
+        target = address_book._storage
+        if target is None or (filename is not None and target.filename != os.path.abspath(filename)):
+            target = open_storage(filename or DEFAULT_DATA_FILE)
+
+        if target is address_book._storage:
+            # Спершу підтягуємо чужі зміни, щоб запис не затер їх (див. sync_data).
+            # Усередині writer_sync() це робить писач, а не потік збереження.
+            with getattr(target, "locked", nullcontext)():
+                if not address_book._writer_sync:
+                    sync_data(address_book)
+                written = target.write_changes(address_book, list(address_book._changed))
+        else:
+            written = target.write_all(address_book)
+            address_book._storage = target
+        address_book._changed.clear()
+    metrics.METRICS.count("save_data.bytes", written or 0)
+
+
+@contextmanager
+def deferred_saves(address_book: AddressBook):
+    """
+    Відкладає save_data() для книги до виходу з блоку: замість збереження після
+    кожної команди зміни записуються один раз наприкінці.
+    """
+    address_book._save_deferred += 1
+    try:
+        yield address_book
+    finally:
+        address_book._save_deferred -= 1
+        if not address_book._save_deferred:
+            save_data(address_book)
+
+
+@contextmanager
+def writer_sync(address_book: AddressBook):
+    """
+    Усередині блоку save_data() не підтягує чужі зміни: sync_data() викликає сам
+    єдиний писач перед своїми змінами, коли книгу ніхто не читає (режим --serve).
+    Інакше фоновий запис змінював би book.data під паралельними читачами.
+    Журнал дописується і без попередньої синхронізації, тож чужі записи не губляться.
+    """
+    address_book._writer_sync += 1
+    try:
+        yield address_book
+    finally:
+        address_book._writer_sync -= 1
+
+
+def enable_autosave(address_book: AddressBook, debounce: float = autosave.DEFAULT_DEBOUNCE) -> autosave.AutoSaver:
+    """
+    Вмикає фонове автозбереження: команди більше не пишуть на диск самі, а зміни
+    (зокрема нотаток) записуються пачкою після `debounce` секунд тиші.
+    Незавершена транзакція не записується до commit.
+    Команди, що змінюють книгу, слід виконувати під AutoSaver.lock.
+    """
+    def flush():
+        if address_book._changed and not address_book._save_deferred:
+            save_data(address_book, force=True)
+
+    address_book._autosaver = autosave.AutoSaver(flush, debounce).start()
+    return address_book._autosaver
+
+
+def disable_autosave(address_book: AddressBook):
     """
-    Зберігає об'єкт AddressBook у файл через pickle.
+    Зупиняє автозбереження, дописавши всі незбережені зміни.
     """
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    with open(filename, "wb") as file:
-        pickle.dump(address_book, file)
+    saver, address_book._autosaver = address_book._autosaver, None
+    if saver is not None:
+        saver.stop()
 
 
-def load_data(filename: str = "data/addressbook.pkl") -> AddressBook:
+def sync_data(address_book: AddressBook) -> int:
+    """
+    Підтягує зміни, які інші процеси (сесії main.py) записали в те саме сховище:
+    дочитує лише нові записи журналу, а якщо знімок замінено — перечитує книгу.
+    Незбережені локальні зміни контактів зберігаються й перекривають версію з диска.
+    Для SQLite, якщо базу змінило інше з'єднання, скидається кеш завантажених контактів
+    і перебудовуються індекси.
+    Returns:
+        int: Кількість оновлених контактів (після повного перечитування — усіх).
+    """
+    sync = getattr(address_book._storage, "sync", None)
+    if sync is None:
+        return 0
+    names = sync(address_book, list(address_book._changed))
+    if names:
+        metrics.METRICS.count("sync_data.merged", len(names))
+    elif names is None:
+        metrics.METRICS.count("sync_data.reloads")
+    address_book.reindex(names)
+    return len(address_book.data) if names is None else len(names)
+
+
+def load_data(filename: str = DEFAULT_DATA_FILE) -> AddressBook:
     """
     Завантажує AddressBook з файлу, якщо існує, або створює новий.
+    Файли .db/.sqlite відкриваються як SQLite-база з лінивим завантаженням контактів,
+    .pabm — через mmap без читання книги в пам'ять.
+    Для знімка з журналом: якщо знімок пошкоджено, береться найновіше ціле попереднє покоління,
+    а поверх знімка відтворюється журнал змін.
     """
-    if os.path.exists(filename):
-        with open(filename, "rb") as file:
-            return pickle.load(file)
-    return AddressBook()
+    with metrics.METRICS.timer("load_data"):
+        source = open_storage(filename)
+        address_book = source.load(AddressBook)
+        address_book._storage = source
+    return address_book
+
+
+def migrate_data(source_filename: str, target_filename: str) -> int:
+    """
+    Одноразово переносить книгу (знімок разом із журналом) в інше сховище,
+    наприклад у базу SQLite або знімок .pabm.
+    Returns:
+        int: Кількість перенесених контактів.
+    """
+    address_book = load_data(source_filename)
+    save_data(address_book, target_filename)
+    return len(address_book.data)
+
+
+migrate_to_sqlite = migrate_data  # назва з часів, коли переносити можна було лише в SQLite
+
+
+def upgrade_legacy_data(filename: str = DEFAULT_DATA_FILE) -> int:
+    """
+    Переписує знімок і журнал у старому форматі pickle в поточний формат.
+    Звичайне load_data такі файли відхиляє: pickle може виконати довільний код,
+    тож перетворювати варто лише власні, довірені файли.
+    Returns:
+        int: Кількість контактів у переписаній книзі.
+    """
+    return storage.upgrade_legacy(filename, BOOK_FACTORIES)
 
 
 # --- Людина 2: Логіка Контактів (Create + Birthday) ---
+def _with_name_suggestions(message: str, name: str, book) -> str:
+    """
+    Доповнює повідомлення «контакт не знайдено» підказкою зі схожими іменами.
+    """
+    suggestions = book.suggest_names(name)
+    if suggestions:
+        message += "\n💡 Можливо, ви мали на увазі: " + ", ".join(suggestions)
+    return message
+
+
+# Префікси повідомлень команд, що означають помилку (для коду виходу та HTTP API).
+ERROR_PREFIXES = ("Помилка", "❌", "⚠️")
+
+
 def input_error(func):
     """
     Декоратор для обробки помилок користувацького вводу при виклику функцій.
@@ -209,9 +615,14 @@ def add_contact(*args):
             return f"❌ Помилка створення контакту: {str(e)}"
     else:
         try:
-            record.add_phone(phone)
+            Contact.validate_phone(phone)
         except ValueError as e:
             return f"❌ {str(e)}"
+        if record.phone == phone:
+            return message
+        # Крок історії записується лише тоді, коли контакт справді зміниться.
+        book.before_change(name)
+        record.add_phone(phone)
 
     book.add_contact(record)
     save_data(book)
@@ -259,6 +670,9 @@ def get_upcoming_birthdays(*args):
     return '\n'.join(result)
 
 # --- Людина 3: Логіка Контактів (Read: Search / Show All) ---
+DEFAULT_PAGE_SIZE = 20  # контактів на екран у посторінковому виводі
+
+
 def format_contact(record) -> str:
     """
     Формує текстове представлення одного контакту:
@@ -306,28 +720,7 @@ def Contactss(args, book) -> str:
     query = " ".join(args).strip().lower()
     if not query:
         return "Порожній запит. Введіть ім'я або частину номера."
-    matches = []
-    for record in book.data.values():
-        name_val = str(getattr(record, "name", "") or "").lower()
-        phone_val = str(getattr(record, "phone", "") or "").lower()
-        email_val = str(getattr(record, "email", "") or "").lower()
-        addr_val = str(getattr(record, "address", "") or "").lower()
-        
-        field_match = any(       # чи є збіг по полях контакту
-            query in field
-            for field in (name_val, phone_val, email_val, addr_val)
-        )
-
-        note_match = False       # перевірка нотаток: текст + теги
-        for note in getattr(record, "notes", []):
-            text_match = query in note.text.lower()
-            tag_match = any(query in tag.lower() for tag in note.tags)
-            if text_match or tag_match:
-                note_match = True
-                break
-
-        if field_match or note_match:
-            matches.append(record)
+    matches = list(iter_matching_contacts(query, book))
     if not matches:
         return f"Нічого не знайдено за запитом: '{query}'."
     chunks = [format_contact(rec) for rec in matches]
@@ -341,8 +734,57 @@ def show_all_contacts(book) -> str:
     """
     if not book.data:
         return "Книга контактів порожня."
-    lines = [format_contact(record) for record in book.data.values()]
-    return "\n\n".join(lines)
+    return "\n\n".join(iter_contacts(book))
+
+
+def iter_contacts(book, snapshot: bool = False):
+    """
+    Генератор: форматує контакти книги по одному, не будуючи весь вивід у пам'яті.
+    snapshot=True — за списком імен, знятим одразу (генератор можна призупиняти між змінами книги).
+    """
+    records = book.peek_many(list(book.data)) if snapshot else book.data.values()
+    for record in records:
+        yield format_contact(record)
+
+
+def iter_matching_contacts(query: str, book, snapshot: bool = False):
+    """
+    Генератор контактів, у полях або нотатках яких є підрядок `query`
+    (уже в нижньому регістрі). Перший збіг повертається без повного проходу книги.
+    snapshot — див. AddressBook.search_candidates.
+    """
+    for record in book.search_candidates(query, snapshot):
+        if any(query in field for field in indexes.contact_search_fields(record)):
+            yield record
+
+
+def parse_paging(args: list):
+    """
+    Вилучає з аргументів параметри посторінкового виводу.
+    Синтаксис: ... [--page N] [--per-page M]
+    Returns:
+        tuple: (решта аргументів, номер сторінки або None, розмір сторінки)
+    Raises:
+        ValueError: Якщо N або M не є додатними числами.
+    """
+    rest = []
+    page = None
+    per_page = DEFAULT_PAGE_SIZE
+    tokens = iter(args)
+    for token in tokens:
+        if token in ("--page", "--per-page"):
+            value = next(tokens, "")
+            if not value.isdigit() or int(value) <= 0:
+                raise ValueError(f"Параметр {token} має бути додатним числом.")
+            if token == "--page":
+                page = int(value)
+            else:
+                per_page = int(value)
+        else:
+            rest.append(token)
+    return rest, page, per_page
+
+
 # --- Людина 4: Логіка Контактів (Update / Delete) ---
 
 @input_error
@@ -378,7 +820,8 @@ def edit_contact(*args):
 
     contact = book.find(old_name)
     if not contact:
-        raise KeyError("Контакт не знайдено.")
+        return _with_name_suggestions("Помилка: Контакт не знайдено.", old_name, book)
+    book.before_change(old_name)
 
     # Оновлення імені
     if new_name:
@@ -387,23 +830,27 @@ def edit_contact(*args):
             book.delete_contact(old_name)
             book.add_contact(contact)
 
-    # Оновлення телефону
-    if new_phone:
-        contact.add_phone(new_phone)
-
-    # Оновлення email
-    if new_email:
-        if hasattr(contact, "set_email"):
-            contact.set_email(new_email)
-        else:
-            raise AttributeError("Цей контакт не підтримує email.")
+    try:
+        # Оновлення телефону
+        if new_phone:
+            contact.add_phone(new_phone)
+
+        # Оновлення email
+        if new_email:
+            if hasattr(contact, "set_email"):
+                contact.set_email(new_email)
+            else:
+                raise AttributeError("Цей контакт не підтримує email.")
 
-    # Оновлення адреси
-    if new_address:
-        if hasattr(contact, "set_address"):
-            contact.set_address(new_address)
-        else:
-            raise AttributeError("Цей контакт не підтримує адресу.")
+        # Оновлення адреси
+        if new_address:
+            if hasattr(contact, "set_address"):
+                contact.set_address(new_address)
+            else:
+                raise AttributeError("Цей контакт не підтримує адресу.")
+    finally:
+        # Індекси мають бачити навіть частково застосовані зміни (наприклад, якщо email невалідний).
+        book.touch(contact.name)
 
     save_data(book)
     return f"✅ Контакт '{old_name}' оновлено."
@@ -429,7 +876,7 @@ def delete_contact(*args):
 
     name = name_args[0]
     if not book.find(name):
-        raise KeyError("Контакт не знайдено.")
+        return _with_name_suggestions("Помилка: Контакт не знайдено.", name, book)
 
     book.delete_contact(name)
     save_data(book)
@@ -440,15 +887,57 @@ def delete_contact(*args):
 # ============================
 
 class Note:
+    """
+    Нотатка контакту.
+    Атрибути:
+        text (str): Текст нотатки.
+        tags (tuple): Теги нотатки. Рядки тегів інтернуються, тож однакові теги
+            в мільйонах нотаток займають пам'ять лише один раз.
+    """
+
+    __slots__ = ("text", "_tags")
+
     def __init__(self, text: str, tags=None):
         self.text = text
         self.tags = tags or []
 
+    @classmethod
+    def restore(cls, text: str, tags: tuple):
+        """
+        Створює нотатку під час читання сховища; `tags` — кортеж уже інтернованих рядків.
+        """
+        note = cls.__new__(cls)
+        note.text = text
+        note._tags = tags
+        return note
+
+    @property
+    def tags(self):
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags):
+        self._tags = tuple(sys.intern(tag) for tag in tags)
+
+    def __getstate__(self):
+        return (self.text, self._tags)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # Старі знімки (до __slots__) зберігали __dict__ зі списком тегів.
+            state = (state.get("text", ""), state.get("tags") or [])
+        self.text = state[0]
+        self.tags = state[1]
+
     def __str__(self):
         if self.tags:
             return f"{self.text} [{' ,'.join(self.tags)}]"
         return self.text
 
+
+# Конструктори, якими сховище відновлює книгу з бінарного знімка та журналу.
+BOOK_FACTORIES = book_format.Factories(AddressBook, Contact.restore, Note.restore)
+
 def _parse_note_args(tokens: list):
     """
     Допоміжна функція для розбору аргументів нотатки.
@@ -492,7 +981,7 @@ def add_note(args: list, book) -> str:
 
     contact_name = args[0]
     if contact_name not in book.data:
-        return f"Помилка: Контакт '{contact_name}' не знайдено."
+        return _with_name_suggestions(f"Помилка: Контакт '{contact_name}' не знайдено.", contact_name, book)
 
     text, tags = _parse_note_args(args[1:])
     if not text:
@@ -501,9 +990,11 @@ def add_note(args: list, book) -> str:
     new_note = Note(text, tags)
     contact_record = book.data[contact_name]
 
+    book.before_change(contact_name)
     if not hasattr(contact_record, "notes"):
         contact_record.notes = []
     contact_record.notes.append(new_note)
+    book.touch(contact_name)
 
     return f"Нотатку успішно додано до контакту '{contact_name}'."
 
@@ -518,7 +1009,7 @@ def edit_note(args: list, book) -> str:
     contact_name, note_index_str = args[0], args[1]
 
     if contact_name not in book.data:
-        return f"Помилка: Контакт '{contact_name}' не знайдено."
+        return _with_name_suggestions(f"Помилка: Контакт '{contact_name}' не знайдено.", contact_name, book)
 
     contact_record = book.data[contact_name]
     if not getattr(contact_record, "notes", None):
@@ -537,9 +1028,11 @@ def edit_note(args: list, book) -> str:
     if not text:
         return "Помилка: Не вказано новий текст нотатки."
 
+    book.before_change(contact_name)
     note = contact_record.notes[index]
     note.text = text
     note.tags = tags
+    book.touch(contact_name)
 
     return f"Нотатку {note_index_str} для '{contact_name}' оновлено."
 
@@ -554,7 +1047,7 @@ def delete_note(args: list, book) -> str:
     contact_name, note_index_str = args[0], args[1]
 
     if contact_name not in book.data:
-        return f"Помилка: Контакт '{contact_name}' не знайдено."
+        return _with_name_suggestions(f"Помилка: Контакт '{contact_name}' не знайдено.", contact_name, book)
 
     contact_record = book.data[contact_name]
     if not getattr(contact_record, "notes", None):
@@ -569,34 +1062,185 @@ def delete_note(args: list, book) -> str:
     except IndexError:
         return f"Помилка: Нотатку з індексом {note_index_str} не знайдено."
 
+    book.before_change(contact_name)
     deleted_note = contact_record.notes.pop(index)
+    book.touch(contact_name)
     return f"Нотатку '{deleted_note.text[:20]}...' видалено з контакту '{contact_name}'."
 
+# --- Історія змін: undo / redo та транзакції ---
+
+def _no_args(args: list, command: str):
+    return f"Помилка: Команда {command} не приймає аргументів." if args else None
+
+
+def undo(args: list, book) -> str:
+    """
+    Скасовує останню команду (або останню транзакцію) без перечитування файлу.
+    Синтаксис: undo
+    """
+    error = _no_args(args, "undo")
+    if error:
+        return error
+    try:
+        restored = book._history.undo(book)
+    except RuntimeError as e:
+        return f"Помилка: {e}"
+    if not restored:
+        return "Немає змін для скасування."
+    save_data(book)
+    return f"↩️ Скасовано останню зміну (контактів: {restored})."
+
+
+def redo(args: list, book) -> str:
+    """
+    Повторює останню скасовану зміну.
+    Синтаксис: redo
+    """
+    error = _no_args(args, "redo")
+    if error:
+        return error
+    try:
+        restored = book._history.redo(book)
+    except RuntimeError as e:
+        return f"Помилка: {e}"
+    if not restored:
+        return "Немає змін для повторення."
+    save_data(book)
+    return f"↪️ Зміну повторено (контактів: {restored})."
+
+
+def begin_transaction(args: list, book) -> str:
+    """
+    Починає транзакцію: наступні команди зберігаються одним записом при commit
+    і можуть бути відкочені разом через rollback.
+    Синтаксис: begin
+    """
+    error = _no_args(args, "begin")
+    if error:
+        return error
+    try:
+        book._history.begin()
+    except RuntimeError as e:
+        return f"Помилка: {e}"
+    book._save_deferred += 1
+    return "Транзакцію розпочато. Завершіть її командою commit або rollback."
+
+
+def commit_transaction(args: list, book) -> str:
+    """
+    Завершує транзакцію та зберігає всі її зміни одним записом.
+    Синтаксис: commit
+    """
+    error = _no_args(args, "commit")
+    if error:
+        return error
+    try:
+        changed = book._history.commit()
+    except RuntimeError as e:
+        return f"Помилка: {e}"
+    book._save_deferred -= 1
+    save_data(book)
+    return f"✅ Транзакцію збережено (змінено контактів: {changed})."
+
+
+def rollback_transaction(args: list, book) -> str:
+    """
+    Скасовує всі зміни відкритої транзакції.
+    Синтаксис: rollback
+    """
+    error = _no_args(args, "rollback")
+    if error:
+        return error
+    try:
+        restored = book._history.rollback(book)
+    except RuntimeError as e:
+        return f"Помилка: {e}"
+    book._save_deferred -= 1
+    save_data(book)
+    return f"↩️ Транзакцію відкочено (відновлено контактів: {restored})."
+
+
+def _parse_limit(args: list):
+    """
+    Вилучає з аргументів `--limit K`.
+    Returns:
+        tuple: (решта аргументів, K або None)
+    Raises:
+        ValueError: Якщо K не є додатним числом.
+    """
+    rest = []
+    limit = None
+    tokens = iter(args)
+    for token in tokens:
+        if token == "--limit":
+            value = next(tokens, "")
+            if not value.isdigit() or int(value) <= 0:
+                raise ValueError("Параметр --limit має бути додатним числом.")
+            limit = int(value)
+        else:
+            rest.append(token)
+    return rest, limit
+
+
+def find_notes(query: str, book, limit: int = None):
+    """
+    Знаходить нотатки за запитом (уже в нижньому регістрі): `#тег` — точний збіг тегу
+    через індекс тегів, інакше — слова з AND / OR, ранжовані BM25.
+    Returns:
+        tuple: (кількість усіх збігів, до `limit` пар (ім'я контакту, нотатка))
+    Raises:
+        ValueError: Якщо запит не містить слів для пошуку.
+    """
+    if query.startswith("#") and len(query) > 1:
+        matches = book.index("tags").notes(query[1:])
+        return len(matches), matches[:limit]
+
+    groups = indexes.parse_text_query(query)
+    if not groups:
+        raise ValueError("Запит не містить слів для пошуку.")
+    total, best = book.index("text").search(groups, limit)
+    return total, [(name, book.peek(name).notes[position]) for _, name, position in best]
+
+
 def search_notes(args: list, book) -> str:
     """
-    Пошук нотаток за текстом або тегом по всіх контактах.
-    Синтаксис: search-notes <запит>
+    Повнотекстовий пошук нотаток (текст і теги) по всіх контактах з ранжуванням BM25.
+    Слова запиту поєднуються через AND, альтернативи — через OR (або «або»);
+    кожне слово збігається з усіма словами, що з нього починаються.
+    Запит виду `#тег` шукає нотатки з точно таким тегом через індекс тегів.
+    --limit K виводить лише K найрелевантніших нотаток.
+    Синтаксис: search-notes <запит> [--limit K] | search-notes #<тег> [--limit K]
     """
+    try:
+        args, limit = _parse_limit(args)
+    except ValueError as e:
+        return f"Помилка: {e}"
     if not args:
         return "Помилка: Введіть текст або тег для пошуку."
 
     query = " ".join(args).lower()
-    matches = []
-
-    for contact_name, record in book.data.items():
-        for note in getattr(record, "notes", []):
-            if query in note.text.lower() or any(query in tag.lower() for tag in note.tags):
-                matches.append((contact_name, note))
-
-    if not matches:
-        return f"Нотаток за запитом '{query}' не знайдено."
-
-    result = [f"Знайдено нотаток за запитом '{query}': {len(matches)}"]
+    try:
+        total, matches = find_notes(query, book, limit)
+    except ValueError as e:
+        return f"Помилка: {e}"
+
+    if query.startswith("#") and len(query) > 1:
+        if not total:
+            return f"Нотаток з тегом '{query[1:]}' не знайдено."
+        header = f"Знайдено нотаток з тегом '{query[1:]}': {total}"
+    else:
+        if not total:
+            return f"Нотаток за запитом '{query}' не знайдено."
+        header = f"Знайдено нотаток за запитом '{query}': {total}"
+        if len(matches) < total:
+            header += f" (показано {len(matches)} найрелевантніших)"
+    result = [header]
     for name, note in matches:
         result.append(f"\nКонтакт: {name}\nНотатка: {str(note)}")
 
     return "\n".join(result)
 
+
 def sort_notes_by_tag(args: list, book) -> str:
     """
     Виводить всі нотатки, згруповані за тегами.
@@ -605,22 +1249,15 @@ def sort_notes_by_tag(args: list, book) -> str:
     if args:
         return "Помилка: Команда не приймає аргументів."
 
-    tags_map = {}
-    for name, record in book.data.items():
-        for note in getattr(record, "notes", []):
-            if not note.tags:
-                tags_map.setdefault("#Без тегу", []).append((name, note.text))
-            else:
-                for tag in note.tags:
-                    tags_map.setdefault(tag.lower(), []).append((name, note.text))
-
-    if not tags_map:
+    tag_index = book.index("tags")
+    tags = tag_index.tags()
+    if not tags:
         return "У книзі контактів немає жодної нотатки."
 
     result = ["Нотатки, згруповані за тегами:"]
-    for tag in sorted(tags_map):
+    for tag in tags:
         result.append(f"\n--- Тег: {tag.upper()} ---")
-        for name, text in tags_map[tag]:
-            result.append(f"  - [{name}] {text}")
+        for name, note in tag_index.notes(tag):
+            result.append(f"  - [{name}] {note.text}")
 
     return "\n".join(result)
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import metrics
+
+"""
+Фонове автозбереження AddressBook з «дебаунсом».
+
+Команди лише позначають книгу зміненою (notify), а запис на диск виконує окремий
+потік: він чекає, доки зміни вщухнуть на `debounce` секунд, і записує всю пачку
+одним інкрементальним збереженням. Щоб безперервний потік змін не відкладав запис
+безкінечно, він відбувається не пізніше ніж через MAX_DELAY_FACTOR * debounce
+від першої незбереженої зміни. Команди REPL і запис узгоджуються через `lock`.
+"""
+
+DEFAULT_DEBOUNCE = 1.0  # секунди тиші перед записом
+MAX_DELAY_FACTOR = 5
+
+
+class AutoSaver:
+    def __init__(self, flush, debounce: float = DEFAULT_DEBOUNCE):
+        """
+        Args:
+            flush: функція без аргументів, що записує зміни книги (викликається під lock).
+            debounce: скільки секунд без змін чекати перед записом.
+        """
+        self._flush = flush
+        self.debounce = debounce
+        self.max_delay = debounce * MAX_DELAY_FACTOR
+        self.lock = threading.RLock()
+        self.save_latency = metrics.LatencyHistogram()
+        self._wakeup = threading.Condition()
+        self._dirty_since = None
+        self._last_change = None
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def notify(self):
+        """
+        Позначає, що в книзі є незбережені зміни.
+        """
+        with self._wakeup:
+            now = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+            self._last_change = now
+            self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while self._dirty_since is None and not self._stopping:
+                    self._wakeup.wait()
+                if self._stopping:
+                    return
+                deadline = min(self._last_change + self.debounce, self._dirty_since + self.max_delay)
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+                self._dirty_since = self._last_change = None
+            self.flush()
+
+    def flush(self):
+        """
+        Записує зміни зараз (у потоці, що викликав).
+        """
+        started = time.perf_counter()
+        with self.lock:
+            self._flush()
+        self.save_latency.add(time.perf_counter() - started)
+
+    def stop(self):
+        """
+        Зупиняє потік і синхронно записує все, що лишилося незбереженим.
+        """
+        with self._wakeup:
+            self._stopping = True
+            self._dirty_since = self._last_change = None
+            self._wakeup.notify()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
@@ -0,0 +1,86 @@
+"""
+Бенчмарк затримки інтерактивних команд: синхронне збереження після кожної
+команди проти фонового автозбереження з дебаунсом.
+
+Між командами робиться пауза `--think` мс (користувач набирає наступну команду),
+тож фонові записи відбуваються в паузах і не потрапляють у затримку команд.
+Для кожного режиму виводяться p50/p99 команд і статистика записів на диск (JSON).
+
+Запуск:
+    python benchmarks/bench_autosave.py --contacts 5000 --commands 500 --think 5
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import metrics
+
+
+def prepare(filename: str, contacts: int):
+    book = app_func.load_data(filename)
+    with app_func.deferred_saves(book):
+        for i in range(contacts):
+            app_func.add_contact(f"Контакт{i}", f"{i:010d}", "01.01.1990", book)
+
+
+def commands(count: int, contacts: int):
+    for i in range(count):
+        name = f"Контакт{(i * 7919) % contacts}"
+        if i % 3 == 0:
+            yield app_func.add_note, ([name, f"Нотатка{i}", "tags:бенчмарк"],)
+        elif i % 3 == 1:
+            yield app_func.edit_contact, (name, "-", f"{(i * 31) % 10 ** 10:010d}")
+        else:
+            yield app_func.add_contact, (name, f"{(i * 17) % 10 ** 10:010d}", None)
+
+
+def run(filename: str, contacts: int, count: int, think: float, debounce: float) -> dict:
+    book = app_func.load_data(filename)
+    saver = app_func.enable_autosave(book, debounce) if debounce > 0 else None
+    latency = metrics.LatencyHistogram()
+
+    for function, args in commands(count, contacts):
+        started = time.perf_counter()
+        if saver is not None:
+            with saver.lock:
+                function(*args, book)
+        else:
+            function(*args, book)
+        latency.add(time.perf_counter() - started)
+        time.sleep(think)
+
+    report = {"commands": latency.summary()}
+    if saver is not None:
+        app_func.disable_autosave(book)
+        report["background_writes"] = saver.save_latency.summary()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=5000)
+    parser.add_argument("--commands", type=int, default=500)
+    parser.add_argument("--think", type=float, default=5, help="пауза між командами, мс")
+    parser.add_argument("--debounce", type=float, default=0.05, help="дебаунс автозбереження, с")
+    args = parser.parse_args()
+
+    report = {"contacts": args.contacts, "think_ms": args.think, "debounce_s": args.debounce}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode, debounce in (("sync", 0), ("autosave", args.debounce)):
+            filename = os.path.join(tmp_dir, f"{mode}.pkl")
+            prepare(filename, args.contacts)
+            report[mode] = run(filename, args.contacts, args.commands, args.think / 1000, debounce)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
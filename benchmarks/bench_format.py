@@ -0,0 +1,84 @@
+"""
+Порівняння формату знімка book_format зі знімком pickle (попередня версія формату).
+
+На синтетичній книзі (synthetic.py) для кожного формату заміряються запис повного
+знімка у файл, читання назад і розмір файлу. Для pickle — той самий шлях, яким
+раніше йшов storage.write_snapshot / read_snapshot (pickle.dumps → файл → pickle.loads).
+
+Запуск:
+    python benchmarks/bench_format.py --contacts 200000 --notes 1000000
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import storage
+import synthetic
+
+
+def save_pickle(book, filename: str):
+    with open(filename, "wb") as file:
+        file.write(pickle.dumps(book, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load_pickle(filename: str):
+    with open(filename, "rb") as file:
+        return pickle.loads(file.read())
+
+
+FORMATS = {
+    "pickle": (save_pickle, load_pickle),
+    "book_format": (storage.write_snapshot, lambda filename: storage.read_snapshot(filename, app_func.BOOK_FACTORIES)),
+}
+
+
+def best_of(repeat: int, operation):
+    """
+    Найкращий час із `repeat` викликів (секунди) і результат останнього виклику.
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = operation()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=200000)
+    parser.add_argument("--notes", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    book = synthetic.build_book(args.contacts, args.notes, args.seed)
+    report = {"contacts": args.contacts, "notes": args.notes}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, (save, load) in FORMATS.items():
+            filename = os.path.join(tmp_dir, f"{label}.bin")
+            save_s, _ = best_of(args.repeat, lambda: save(book, filename))
+            load_s, loaded = best_of(args.repeat, lambda: load(filename))
+            if len(loaded.data) != len(book.data):
+                raise SystemExit(f"{label}: прочитано {len(loaded.data)} контактів замість {len(book.data)}")
+            del loaded
+            report[label] = {
+                "save_s": round(save_s, 3),
+                "load_s": round(load_s, 3),
+                "file_mb": round(os.path.getsize(filename) / 2 ** 20, 2),
+            }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
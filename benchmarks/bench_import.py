@@ -0,0 +1,68 @@
+"""
+Бенчмарк масового імпорту: час і швидкість (рядків/с) для різної кількості
+процесів-воркерів `import --workers N` на синтетичному CSV.
+
+Збереження на диск вимкнене, щоб вимірювався лише розбір, валідація та злиття.
+
+Запуск:
+    python benchmarks/bench_import.py --rows 200000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import bulk_io
+
+
+def write_csv(path: str, rows: int):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("name,phone,email,address,birthday\n")
+        for i in range(rows):
+            phone = f"{i:010d}" if i % 50 else "bad"
+            birthday = f"{1 + i % 28:02d}.{1 + i % 12:02d}.{1950 + i % 60}"
+            file.write(f"Контакт{i},{phone},user{i}@example.com,Київ вул. {i},{birthday}\n")
+
+
+def measure(path: str, rows: int, workers: int) -> dict:
+    book = app_func.AddressBook()
+    started = time.perf_counter()
+    with patch("app_func.save_data"):
+        bulk_io.import_contacts([path, "--workers", str(workers)], book)
+    elapsed = time.perf_counter() - started
+    return {
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "contacts.csv")
+        write_csv(path, args.rows)
+        results = [measure(path, args.rows, workers) for workers in sorted(set(args.workers))]
+
+    baseline = results[0]["seconds"]
+    for result in results:
+        result["speedup"] = round(baseline / result["seconds"], 2)
+    report = {"rows": args.rows, "cpu_count": os.cpu_count(), "results": results}
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Час запуску й перших команд читання: знімок .pkl проти mmap-знімка .pabm.
+
+Синтетична книга (synthetic.py) зберігається в обох форматах; далі для кожного
+формату окремий «холодний» процес (як новий запуск main.py) заміряє load_data і
+перший виклик команд find, contacts (перша сторінка), birthdays, search-notes #тег
+та notes-by-tag — разом з ледачою побудовою індексів, яку вони запускають, — а також
+пік RSS процесу. Для .pabm у RSS враховуються й сторінки файлу зі спільного page cache.
+
+Запуск:
+    python benchmarks/bench_mapped.py --contacts 200000 --notes 1000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import synthetic
+
+FORMATS = ("pkl", "pabm")
+COMMANDS = {
+    "find": lambda book: app_func.Contactss(["олена"], book),
+    "contacts:page": lambda book: list(zip(range(app_func.DEFAULT_PAGE_SIZE), app_func.iter_contacts(book))),
+    "birthdays": lambda book: app_func.get_upcoming_birthdays(book),
+    "search-notes:tag": lambda book: app_func.search_notes(["#робота", "--limit", "10"], book),
+    "notes-by-tag": lambda book: app_func.sort_notes_by_tag([], book),
+}
+
+
+def measure(filename: str) -> dict:
+    """
+    Виконується в окремому процесі: заміри для одного файлу.
+    """
+    started = time.perf_counter()
+    book = app_func.load_data(filename)
+    report = {"load_data_s": round(time.perf_counter() - started, 3)}
+    for label, command in COMMANDS.items():
+        started = time.perf_counter()
+        command(book)
+        report[f"{label}_s"] = round(time.perf_counter() - started, 3)
+    try:
+        import resource
+        report["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    except ImportError:  # Windows
+        pass
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=200000)
+    parser.add_argument("--notes", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--measure", help=argparse.SUPPRESS)  # внутрішній режим дочірнього процесу
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure)))
+        return
+
+    book = synthetic.build_book(args.contacts, args.notes, args.seed)
+    report = {"contacts": args.contacts, "notes": args.notes}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for extension in FORMATS:
+            filename = os.path.join(tmp_dir, f"addressbook.{extension}")
+            started = time.perf_counter()
+            app_func.save_data(book, filename)
+            report[extension] = {
+                "save_s": round(time.perf_counter() - started, 3),
+                "file_mb": round(os.path.getsize(filename) / 2 ** 20, 1),
+            }
+        del book
+        for extension in FORMATS:
+            filename = os.path.join(tmp_dir, f"addressbook.{extension}")
+            output = subprocess.run([sys.executable, __file__, "--measure", filename],
+                                    check=True, capture_output=True, text=True).stdout
+            report[extension].update(json.loads(output))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
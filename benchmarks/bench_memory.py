@@ -0,0 +1,76 @@
+"""
+Бенчмарк пам'яті: байти на контакт для поточних Contact/Note (__slots__,
+інтерновані теги) у порівнянні зі старим представленням (__dict__ + список тегів)
+на однаковій синтетичній книзі (див. synthetic.py).
+
+Запуск:
+    python benchmarks/bench_memory.py --contacts 20000 --notes 5
+"""
+import argparse
+import json
+import pickle
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import synthetic
+
+
+class LegacyContact:
+    """Представлення контакту до __slots__ (для порівняння)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.phone = None
+        self.notes = []
+        self.email = None
+        self.address = None
+        self.birthday = None
+
+
+class LegacyNote:
+    """Представлення нотатки до __slots__ (для порівняння)."""
+
+    def __init__(self, text, tags=None):
+        self.text = text
+        self.tags = tags or []
+
+
+def build_contacts(contact_cls, note_cls, contacts: int, notes: int):
+    generated = synthetic.generate_contacts(contacts, contacts * notes, contact_cls=contact_cls, note_cls=note_cls)
+    return {contact.name: contact for contact in generated}
+
+
+def measure(contact_cls, note_cls, contacts: int, notes: int) -> dict:
+    tracemalloc.start()
+    book = build_contacts(contact_cls, note_cls, contacts, notes)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "bytes_per_contact": round(current / contacts, 1),
+        "pickle_bytes_per_contact": round(len(pickle.dumps(book, protocol=pickle.HIGHEST_PROTOCOL)) / contacts, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=20000)
+    parser.add_argument("--notes", type=int, default=5, help="нотаток на контакт")
+    args = parser.parse_args()
+
+    report = {
+        "contacts": args.contacts,
+        "notes_per_contact": args.notes,
+        "before": measure(LegacyContact, LegacyNote, args.contacts, args.notes),
+        "after": measure(app_func.Contact, app_func.Note, args.contacts, args.notes),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
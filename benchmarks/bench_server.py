@@ -0,0 +1,137 @@
+"""
+Навантажувальний бенчмарк HTTP API (`main.py --serve`) на 127.0.0.1.
+
+Сервер запускається в окремому процесі над синтетичною книгою; генератор
+навантаження відкриває `--clients` keep-alive з'єднань і надсилає суміш читань
+(пошук контактів і нотаток, контакт за ім'ям, дні народження) та змін
+(нотатки, телефони) з часткою змін `--write-ratio`. Виводить пропускну здатність
+і p50/p99 затримок окремо для читань і змін (JSON).
+
+Запуск:
+    python benchmarks/bench_server.py --contacts 20000 --clients 16 --requests 5000 --write-ratio 0.1
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import api_server
+import app_func
+import metrics
+
+WORDS = ("купити", "молоко", "зустріч", "проєкт", "звіт", "подарунок", "дзвінок", "квиток")
+TAGS = ("робота", "дім", "свято", "покупки")
+
+
+def prepare(filename: str, contacts: int):
+    book = app_func.load_data(filename)
+    rng = random.Random(1)
+    with app_func.deferred_saves(book):
+        for i in range(contacts):
+            app_func.add_contact(f"Контакт{i}", f"{i:010d}", f"{1 + i % 28:02d}.{1 + i % 12:02d}.1990", book)
+            text = " ".join(rng.sample(WORDS, 3))
+            app_func.add_note([f"Контакт{i}", text, f"tags:{rng.choice(TAGS)}"], book)
+
+
+def run_server(filename: str, ports):
+    book = app_func.load_data(filename)
+    server = api_server.ApiServer(book, port=0)
+    asyncio.run(server.serve(lambda s: ports.put(s.port)))
+
+
+def make_request(rng: random.Random, contacts: int, write_ratio: float):
+    """
+    Повертає (вид, метод, шлях, тіло) для наступного запиту суміші.
+    """
+    name = quote(f"Контакт{rng.randrange(contacts)}")
+    if rng.random() < write_ratio:
+        if rng.random() < 0.5:
+            return "write", "POST", f"/contacts/{name}/notes", {"text": " ".join(rng.sample(WORDS, 2))}
+        return "write", "PATCH", f"/contacts/{name}", {"phone": f"{rng.randrange(10 ** 10):010d}"}
+    choice = rng.randrange(4)
+    if choice == 0:
+        return "read", "GET", f"/contacts/{name}", None
+    if choice == 1:
+        return "read", "GET", f"/find?q={quote(f'контакт{rng.randrange(contacts)}')}&per_page=5", None
+    if choice == 2:
+        return "read", "GET", f"/notes/search?q={quote(rng.choice(WORDS))}&limit=10", None
+    return "read", "GET", "/birthdays?days=7", None
+
+
+async def client(port: int, requests: list, latency: dict):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for kind, method, path, body in requests:
+            data = json.dumps(body).encode("utf-8") if body is not None else b""
+            started = time.perf_counter()
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                         f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latency[kind].add(time.perf_counter() - started)
+            if status != 200:
+                latency["errors"] += 1
+    finally:
+        writer.close()
+
+
+async def load(port: int, contacts: int, clients: int, requests: int, write_ratio: float) -> dict:
+    rng = random.Random(2)
+    plan = [make_request(rng, contacts, write_ratio) for _ in range(requests)]
+    latency = {"read": metrics.LatencyHistogram(), "write": metrics.LatencyHistogram(), "errors": 0}
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, plan[i::clients], latency) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_s": round(requests / elapsed),
+        "reads": latency["read"].summary(),
+        "writes": latency["write"].summary(),
+        "errors": latency["errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "addressbook.pkl")
+        prepare(filename, args.contacts)
+        ports = multiprocessing.Queue()
+        server = multiprocessing.Process(target=run_server, args=(filename, ports))
+        server.start()
+        try:
+            port = ports.get(timeout=120)
+            # Прогрів: лінива побудова індексів не має потрапляти в заміри.
+            asyncio.run(load(port, args.contacts, 1, 20, 0))
+            report = asyncio.run(load(port, args.contacts, args.clients, args.requests, args.write_ratio))
+        finally:
+            server.terminate()
+            server.join()
+
+    report = {"contacts": args.contacts, "clients": args.clients, "write_ratio": args.write_ratio, **report}
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Набір бенчмарків усіх точок входу app_func на синтетичних книгах різного розміру.
+
+Для кожного масштабу (кількості контактів) генерується детермінована книга
+(synthetic.py), зберігається у тимчасовий файл і завантажується назад, а потім
+заміряються команди читання (пошук, список, дні народження, нотатки, підказки)
+і зміни (контакти, нотатки, undo / redo) разом із записом у журнал.
+Для кожної операції окремо записується перший виклик (first_ms — туди потрапляє
+лінива побудова індексів) і p50/p99 наступних викликів.
+
+Результат — JSON (stdout або --output). З --baseline попередній звіт порівнюється
+з поточним: операції, чий p50 зріс більш ніж на --tolerance, виводяться як регресії,
+а код виходу стає 1.
+
+Запуск:
+    python benchmarks/bench_suite.py --scales 1000 100000 --output bench.json
+    python benchmarks/bench_suite.py --scales 1000 100000 1000000 --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import metrics
+import synthetic
+from command_suggestion import suggest_commands
+
+HEAVY_REPEAT = 3  # повторів для операцій, що проходять усю книгу
+MIN_REGRESSION_MS = 0.1  # зміни p50, менші за це, вважаються шумом
+COMMAND_TYPOS = [("ad", ["Іван"]), ("serch-notes", ["молоко"]), ("remove", ["note"]), ("contcts", []),
+                 ("birthday", []), ("exprot", ["file.csv"]), ("tag", ["робота"]), ("undo-all", [])]
+
+
+def timed(operation, repeat: int) -> dict:
+    """
+    Викликає operation(i) для i = 0..repeat і повертає first_ms і статистику решти викликів.
+    """
+    started = time.perf_counter()
+    operation(0)
+    first = time.perf_counter() - started
+    latency = metrics.LatencyHistogram()
+    for i in range(1, repeat + 1):
+        started = time.perf_counter()
+        operation(i)
+        latency.add(time.perf_counter() - started)
+    return {"first_ms": round(first * 1000, 3), **latency.summary()}
+
+
+def read_operations(book, rng: random.Random, repeat: int) -> dict:
+    names = rng.sample(list(book.data), min(repeat + 1, len(book.data)))
+    noted = [name for name in names if book.data[name].notes] or names
+    tags = synthetic.tag_vocabulary()
+
+    def pick(items, i):
+        return items[i % len(items)]
+
+    operations = {
+        "Contactss:name": (lambda i: app_func.Contactss([pick(names, i).lower()], book), repeat),
+        "Contactss:phone": (lambda i: app_func.Contactss([book.data[pick(names, i)].phone], book), repeat),
+        "show_all_contacts": (lambda i: app_func.show_all_contacts(book), HEAVY_REPEAT),
+        "get_upcoming_birthdays": (lambda i: app_func.get_upcoming_birthdays(book), repeat),
+        "search_notes:words": (lambda i: app_func.search_notes(
+            [pick(synthetic.NOTE_WORDS, i), pick(synthetic.NOTE_WORDS, i + 3), "--limit", "10"], book), repeat),
+        "search_notes:tag": (lambda i: app_func.search_notes(["#" + pick(tags, i * 7), "--limit", "10"], book), repeat),
+        "sort_notes_by_tag": (lambda i: app_func.sort_notes_by_tag([], book), HEAVY_REPEAT),
+        "suggest_commands": (lambda i: suggest_commands(*pick(COMMAND_TYPOS, i)), repeat),
+        "suggest_names": (lambda i: book.suggest_names(pick(names, i)[:-1] + "ь"), repeat),
+        "complete_names": (lambda i: book.complete_names(pick(names, i)[:3], 100), repeat),
+        "complete_tags": (lambda i: book.complete_tags(pick(tags, i)[:2], 100), repeat),
+        "find_by_phone": (lambda i: book.find_by_phone(book.data[pick(noted, i)].phone), repeat),
+    }
+    return {label: timed(operation, count) for label, (operation, count) in operations.items()}
+
+
+def write_operations(book, rng: random.Random, repeat: int) -> dict:
+    names = rng.sample(list(book.data), min(repeat + 1, len(book.data)))
+    noted = [name for name in names if book.data[name].notes] or names
+
+    def pick(items, i):
+        return items[i % len(items)]
+
+    def run(command, *args):
+        with book.undoable():
+            return command(*args)
+
+    operations = {
+        "add_contact": lambda i: run(app_func.add_contact, f"Новий{i}", "0671234567", "01.01.1990", book),
+        "edit_contact": lambda i: run(app_func.edit_contact, pick(names, i), "-", f"{i:010d}", book),
+        "add_note": lambda i: run(app_func.add_note, [pick(noted, i), "Нова", "нотатка", "tags:бенчмарк"], book),
+        "edit_note": lambda i: run(app_func.edit_note, [pick(noted, i), "1", "Змінена", "нотатка"], book),
+        "delete_note": lambda i: run(app_func.delete_note, [pick(noted, i), "1"], book),
+        "undo": lambda i: app_func.undo([], book),
+        "redo": lambda i: app_func.redo([], book),
+        "delete_contact": lambda i: run(app_func.delete_contact, f"Новий{i}", book),
+    }
+    # Нотатки видаляються з тих самих контактів, куди їх додали, тож їх вистачає.
+    return {label: timed(operation, repeat) for label, operation in operations.items()}
+
+
+def bench_scale(contacts: int, notes_per_contact: float, repeat: int, seed: int, tmp_dir: str) -> dict:
+    report = {"contacts": contacts, "notes": int(contacts * notes_per_contact)}
+    filename = os.path.join(tmp_dir, f"book-{contacts}.pkl")
+
+    started = time.perf_counter()
+    book = synthetic.build_book(contacts, report["notes"], seed)
+    report["build_book_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    # Кожен раз новий файл: інакше книга вже прив'язана до сховища й пише лише зміни.
+    report["save_data:full"] = timed(lambda i: app_func.save_data(book, f"{filename}.{i}"), HEAVY_REPEAT)
+    filename += ".0"
+    report["load_data"] = timed(lambda i: app_func.load_data(filename), HEAVY_REPEAT)
+    book = app_func.load_data(filename)
+
+    rng = random.Random(seed)
+    report.update(read_operations(book, rng, repeat))
+    report.update(write_operations(book, rng, repeat))
+
+    touched = rng.sample(list(book.data), min(repeat + 1, len(book.data)))
+
+    def save_one(i):
+        book.touch(touched[i % len(touched)])
+        app_func.save_data(book)
+
+    report["save_data:incremental"] = timed(save_one, repeat)
+    return report
+
+
+def find_regressions(baseline: dict, current: dict, tolerance: float) -> list:
+    """
+    Повертає рядки з описом операцій, у яких p50 погіршився понад `tolerance` (частка).
+    """
+    regressions = []
+    for scale, operations in current["scales"].items():
+        for label, result in operations.items():
+            old = baseline.get("scales", {}).get(scale, {}).get(label)
+            if not isinstance(result, dict) or not isinstance(old, dict):
+                continue
+            before, after = old["p50_ms"], result["p50_ms"]
+            if after > before * (1 + tolerance) and after - before > MIN_REGRESSION_MS:
+                regressions.append(f"{scale} контактів, {label}: p50 {before} → {after} мс")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 100000], help="кількості контактів")
+    parser.add_argument("--notes", type=float, default=2, help="нотаток на контакт у середньому")
+    parser.add_argument("--repeat", type=int, default=50, help="повторів кожної операції")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="записати JSON-звіт у файл")
+    parser.add_argument("--baseline", help="попередній JSON-звіт для порівняння")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустиме погіршення p50 (частка)")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "notes_per_contact": args.notes,
+        },
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for contacts in args.scales:
+            report["scales"][str(contacts)] = bench_scale(contacts, args.notes, args.repeat, args.seed, tmp_dir)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = find_regressions(json.load(file), report, args.tolerance)
+        for line in regressions:
+            print(f"Регресія: {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
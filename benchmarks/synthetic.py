@@ -0,0 +1,122 @@
+"""
+Детермінований генератор синтетичної AddressBook для бенчмарків.
+
+Для того самого `seed` завжди дає ті самі контакти: українські та латинські імена
+(унікальні завдяки номеру), мобільні телефони, email, дні народження й нотатки.
+Теги нотаток розподілені за законом Ципфа: кілька тегів трапляються дуже часто,
+більшість — рідко, як у реальних нотатках. Слова тексту нотаток — так само.
+"""
+import random
+import sys
+from bisect import bisect
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+
+# (українське, латиницею) — латиницею також для email
+FIRST_NAMES_UA = [
+    ("Олена", "olena"), ("Іван", "ivan"), ("Тарас", "taras"), ("Марія", "mariia"), ("Андрій", "andrii"),
+    ("Оксана", "oksana"), ("Богдан", "bohdan"), ("Ірина", "iryna"), ("Дмитро", "dmytro"), ("Юлія", "yuliia"),
+    ("Сергій", "serhii"), ("Наталія", "nataliia"), ("Микола", "mykola"), ("Софія", "sofiia"), ("Євген", "yevhen"),
+]
+LAST_NAMES_UA = [
+    ("Шевченко", "shevchenko"), ("Коваленко", "kovalenko"), ("Бондаренко", "bondarenko"), ("Ткаченко", "tkachenko"),
+    ("Кравчук", "kravchuk"), ("Олійник", "oliinyk"), ("Мельник", "melnyk"), ("Гончаренко", "honcharenko"),
+    ("Лисенко", "lysenko"), ("Поліщук", "polishchuk"), ("Савченко", "savchenko"), ("Руденко", "rudenko"),
+]
+FIRST_NAMES_LATIN = ["Anna", "John", "Maria", "Peter", "Emma", "Lukas", "Sofia", "David", "Laura", "Marco"]
+LAST_NAMES_LATIN = ["Smith", "Muller", "Rossi", "Novak", "Garcia", "Brown", "Kowalski", "Martin", "Weber"]
+EMAIL_DOMAINS = ["gmail.com", "ukr.net", "example.com", "i.ua", "outlook.com"]
+PHONE_CODES = ["050", "063", "066", "067", "068", "073", "093", "095", "096", "097", "098", "099"]
+
+TAG_WORDS = ["робота", "сім'я", "друзі", "важливо", "дзвінок", "зустріч", "свято", "борг", "покупки", "здоров'я",
+             "подорож", "навчання", "проєкт", "ідея", "work", "family", "todo", "urgent", "travel", "books"]
+NOTE_WORDS = ["купити", "подзвонити", "зустріч", "молоко", "хліб", "квиток", "звіт", "проєкт", "подарунок",
+              "лікар", "день", "народження", "привітати", "надіслати", "документи", "оплатити", "рахунок",
+              "київ", "львів", "одеса", "call", "meeting", "report", "gift", "ticket", "invoice", "deadline"]
+TAG_COUNT = 500  # розмір словника тегів: TAG_WORDS плюс рідкісні «тег-N»
+ZIPF_EXPONENT = 1.1
+
+
+class ZipfChoice:
+    """
+    Вибір елемента зі списку з імовірністю ∝ 1 / rank^s (перший — найчастіший).
+    """
+
+    def __init__(self, items, exponent: float = ZIPF_EXPONENT):
+        self.items = list(items)
+        self._cumulative = list(accumulate(1 / rank ** exponent for rank in range(1, len(self.items) + 1)))
+
+    def __call__(self, rng: random.Random):
+        return self.items[bisect(self._cumulative, rng.random() * self._cumulative[-1])]
+
+
+def tag_vocabulary(count: int = TAG_COUNT) -> list:
+    return TAG_WORDS[:count] + [f"тег-{i}" for i in range(len(TAG_WORDS), count)]
+
+
+def _birthday(rng: random.Random) -> date:
+    return date(1950, 1, 1) + timedelta(days=rng.randrange(55 * 365))
+
+
+def contact_fields(i: int, rng: random.Random) -> dict:
+    """
+    Поля i-го контакту: ім'я, телефон, email, адреса, день народження.
+    """
+    if rng.random() < 0.7:
+        (first, first_latin), (last, last_latin) = rng.choice(FIRST_NAMES_UA), rng.choice(LAST_NAMES_UA)
+    else:
+        first, last = rng.choice(FIRST_NAMES_LATIN), rng.choice(LAST_NAMES_LATIN)
+        first_latin, last_latin = first.lower(), last.lower()
+    return {
+        "name": f"{first}{last}{i}",
+        "phone": rng.choice(PHONE_CODES) + f"{rng.randrange(10 ** 7):07d}",
+        "email": f"{first_latin}.{last_latin}{i}@{rng.choice(EMAIL_DOMAINS)}",
+        "address": f"вул. {rng.choice(LAST_NAMES_UA)[0]}, {1 + rng.randrange(200)}",
+        "birthday": _birthday(rng),
+    }
+
+
+def generate_contacts(contacts: int, notes: int, seed: int = 0,
+                      contact_cls=app_func.Contact, note_cls=app_func.Note):
+    """
+    Генератор `contacts` контактів класу `contact_cls` із сумарно `notes` нотатками
+    класу `note_cls` (розкиданими по контактах випадково).
+    """
+    rng = random.Random(seed)
+    pick_tag = ZipfChoice(tag_vocabulary())
+    pick_word = ZipfChoice(NOTE_WORDS)
+    notes_left = notes
+    for i in range(contacts):
+        fields = contact_fields(i, rng)
+        contact = contact_cls(fields["name"])
+        contact.phone = fields["phone"]
+        contact.email = fields["email"]
+        contact.address = fields["address"]
+        contact.birthday = fields["birthday"]
+
+        remaining = contacts - i
+        count = notes_left if remaining == 1 else min(notes_left, rng.randrange(2 * notes_left // remaining + 1))
+        notes_left -= count
+        for _ in range(count):
+            text = " ".join(pick_word(rng) for _ in range(3 + rng.randrange(6)))
+            # Теги приходять із розбору вводу як нові рядки, а не як спільні об'єкти словника.
+            tags = list(dict.fromkeys(pick_tag(rng).encode().decode() for _ in range(rng.randrange(4))))
+            contact.notes.append(note_cls(text, tags))
+        yield contact
+
+
+def build_book(contacts: int, notes: int, seed: int = 0) -> app_func.AddressBook:
+    """
+    Синтетична AddressBook без прив'язки до файлу (індекси будуються ліниво, як зазвичай).
+    """
+    book = app_func.AddressBook()
+    for contact in generate_contacts(contacts, notes, seed):
+        book.data[contact.name] = contact
+    return book
@@ -0,0 +1,199 @@
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date
+from itertools import accumulate
+from typing import Callable, NamedTuple
+
+"""
+Компактний бінарний формат AddressBook (знімки та записи журналу), що замінює pickle.
+
+Дані зберігаються стовпцями: усі імена разом, усі телефони разом, усі тексти нотаток
+разом тощо. Рядковий стовпець — кількість рядків і один UTF-8 блок, розділений
+нульовими символами (або з масивом довжин, якщо рядки містять \\0); числові — масиви
+array. Тож і запис, і читання — кілька «великих» операцій на стовпець замість окремого
+виклику на кожне поле кожного об'єкта. Різні набори тегів зберігаються один раз
+(нотатка посилається на номер набору), а великі стовпці стискаються zlib.
+На відміну від pickle, читання не створює довільних об'єктів за вмістом файлу —
+лише контакти й нотатки через передані фабрики.
+
+Розкладка payload (little-endian):
+    заголовок   <III: кількість контактів, кількість нотаток, кількість стовпців
+    стовпці     кожен: <I довжина, 1 байт стиснення (0 / zlib), байти — у порядку COLUMNS
+
+Нові стовпці дописуються в кінець COLUMNS: старіші читачі пропускають зайві стовпці,
+тож такі зміни схеми не потребують нової версії формату. Несумісні зміни
+збільшують FORMAT_VERSION. Порожній рядок у полях phone / email / address читається як None.
+"""
+
+FORMAT_VERSION = 2  # версія 1 — знімки pickle
+COLUMNS = ("names", "phones", "emails", "addresses", "birthdays", "note_counts",
+           "note_texts", "note_tagsets", "tagset_sizes", "tagset_refs", "tag_table")
+COMPRESS_MIN = 4096  # стовпці, менші за це (байтів), не стискаються
+COMPRESS_LEVEL = 1  # найшвидший рівень zlib: стискає тексти в рази за частку часу запису
+
+_HEADER = struct.Struct("<III")
+_COLUMN = struct.Struct("<IB")  # довжина, спосіб стиснення
+_COUNT = struct.Struct("<I")
+_RAW, _ZLIB = 0, 1
+_SEPARATED, _LENGTHS = 0, 1  # способи зберігання рядкового стовпця
+
+
+class Factories(NamedTuple):
+    """
+    Конструктори об'єктів для читача:
+        address_book() — порожня книга;
+        contact(name, phone, email, address, birthday, notes) — контакт без валідації;
+        note(text, tags) — нотатка з кортежем уже інтернованих тегів.
+    """
+    address_book: Callable
+    contact: Callable
+    note: Callable
+
+
+def _int_array(typecode: str, values) -> bytes:
+    values = array(typecode, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_int_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _str_column(values: list) -> bytes:
+    joined = "\0".join(values)
+    head = _COUNT.pack(len(values))
+    if joined.count("\0") == max(len(values) - 1, 0):
+        return bytes((_SEPARATED,)) + head + joined.encode("utf-8")
+    lengths = _int_array("I", map(len, values))
+    return bytes((_LENGTHS,)) + head + lengths + "".join(values).encode("utf-8")
+
+
+def _read_str_column(data: bytes) -> list:
+    (count,) = _COUNT.unpack_from(data, 1)
+    start = 1 + _COUNT.size
+    if not count:
+        return []
+    if data[0] == _SEPARATED:
+        return data[start:].decode("utf-8").split("\0")
+    size = count * array("I").itemsize
+    ends = list(accumulate(_read_int_array("I", data[start:start + size])))
+    text = data[start + size:].decode("utf-8")
+    return [text[begin:end] for begin, end in zip([0] + ends, ends)]
+
+
+def dumps(items) -> bytes:
+    """
+    Кодує пари (ім'я, контакт) у payload формату.
+    """
+    names, phones, emails, addresses, birthdays, note_counts = [], [], [], [], [], []
+    texts, note_tagsets, tagset_ids = [], [], {}
+    for name, contact in items:
+        names.append(name)
+        phones.append(contact.phone or "")
+        emails.append(contact.email or "")
+        addresses.append(contact.address or "")
+        birthdays.append(contact.birthday.toordinal() if contact.birthday else 0)
+        note_counts.append(len(contact.notes))
+        for note in contact.notes:
+            texts.append(note.text)
+            note_tagsets.append(tagset_ids.setdefault(tuple(note.tags), len(tagset_ids)))
+
+    tag_ids = {}
+    tagset_refs = [tag_ids.setdefault(tag, len(tag_ids)) for tagset in tagset_ids for tag in tagset]
+    columns = (
+        _str_column(names), _str_column(phones), _str_column(emails), _str_column(addresses),
+        _int_array("i", birthdays), _int_array("I", note_counts), _str_column(texts),
+        _int_array("I", note_tagsets), _int_array("I", map(len, tagset_ids)), _int_array("I", tagset_refs),
+        _str_column(list(tag_ids)),
+    )
+    parts = [_HEADER.pack(len(names), len(texts), len(columns))]
+    for column in columns:
+        compressed = zlib.compress(column, COMPRESS_LEVEL) if len(column) >= COMPRESS_MIN else column
+        codec = _ZLIB if len(compressed) < len(column) else _RAW
+        column = compressed if codec == _ZLIB else column
+        parts.append(_COLUMN.pack(len(column), codec))
+        parts.append(column)
+    return b"".join(parts)
+
+
+def _read_columns(data: bytes) -> tuple:
+    contacts, notes, column_count = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+    columns = {}
+    for position in range(column_count):
+        length, codec = _COLUMN.unpack_from(data, offset)
+        offset += _COLUMN.size
+        if position < len(COLUMNS):
+            column = data[offset:offset + length]
+            if len(column) != length or codec not in (_RAW, _ZLIB):
+                raise ValueError(f"обрізаний стовпець {COLUMNS[position]}")
+            columns[COLUMNS[position]] = zlib.decompress(column) if codec == _ZLIB else column
+        offset += length
+    if offset != len(data):
+        raise ValueError("довжина не збігається із заголовком")
+    return contacts, notes, columns
+
+
+def iter_loads(data: bytes, factories: Factories):
+    """
+    Декодує payload у пари (ім'я, контакт) у порядку запису.
+    Raises:
+        ValueError: Якщо payload обрізаний або не відповідає формату.
+    """
+    try:
+        contacts, notes, columns = _read_columns(data)
+        names = _read_str_column(columns["names"])
+        phones = _read_str_column(columns["phones"])
+        emails = _read_str_column(columns["emails"])
+        addresses = _read_str_column(columns["addresses"])
+        birthdays = _read_int_array("i", columns["birthdays"])
+        note_counts = _read_int_array("I", columns["note_counts"])
+        texts = _read_str_column(columns["note_texts"])
+        note_tagsets = _read_int_array("I", columns["note_tagsets"])
+        tagset_ends = list(accumulate(_read_int_array("I", columns["tagset_sizes"])))
+        tagset_refs = _read_int_array("I", columns["tagset_refs"])
+        tag_table = [sys.intern(tag) for tag in _read_str_column(columns["tag_table"])]
+        tagsets = [tuple(tag_table[ref] for ref in tagset_refs[start:end])
+                   for start, end in zip([0] + tagset_ends, tagset_ends)]
+        checks = (
+            len(names) == len(phones) == len(emails) == len(addresses) == len(birthdays)
+            == len(note_counts) == contacts,
+            len(texts) == len(note_tagsets) == notes == sum(note_counts),
+            not note_tagsets or max(note_tagsets) < len(tagsets),
+            (tagset_ends[-1] if tagset_ends else 0) == len(tagset_refs),
+        )
+    except (KeyError, IndexError, struct.error, UnicodeDecodeError, zlib.error) as e:
+        raise ValueError(f"Пошкоджені дані AddressBook: {e}") from e
+    if not all(checks):
+        raise ValueError("Пошкоджені дані AddressBook: стовпці не узгоджені між собою.")
+
+    # Об'єкти створюються через map — цикл іде на рівні C, а не байткоду.
+    all_notes = list(map(factories.note, texts, map(tagsets.__getitem__, note_tagsets)))
+    note_ends = accumulate(note_counts)
+    note_slices = (all_notes[start:end] for start, end in zip(accumulate(note_counts, initial=0), note_ends))
+    return zip(names, map(
+        factories.contact,
+        names,
+        [phone or None for phone in phones],
+        [email or None for email in emails],
+        [address or None for address in addresses],
+        [date.fromordinal(day) if day else None for day in birthdays],
+        note_slices,
+    ))
+
+
+def loads(data: bytes, factories: Factories):
+    """
+    Декодує payload у нову AddressBook.
+    """
+    address_book = factories.address_book()
+    address_book.data.update(iter_loads(data, factories))
+    return address_book
@@ -0,0 +1,238 @@
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import app_func
+
+"""
+Масовий імпорт і експорт контактів у CSV та JSONL.
+
+Рядки файлу проходять потоковим конвеєром генераторів (читання → побудова Contact
+з тією самою валідацією, що й у команді add → запис у книгу), тож у пам'яті
+не тримається весь файл. Помилки окремих рядків збираються, а не зупиняють імпорт;
+зміни зберігаються пакетами по IMPORT_BATCH_SIZE контактів.
+
+Для дуже великих файлів розбір і валідацію (strptime, regex) можна розподілити між
+процесами: `import <файл> --workers N`. Рядки діляться на шматки по IMPORT_CHUNK_SIZE,
+результати повертаються в порядку файлу, а злиття в книгу відбувається в головному
+процесі — тож при однакових іменах перемагає останній рядок, як і в add_contact.
+
+Поля: name, phone, email, address, birthday (ДД.ММ.РРРР); у JSONL також
+notes — список об'єктів {"text": ..., "tags": [...]}.
+"""
+
+FIELDS = ["name", "phone", "email", "address", "birthday"]
+IMPORT_BATCH_SIZE = 10000
+IMPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 10
+
+
+def _file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError("Підтримуються лише файли .csv та .jsonl.")
+
+
+def read_rows(path: str):
+    """
+    Генератор пар (номер рядка, словник полів) з CSV або JSONL файлу.
+    Непрочитані JSON-рядки повертаються як ValueError замість словника.
+    """
+    file_format = _file_format(path)
+    with open(path, encoding="utf-8", newline="") as file:
+        if file_format == "csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_no, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, ValueError(f"некоректний JSON ({e.msg})")
+
+
+def build_contact(row) -> app_func.Contact:
+    """
+    Створює Contact з рядка, перевіряючи поля методами Contact.
+    Raises:
+        ValueError: Якщо рядок некоректний.
+    """
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError("рядок має бути об'єктом з полями контакту")
+
+    name = (row.get("name") or "").strip()
+    phone = (row.get("phone") or "").strip()
+    if not name or not phone:
+        raise ValueError("потрібні поля name та phone")
+
+    contact = app_func.Contact(name)
+    contact.add_phone(phone)
+    if row.get("birthday"):
+        contact.add_birthday(row["birthday"].strip())
+    if row.get("email"):
+        contact.set_email(row["email"].strip())
+    if row.get("address"):
+        contact.set_address(row["address"].strip())
+    if row.get("notes"):
+        contact.notes = [app_func.Note(note["text"], note.get("tags") or []) for note in row["notes"]]
+    return contact
+
+
+def _build_chunk(chunk):
+    """
+    Будує контакти для шматка рядків [(номер рядка, рядок), ...].
+    Виконується у процесі-воркері, тому повертає лише результати, які можна
+    передати назад: [(номер рядка, Contact або None, текст помилки або None)].
+    """
+    built = []
+    for line_no, row in chunk:
+        try:
+            built.append((line_no, build_contact(row), None))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            built.append((line_no, None, str(e)))
+    return built
+
+
+def _chunks(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_contacts(rows, workers: int = 1):
+    """
+    Генератор (номер рядка, Contact або None, помилка або None) у порядку файлу.
+    При workers > 1 шматки рядків валідуються паралельно в ProcessPoolExecutor;
+    одночасно в роботі не більше 2 * workers шматків, тож файл читається потоково.
+    """
+    if workers <= 1:
+        for chunk in _chunks(rows, IMPORT_CHUNK_SIZE):
+            yield from _build_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(rows, IMPORT_CHUNK_SIZE):
+            pending.append(executor.submit(_build_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _parse_workers(args: list):
+    """
+    Вилучає з аргументів `--workers N` (0 — за кількістю ядер).
+    """
+    rest = []
+    workers = 1
+    tokens = iter(args)
+    for token in tokens:
+        if token == "--workers":
+            value = next(tokens, "")
+            if not value.isdigit():
+                raise ValueError("Параметр --workers має бути невід'ємним числом.")
+            workers = int(value) or os.cpu_count() or 1
+        else:
+            rest.append(token)
+    return rest, workers
+
+
+def import_contacts(args: list, book) -> str:
+    """
+    Імпортує контакти з файлу. Наявні контакти з тим самим ім'ям замінюються
+    (нотатки зберігаються, якщо в рядку їх немає).
+    Синтаксис: import <файл.csv|файл.jsonl> [--workers N]
+    """
+    try:
+        args, workers = _parse_workers(args)
+    except ValueError as e:
+        return f"Помилка: {e}"
+    if len(args) != 1:
+        return "Помилка: Синтаксис: import <файл.csv|файл.jsonl> [--workers N]"
+    path = args[0]
+    if not os.path.exists(path):
+        return f"Помилка: Файл '{path}' не знайдено."
+    try:
+        _file_format(path)
+    except ValueError as e:
+        return f"Помилка: {e}"
+
+    imported = 0
+    errors = []
+    with app_func.deferred_saves(book):
+        for line_no, contact, error in build_contacts(read_rows(path), workers):
+            if error is not None:
+                errors.append(f"  рядок {line_no}: {error}")
+                continue
+
+            existing = book.get_contact(contact.name)
+            if existing is not None and not contact.notes:
+                contact.notes = existing.notes
+            book.add_contact(contact)
+            imported += 1
+            if imported % IMPORT_BATCH_SIZE == 0:
+                app_func.save_data(book, force=True)
+
+    result = [f"Імпортовано контактів: {imported}, рядків з помилками: {len(errors)}."]
+    result.extend(errors[:MAX_REPORTED_ERRORS])
+    if len(errors) > MAX_REPORTED_ERRORS:
+        result.append(f"  ... ще {len(errors) - MAX_REPORTED_ERRORS}")
+    return "\n".join(result)
+
+
+def _contact_row(contact) -> dict:
+    birthday = getattr(contact, "birthday", None)
+    return {
+        "name": contact.name,
+        "phone": contact.phone or "",
+        "email": contact.email or "",
+        "address": contact.address or "",
+        "birthday": birthday.strftime("%d.%m.%Y") if birthday else "",
+    }
+
+
+def export_contacts(args: list, book) -> str:
+    """
+    Потоково експортує всі контакти у файл (по одному запису за раз).
+    Синтаксис: export <файл.csv|файл.jsonl>
+    """
+    if len(args) != 1:
+        return "Помилка: Синтаксис: export <файл.csv|файл.jsonl>"
+    path = args[0]
+    try:
+        file_format = _file_format(path)
+    except ValueError as e:
+        return f"Помилка: {e}"
+
+    exported = 0
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if file_format == "csv":
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            for contact in book.data.values():
+                writer.writerow(_contact_row(contact))
+                exported += 1
+        else:
+            for contact in book.data.values():
+                row = _contact_row(contact)
+                row["notes"] = [{"text": note.text, "tags": list(note.tags)} for note in contact.notes]
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                exported += 1
+
+    return f"Експортовано контактів у '{path}': {exported}."
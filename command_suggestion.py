@@ -1,19 +1,29 @@
+from collections import deque
 from difflib import get_close_matches
-from typing import List
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Canonical command patterns for CLI suggestions
 COMMAND_PATTERNS = {
     "add": "add <ім'я> <телефон> [день народження]",
     "birthdays": "birthdays",
-    "find": "find <запит>",
-    "contacts": "contacts",
+    "find": "find <запит> [--page N] [--per-page M]",
+    "contacts": "contacts [--page N] [--per-page M]",
     "edit": "edit <ім'я> ...",
     "delete": "delete <ім'я>",
     "add-note": "add-note <ім’я> <текст> [tags: ...]",
     "edit-note": "edit-note <ім’я> <індекс> <новий текст>",
     "delete-note": "delete-note <ім’я> <індекс>",
-    "search-notes": "search-notes <запит>",
+    "search-notes": "search-notes <запит|#тег> [--limit K]",
     "notes-by-tag": "notes-by-tag",
+    "import": "import <файл.csv|файл.jsonl> [--workers N]",
+    "export": "export <файл.csv|файл.jsonl>",
+    "undo": "undo",
+    "redo": "redo",
+    "begin": "begin",
+    "commit": "commit",
+    "rollback": "rollback",
+    "stats": "stats [--export ФАЙЛ] [--reset]",
     "help": "help",
 }
 
@@ -29,6 +39,14 @@ COMMAND_SYNONYMS = {
     "list": ["contacts", "notes-by-tag"],
     "show": ["contacts", "notes-by-tag", "birthdays"],
     "lookup": ["find", "search-notes"],
+    "load": ["import"],
+    "dump": ["export"],
+    "save": ["export", "commit"],
+    "revert": ["undo", "rollback"],
+    "cancel": ["undo", "rollback"],
+    "start": ["begin"],
+    "metrics": ["stats"],
+    "timing": ["stats"],
 }
 
 # Context keywords used to promote commands based on arguments
@@ -48,24 +66,134 @@ COMMAND_CONTEXT = {
 }
 
 
+class KeywordMatcher:
+    """
+    Автомат Ахо–Корасік: знаходить усі ключові слова в тексті за один прохід,
+    незалежно від їх кількості. Будується один раз при імпорті модуля.
+    """
+
+    def __init__(self, keywords: Dict[str, str]):
+        """
+        Args:
+            keywords: словник ключове слово → мітка (назва контексту).
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+
+        for keyword, label in keywords.items():
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state] += (label,)
+
+        # Посилання-невдачі будуються обходом у ширину.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def labels(self, text: str) -> set:
+        """
+        Повертає множину міток усіх ключових слів, що трапляються в `text`.
+        """
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found.update(self._output[state])
+        return found
+
+
+class CommandTrie:
+    """
+    Префіксне дерево назв команд і їхніх синонімів. Синонім веде до своїх
+    команд, тож "rem" доповнюється до delete/delete-note. Кожен вузол зберігає
+    готовий відсортований кортеж усіх команд під ним, тож доповнення префікса
+    коштує O(довжина префікса) і не потребує сортування на кожне натискання клавіші.
+    """
+
+    def __init__(self, commands: Iterable[str], synonyms: Optional[Dict[str, Iterable[str]]] = None):
+        words: Dict[str, Iterable[str]] = {command: (command,) for command in commands}
+        for synonym, targets in (synonyms or {}).items():
+            words[synonym] = tuple(words.get(synonym, ())) + tuple(targets)
+
+        self._root: Dict = {"children": {}, "completions": set()}
+        for word, targets in words.items():
+            node = self._root
+            node["completions"].update(targets)
+            for char in word:
+                node = node["children"].setdefault(char, {"children": {}, "completions": set()})
+                node["completions"].update(targets)
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node["completions"] = tuple(sorted(node["completions"]))
+            stack.extend(node["children"].values())
+
+    def complete(self, prefix: str) -> Tuple[str, ...]:
+        node = self._root
+        for char in prefix:
+            node = node["children"].get(char)
+            if node is None:
+                return ()
+        return node["completions"]
+
+
+_CONTEXT_MATCHER = KeywordMatcher({
+    keyword: context_name
+    for context_name, context in COMMAND_CONTEXT.items()
+    for keyword in context["keywords"]
+})
+_COMMAND_TRIE = CommandTrie(COMMAND_PATTERNS, COMMAND_SYNONYMS)
+
+
+def complete_command(prefix: str) -> List[str]:
+    """
+    Повертає відсортовані команди, назва або синонім яких починається з `prefix`
+    (для Tab-доповнення).
+    """
+    return list(_COMMAND_TRIE.complete(prefix.lower()))
+
+
+@lru_cache(maxsize=256)
+def _command_candidates(cmd_lower: str) -> Tuple[str, ...]:
+    """
+    Кандидати лише за назвою команди: синоніми, схожі назви та доповнення префікса.
+    Кешується, бо ті самі помилки в назвах повторюються.
+    """
+    suggestions = list(COMMAND_SYNONYMS.get(cmd_lower, []))
+    suggestions.extend(get_close_matches(cmd_lower, COMMAND_PATTERNS.keys(), n=3, cutoff=0.6))
+    suggestions.extend(_COMMAND_TRIE.complete(cmd_lower) if cmd_lower else ())
+    return tuple(suggestions)
+
+
 def suggest_commands(command: str, args: List[str]) -> List[str]:
     """
     Повертає список можливих команд на основі схожості та контексту аргументів.
     """
-    suggestions: List[str] = []
-    cmd_lower = command.lower()
-    # 1. Прямі синоніми
-    suggestions.extend(COMMAND_SYNONYMS.get(cmd_lower, []))
-
-    # 2. Пошук схожих команд
-    close_matches = get_close_matches(cmd_lower, COMMAND_PATTERNS.keys(), n=3, cutoff=0.6)
-    suggestions.extend(close_matches)
+    # 1–2. Синоніми, схожі команди та команди з таким префіксом (з кешу)
+    suggestions: List[str] = list(_command_candidates(command.lower()))
 
-    # 3. Контекст за аргументами (ключовими словами)
+    # 3. Контекст за аргументами (ключовими словами) — один прохід автомата
     if args:
-        arg_text = " ".join(args).lower()
-        for context in COMMAND_CONTEXT.values():
-            if any(keyword in arg_text for keyword in context["keywords"]):
+        matched = _CONTEXT_MATCHER.labels(" ".join(args).lower())
+        for context_name, context in COMMAND_CONTEXT.items():
+            if context_name in matched:
                 suggestions.extend(context["commands"])
 
     # Прибираємо дублікати, зберігаючи порядок
@@ -0,0 +1,118 @@
+import copy
+from collections import deque
+from contextlib import contextmanager
+
+"""
+Журнал змін AddressBook для undo / redo та транзакцій begin / commit / rollback.
+
+Кожна команда (або вся транзакція) стає одним кроком історії: перед першою зміною
+контакту в межах кроку запам'ятовується його попередній стан — копія контакту
+або None, якщо контакту ще не було. Обернена операція кроку — повернути всі
+ці контакти до запам'ятованих станів; під час її виконання так само збираються
+поточні стани, які стають кроком для redo. Відкат не потребує перечитування файлу.
+"""
+
+UNDO_LIMIT = 100  # скільки останніх кроків можна скасувати
+
+
+class ChangeLog:
+    """
+    Стеки кроків undo / redo та крок, що записується зараз (команда чи транзакція).
+    """
+
+    def __init__(self, limit: int = UNDO_LIMIT):
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+        self._step = None  # ім'я → стан до зміни для кроку, що зараз записується
+        self.in_transaction = False
+
+    def record(self, name: str, contact):
+        """
+        Запам'ятовує стан контакту перед зміною (лише перший раз у межах кроку).
+        Поза командою чи транзакцією нічого не записує.
+        """
+        if self._step is not None and name not in self._step:
+            self._step[name] = copy.deepcopy(contact)
+
+    @contextmanager
+    def command(self):
+        """
+        Усі зміни всередині блоку стають одним кроком історії.
+        У відкритій транзакції крок не закривається — він належить транзакції.
+        """
+        opened = self._step is None
+        if opened:
+            self._step = {}
+        try:
+            yield
+        finally:
+            # Якщо всередині блоку почалася транзакція (команда begin), крок лишається відкритим.
+            if opened and not self.in_transaction:
+                self._close_step()
+
+    def _close_step(self) -> int:
+        step, self._step = self._step, None
+        if step:
+            self._undo.append(step)
+            self._redo.clear()
+        return len(step)
+
+    def begin(self):
+        if self.in_transaction:
+            raise RuntimeError("Транзакцію вже розпочато.")
+        if self._step is None:
+            self._step = {}
+        self.in_transaction = True
+
+    def commit(self) -> int:
+        """
+        Закриває транзакцію одним кроком історії. Повертає кількість змінених контактів.
+        """
+        if not self.in_transaction:
+            raise RuntimeError("Немає відкритої транзакції.")
+        self.in_transaction = False
+        return self._close_step()
+
+    def rollback(self, book) -> int:
+        """
+        Повертає всі контакти, змінені в транзакції, до стану на момент begin.
+        """
+        if not self.in_transaction:
+            raise RuntimeError("Немає відкритої транзакції.")
+        step, self._step = self._step, None
+        self.in_transaction = False
+        self._restore(book, step)
+        return len(step)
+
+    def undo(self, book) -> int:
+        if self.in_transaction:
+            raise RuntimeError("Спершу завершіть транзакцію (commit або rollback).")
+        if not self._undo:
+            return 0
+        step = self._undo.pop()
+        self._redo.append(self._restore(book, step))
+        return len(step)
+
+    def redo(self, book) -> int:
+        if self.in_transaction:
+            raise RuntimeError("Спершу завершіть транзакцію (commit або rollback).")
+        if not self._redo:
+            return 0
+        step = self._redo.pop()
+        self._undo.append(self._restore(book, step))
+        return len(step)
+
+    @staticmethod
+    def _restore(book, step: dict) -> dict:
+        """
+        Повертає контакти кроку до запам'ятованих станів і позначає їх зміненими
+        (щоб наступне збереження записало відкат). Повертає обернений крок.
+        """
+        inverse = {name: copy.deepcopy(book.data.get(name)) for name in step}
+        for name, contact in reversed(step.items()):
+            if contact is None:
+                book.data.pop(name, None)
+            else:
+                book.data[name] = contact
+            book.touch(name)
+        return inverse
@@ -0,0 +1,649 @@
+from bisect import bisect_left, insort
+import heapq
+from itertools import islice
+import math
+import re
+
+"""
+Інкрементальні індекси для AddressBook.
+
+Кожен індекс реалізує метод update(name, contact): прибирає старі дані контакту
+`name` і, якщо contact не None, індексує його поточний стан. AddressBook викликає
+update() з touch() після кожної зміни контакту, тож індекси завжди узгоджені з book.data.
+Індекси з відсортованими списками мають також build(items) для першої побудови:
+список сортується один раз (O(N log N)), а не insort на кожен контакт (O(N²)).
+"""
+
+
+def _trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def contact_search_fields(contact):
+    """
+    Повертає рядки контакту (у нижньому регістрі), за якими шукає команда find:
+    ім'я, телефон, email, адреса, тексти та теги нотаток.
+    """
+    fields = [
+        str(getattr(contact, "name", "") or "").lower(),
+        str(getattr(contact, "phone", "") or "").lower(),
+        str(getattr(contact, "email", "") or "").lower(),
+        str(getattr(contact, "address", "") or "").lower(),
+    ]
+    for note in getattr(contact, "notes", []):
+        fields.append(note.text.lower())
+        fields.extend(tag.lower() for tag in note.tags)
+    return fields
+
+
+class _BookOrder:
+    """
+    Порядкові номери імен у порядку появи в індексі — той самий порядок, що й
+    у book.data (нові та перейменовані контакти потрапляють у кінець).
+    """
+
+    def __init__(self):
+        self._positions = {}
+        self._counter = 0
+
+    def add(self, name: str):
+        if name not in self._positions:
+            self._positions[name] = self._counter
+            self._counter += 1
+
+    def discard(self, name: str):
+        self._positions.pop(name, None)
+
+    def position(self, name: str) -> int:
+        return self._positions[name]
+
+    def sort(self, names):
+        return sorted(names, key=self._positions.__getitem__)
+
+
+def _prefix_range(sorted_items, position: int, prefix: str, limit, key):
+    """
+    Генератор елементів відсортованого списку, ключ яких починається з `prefix`,
+    від позиції `position` (знайденої bisect) до першого незбігу.
+    """
+    while position < len(sorted_items) and limit != 0:
+        item = sorted_items[position]
+        if not key(item).startswith(prefix):
+            return
+        yield item
+        position += 1
+        if limit is not None:
+            limit -= 1
+
+
+class PrefixIndex:
+    """
+    Відсортований список імен контактів (casefold) для Tab-доповнення.
+    Пошук за префіксом — це bisect і прохід лише по збігах, без сканування книги.
+    """
+
+    def __init__(self):
+        self._sorted = []   # (ключ casefold, ім'я)
+        self._keys = {}     # ім'я → ключ
+
+    def update(self, name: str, contact):
+        key = self._keys.pop(name, None)
+        if key is not None:
+            del self._sorted[bisect_left(self._sorted, (key, name))]
+
+        if contact is None:
+            return
+        key = str(contact.name).casefold()
+        self._keys[name] = key
+        insort(self._sorted, (key, name))
+
+    def build(self, items):
+        """
+        Індексує всі пари (ім'я, контакт) порожнього індексу одним сортуванням.
+        """
+        for name, contact in items:
+            self._keys[name] = str(contact.name).casefold()
+        self._sorted = sorted((key, name) for name, key in self._keys.items())
+
+    def complete(self, prefix: str, limit=None):
+        """
+        Повертає до `limit` імен, що починаються з `prefix`, в алфавітному порядку.
+        """
+        prefix = prefix.casefold()
+        start = bisect_left(self._sorted, (prefix,))
+        matches = _prefix_range(self._sorted, start, prefix, limit, lambda item: item[0])
+        return [name for _, name in matches]
+
+
+class TrigramIndex:
+    """
+    Інвертований індекс триграм → імена контактів для підрядкового пошуку.
+
+    Запит довжиною від 3 символів звужує множину кандидатів до контактів, що
+    містять усі його триграми; точну перевірку підрядка виконує викликач.
+    Порядок кандидатів збігається з порядком вставки у book.data.
+    """
+
+    def __init__(self):
+        self._postings = {}   # триграма → set імен
+        self._grams = {}      # ім'я → frozenset триграм (для видалення)
+        self._order = _BookOrder()
+
+    def update(self, name: str, contact):
+        for gram in self._grams.pop(name, ()):
+            names = self._postings[gram]
+            names.discard(name)
+            if not names:
+                del self._postings[gram]
+
+        if contact is None:
+            self._order.discard(name)
+            return
+
+        self._order.add(name)
+        grams = set()
+        for field in contact_search_fields(contact):
+            grams |= _trigrams(field)
+        self._grams[name] = frozenset(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(name)
+
+    def candidates(self, query: str):
+        """
+        Повертає імена контактів, що можуть містити `query` (у нижньому регістрі),
+        або None, якщо запит закороткий для індексу.
+        """
+        grams = _trigrams(query)
+        if not grams:
+            return None
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        names = set(postings[0])
+        for other in postings[1:]:
+            names &= other
+            if not names:
+                break
+        return self._order.sort(names)
+
+
+class TagIndex:
+    """
+    Індекс «тег (у нижньому регістрі) → нотатки» для notes-by-tag та пошуку за тегом.
+
+    Для кожного тегу зберігається словник ім'я контакту → кортеж його нотаток із цим
+    тегом; нотатки без тегів лежать під ключем UNTAGGED. Список тегів підтримується
+    відсортованим, тож вивід усіх груп — це прохід по індексу без повного сканування книги.
+    """
+
+    UNTAGGED = "#Без тегу"
+
+    def __init__(self):
+        self._postings = {}   # тег → {ім'я: (Note, ...)}
+        self._tags = {}       # ім'я → теги контакту (для видалення)
+        self._sorted_tags = []
+        self._order = _BookOrder()
+
+    def update(self, name: str, contact):
+        for tag in self._tags.pop(name, ()):
+            notes = self._postings[tag]
+            del notes[name]
+            if not notes:
+                del self._postings[tag]
+                del self._sorted_tags[bisect_left(self._sorted_tags, tag)]
+
+        if contact is None:
+            self._order.discard(name)
+            return
+        for tag in self._index(name, contact):
+            insort(self._sorted_tags, tag)
+
+    def build(self, items):
+        """
+        Індексує всі пари (ім'я, контакт) порожнього індексу; теги сортуються один раз.
+        """
+        for name, contact in items:
+            self._index(name, contact)
+        self._sorted_tags = sorted(self._postings)
+
+    def _index(self, name: str, contact):
+        """
+        Додає нотатки контакту до словників. Повертає нові теги (ще не в _sorted_tags).
+        """
+        self._order.add(name)
+        grouped = {}
+        for note in getattr(contact, "notes", []):
+            tags = {tag.lower() for tag in note.tags} or (self.UNTAGGED,)
+            for tag in tags:
+                grouped.setdefault(tag, []).append(note)
+        if not grouped:
+            return []
+
+        self._tags[name] = tuple(grouped)
+        new_tags = []
+        for tag, notes in grouped.items():
+            if tag not in self._postings:
+                self._postings[tag] = {}
+                new_tags.append(tag)
+            self._postings[tag][name] = tuple(notes)
+        return new_tags
+
+    def tags(self):
+        """
+        Повертає всі теги (разом з UNTAGGED, якщо є такі нотатки) у відсортованому порядку.
+        """
+        return list(self._sorted_tags)
+
+    def complete(self, prefix: str, limit=None):
+        """
+        Повертає теги, що починаються з `prefix`, — не більше `limit` (без UNTAGGED).
+        """
+        start = bisect_left(self._sorted_tags, prefix)
+        tags = (tag for tag in _prefix_range(self._sorted_tags, start, prefix, None, lambda tag: tag)
+                if tag != self.UNTAGGED)
+        return list(islice(tags, limit))
+
+    def notes(self, tag: str):
+        """
+        Повертає пари (ім'я контакту, нотатка) з тегом `tag` (у нижньому регістрі)
+        у порядку книги та порядку нотаток у контакті.
+        """
+        postings = self._postings.get(tag)
+        if not postings:
+            return []
+        return [(name, note) for name in self._order.sort(postings) for note in postings[name]]
+
+
+_WORD = re.compile(r"\w+(?:['’ʼ]\w+)*")
+OR_OPERATORS = ("or", "або", "|")
+
+
+def tokenize(text: str):
+    """
+    Розбиває текст на слова з Unicode-нормалізацією регістру (casefold), тож
+    «Київ», «КИЇВ» і «київ» дають один термін; апостроф усередині слова
+    («сім'я», «п’ять») його не розриває.
+    """
+    return _WORD.findall(text.casefold())
+
+
+def note_words(note):
+    """
+    Слова нотатки для TextIndex: текст, а за ним теги.
+    """
+    words = tokenize(note.text)
+    for tag in note.tags:
+        words.extend(tokenize(tag))
+    return words
+
+
+def parse_text_query(query: str):
+    """
+    Розбирає запит у диз'юнкцію груп термінів: слова в групі поєднуються через AND,
+    групи розділяються операторами OR / або / |.
+    Повертає список непорожніх груп, наприклад "купити хліб OR молоко" →
+    [["купити", "хліб"], ["молоко"]].
+    """
+    groups = [[]]
+    for word in query.split():
+        if word.casefold() in OR_OPERATORS:
+            groups.append([])
+        else:
+            groups[-1].extend(tokenize(word))
+    return [group for group in groups if group]
+
+
+class TextIndex:
+    """
+    Інвертований індекс слів нотаток (текст і теги) з ранжуванням BM25.
+
+    Документ — це одна нотатка, що адресується парою (ім'я контакту, позиція нотатки).
+    Слово запиту збігається з усіма термінами, що з нього починаються («свят» →
+    «свято», «святковий»), тож пошук стійкий до закінчень. Відсортований список
+    термінів дає розгортання префікса через bisect без перебору словника.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings = {}     # термін → {документ: частота}
+        self._lengths = {}      # документ → кількість слів
+        self._doc_terms = {}    # документ → терміни (для видалення)
+        self._docs = {}         # ім'я → документи контакту
+        self._sorted_terms = []
+        self._total_length = 0
+        self._order = _BookOrder()
+
+    def update(self, name: str, contact):
+        for doc in self._docs.pop(name, ()):
+            self._total_length -= self._lengths.pop(doc)
+            for term in self._doc_terms.pop(doc):
+                docs = self._postings[term]
+                del docs[doc]
+                if not docs:
+                    del self._postings[term]
+                    del self._sorted_terms[bisect_left(self._sorted_terms, term)]
+
+        if contact is None:
+            self._order.discard(name)
+            return
+        for term in self._index(name, contact):
+            insort(self._sorted_terms, term)
+
+    def build(self, items):
+        """
+        Індексує всі пари (ім'я, контакт) порожнього індексу; словник термінів
+        сортується один раз після заповнення.
+        """
+        for name, contact in items:
+            self._index(name, contact)
+        self._sorted_terms = sorted(self._postings)
+
+    def _index(self, name: str, contact):
+        """
+        Додає нотатки контакту до словників. Повертає нові терміни (ще не в _sorted_terms).
+        """
+        self._order.add(name)
+        docs = []
+        new_terms = []
+        for position, note in enumerate(getattr(contact, "notes", [])):
+            words = note_words(note)
+            if not words:
+                continue
+            doc = (name, position)
+            frequencies = {}
+            for word in words:
+                frequencies[word] = frequencies.get(word, 0) + 1
+            for term, count in frequencies.items():
+                if term not in self._postings:
+                    self._postings[term] = {}
+                    new_terms.append(term)
+                self._postings[term][doc] = count
+            self._lengths[doc] = len(words)
+            self._doc_terms[doc] = tuple(frequencies)
+            self._total_length += len(words)
+            docs.append(doc)
+        if docs:
+            self._docs[name] = tuple(docs)
+        return new_terms
+
+    def _expand(self, prefix: str):
+        start = bisect_left(self._sorted_terms, prefix)
+        return _prefix_range(self._sorted_terms, start, prefix, None, lambda term: term)
+
+    def stats(self) -> tuple:
+        """
+        (кількість документів, сумарна кількість слів) — для idf і середньої довжини.
+        """
+        return len(self._lengths), self._total_length
+
+    def length(self, doc) -> int:
+        return self._lengths[doc]
+
+    def postings(self, prefix: str):
+        """
+        Пари (термін, {документ: частота}) для термінів, що починаються з `prefix`.
+        """
+        return [(term, self._postings[term]) for term in self._expand(prefix)]
+
+    def _term_scores(self, word: str) -> dict:
+        """
+        BM25-внесок слова запиту для кожного документа; з кількох термінів,
+        що починаються з цього слова, береться найкращий.
+        """
+        total_docs = len(self._lengths)
+        average_length = self._total_length / total_docs
+        scores = {}
+        for term, docs in self.postings(word):
+            idf = bm25_idf(total_docs, len(docs))
+            for doc, frequency in docs.items():
+                score = bm25_score(idf, frequency, self._lengths[doc], average_length)
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def search(self, groups, limit=None):
+        """
+        Виконує запит з parse_text_query(). Повертає (кількість збігів, найкращі
+        результати), де результати — до `limit` трійок (оцінка, ім'я, позиція нотатки)
+        від найрелевантнішої; рівні оцінки йдуть у порядку книги.
+        """
+        if not self._lengths:
+            return 0, []
+        total, best = rank_text_matches(groups, self._term_scores,
+                                        lambda doc: (self._order.position(doc[0]), doc[1]), limit)
+        return total, [(score, name, position) for (name, position), score in best]
+
+
+def bm25_idf(total_docs: int, doc_count: int) -> float:
+    return math.log(1 + (total_docs - doc_count + 0.5) / (doc_count + 0.5))
+
+
+def bm25_score(idf: float, frequency: int, length: int, average_length: float) -> float:
+    norm = TextIndex.K1 * (1 - TextIndex.B + TextIndex.B * length / average_length)
+    return idf * frequency * (TextIndex.K1 + 1) / (frequency + norm)
+
+
+def rank_text_matches(groups, term_scores, rank, limit=None):
+    """
+    Поєднує оцінки слів запиту: у групі — сума (документ має містити всі слова),
+    між групами — найкраща. term_scores(word) повертає {документ: оцінка},
+    rank(документ) — ключ порядку книги для рівних оцінок.
+    Returns:
+        tuple: (кількість збігів, до `limit` пар (документ, оцінка) від найкращої).
+    """
+    matched = {}
+    for group in groups:
+        group_scores = None
+        for word in sorted(set(group), key=len, reverse=True):
+            scores = term_scores(word)
+            if group_scores is None:
+                group_scores = scores
+            else:
+                group_scores = {doc: score + scores[doc]
+                                for doc, score in group_scores.items() if doc in scores}
+            if not group_scores:
+                break
+        for doc, score in (group_scores or {}).items():
+            if score > matched.get(doc, 0.0):
+                matched[doc] = score
+
+    def key(item):
+        doc, score = item
+        return -score, rank(doc)
+
+    if limit is None:
+        best = sorted(matched.items(), key=key)
+    else:
+        best = heapq.nsmallest(limit, matched.items(), key=key)
+    return len(matched), best
+
+
+def edit_distance(source: str, target: str, limit: int) -> int:
+    """
+    Відстань Дамерау–Левенштейна (з транспозицією сусідніх символів).
+    Обчислення припиняється, щойно відстань гарантовано перевищує `limit`;
+    тоді повертається limit + 1.
+    """
+    if abs(len(source) - len(target)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        for j in range(1, len(target) + 1):
+            cost = source[i - 1] != target[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _deletes(key: str):
+    """
+    Сам ключ і всі варіанти ключа з одним видаленим символом.
+    """
+    variants = {key[:i] + key[i + 1:] for i in range(len(key))}
+    variants.add(key)
+    return variants
+
+
+class FuzzyNameIndex:
+    """
+    Індекс імен контактів для підказок «можливо, ви мали на увазі» (алгоритм SymSpell).
+
+    Для кожного імені (casefold) заздалегідь зберігаються всі варіанти з одним
+    видаленим символом. Запит генерує такі самі варіанти, тож імена на відстані 1
+    (пропущена, зайва чи замінена літера, переставлені сусідні літери) знаходяться
+    кількома звертаннями до словника замість порівняння з усіма іменами.
+
+    Щоб не тримати мільйони рядків-варіантів, словник зберігає лише їхні хеші:
+    колізія дає зайвого кандидата, якого відсіює точна перевірка відстані.
+    Значення — ключ імені або кортеж ключів, якщо варіант спільний для кількох імен.
+    """
+
+    MAX_DISTANCE = 1
+
+    def __init__(self):
+        self._variants = {}  # хеш варіанта → ключ або кортеж ключів
+        self._names = {}     # ключ (casefold) → {ім'я: None}
+        self._keys = {}      # ім'я → ключ
+        self._order = _BookOrder()
+
+    def _link(self, key: str):
+        for variant in _deletes(key):
+            digest = hash(variant)
+            current = self._variants.get(digest)
+            if current is None:
+                self._variants[digest] = key
+            elif isinstance(current, str):
+                self._variants[digest] = (current, key)
+            else:
+                self._variants[digest] = current + (key,)
+
+    def _unlink(self, key: str):
+        for variant in _deletes(key):
+            digest = hash(variant)
+            current = self._variants[digest]
+            if isinstance(current, str):
+                del self._variants[digest]
+                continue
+            rest = tuple(other for other in current if other != key)
+            self._variants[digest] = rest[0] if len(rest) == 1 else rest
+
+    def update(self, name: str, contact):
+        key = self._keys.pop(name, None)
+        if key is not None:
+            names = self._names[key]
+            del names[name]
+            if not names:
+                del self._names[key]
+                self._unlink(key)
+
+        if contact is None:
+            self._order.discard(name)
+            return
+
+        self._order.add(name)
+        key = str(contact.name).casefold()
+        self._keys[name] = key
+        if key not in self._names:
+            self._names[key] = {}
+            self._link(key)
+        self._names[key][name] = None
+
+    def lookup(self, query: str, limit: int = 3):
+        """
+        Повертає до `limit` імен на відстані редагування не більше MAX_DISTANCE
+        від `query`: спершу точніші збіги, рівні — у порядку книги.
+        """
+        query = query.casefold()
+        candidates = set()
+        for variant in _deletes(query):
+            found = self._variants.get(hash(variant))
+            if isinstance(found, str):
+                candidates.add(found)
+            elif found:
+                candidates.update(found)
+
+        ranked = []
+        for key in candidates:
+            distance = edit_distance(query, key, self.MAX_DISTANCE)
+            if distance <= self.MAX_DISTANCE:
+                ranked.extend((distance, self._order.position(name), name) for name in self._names[key])
+        return [name for _, _, name in heapq.nsmallest(limit, ranked)]
+
+
+def _phone_key(contact):
+    return getattr(contact, "phone", None)
+
+
+def _email_key(contact):
+    email = getattr(contact, "email", None)
+    return email.casefold() if email else None
+
+
+def _name_key(contact):
+    return str(contact.name).casefold()
+
+
+def _birthday_key(contact):
+    birthday = getattr(contact, "birthday", None)
+    return (birthday.month, birthday.day) if birthday else None
+
+
+class FieldIndex:
+    """
+    Хеш-індекс «значення поля → імена контактів» для точного пошуку за O(1).
+
+    Значення можуть повторюватися (наприклад, спільний телефон), тому для кожного
+    значення зберігається впорядкований набір імен у порядку індексації.
+    """
+
+    def __init__(self, key):
+        self._key = key
+        self._entries = {}  # значення → {ім'я: None}
+        self._values = {}   # ім'я → проіндексоване значення
+
+    def update(self, name: str, contact):
+        old_value = self._values.pop(name, None)
+        if old_value is not None:
+            names = self._entries[old_value]
+            names.pop(name, None)
+            if not names:
+                del self._entries[old_value]
+
+        if contact is None:
+            return
+        value = self._key(contact)
+        if value:
+            self._values[name] = value
+            self._entries.setdefault(value, {})[name] = None
+
+    def get(self, value):
+        """
+        Повертає список імен контактів із точним значенням `value`.
+        """
+        return list(self._entries.get(value, ()))
+
+
+def phone_index() -> FieldIndex:
+    return FieldIndex(_phone_key)
+
+
+def email_index() -> FieldIndex:
+    return FieldIndex(_email_key)
+
+
+def name_index() -> FieldIndex:
+    return FieldIndex(_name_key)
+
+
+def birthday_index() -> FieldIndex:
+    """
+    Календарні «кошики» (місяць, день) → контакти; 29 лютого — окремий кошик.
+    """
+    return FieldIndex(_birthday_key)
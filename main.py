@@ -1,7 +1,25 @@
+import argparse
+import asyncio
+import contextlib
+import cProfile
+import pstats
+import signal
 import sys
+import time
+from itertools import islice
+from typing import Callable, NamedTuple, Optional, Tuple, Union
 from colorama import init, Fore, Style
+import api_server
 import app_func
-from command_suggestion import COMMAND_PATTERNS, suggest_commands
+import autosave
+import bulk_io
+import metrics
+from command_suggestion import COMMAND_PATTERNS, complete_command, suggest_commands
+
+try:
+    import readline
+except ImportError:  # Windows без pyreadline — працюємо без Tab-доповнення
+    readline = None
 
 # Ініціалізуємо colorama
 init(autoreset=True)
@@ -17,6 +35,7 @@ def print_menu():
     print("   <день народження>".ljust(40)+ "➜ Формат: ДД.ММ.ГГГГ - 12.12.2020")
     print("   find <запит>".ljust(40) + "➜ Знайти контакти за іменем або номером")
     print("   contacts".ljust(40) + "➜ Вивести всі збережені контакти")
+    print("   [--page N] [--per-page M]".ljust(40) + "➜ Лише N-на сторінка (для contacts і find)")
     print("   edit <старе_ім’я> <нове_ім’я/- >".ljust(40) +
           "➜ Редагувати дані контакту")
     print("   <телефон/- > <email/- > <адреса/- >".ljust(40) + "(пропускайте через '-')")
@@ -30,10 +49,22 @@ def print_menu():
     print("   edit-note <ім’я> <індекс> ".ljust(40) + "➜ Редагувати нотатку за індексом")
     print("   <новий текст> [tags: ...]".ljust(40))
     print("   delete-note <ім’я> <індекс>".ljust(40) + "➜ Видалити нотатку за індексом")
-    print("   search-notes <запит>".ljust(40) + "➜ Знайти нотатку за фрагментом тексту або тегом")
+    print("   search-notes <слова> [--limit K]".ljust(40) + "➜ Знайти нотатки за словами (AND, OR), за релевантністю")
+    print("   search-notes #<тег>".ljust(40) + "➜ Нотатки з точно таким тегом")
     print("   notes-by-tag".ljust(40) + "➜ Показати всі нотатки, згруповані за тегами")
 
+    print(Fore.GREEN + "\n  [📦 Імпорт / експорт]")
+    print("   import <файл.csv|.jsonl>".ljust(40) + "➜ Масово імпортувати контакти з файлу")
+    print("   [--workers N]".ljust(40) + "➜ Валідувати рядки в N процесах (0 — усі ядра)")
+    print("   export <файл.csv|.jsonl>".ljust(40) + "➜ Експортувати всі контакти у файл")
+
+    print(Fore.GREEN + "\n  [↩️ Історія змін]")
+    print("   undo / redo".ljust(40) + "➜ Скасувати / повторити останню команду")
+    print("   begin".ljust(40) + "➜ Почати транзакцію (кілька команд — одне збереження)")
+    print("   commit / rollback".ljust(40) + "➜ Зберегти / відкотити зміни транзакції")
+
     print(Fore.GREEN + "\n  [⚙️ Службові команди]")
+    print("   stats [--export ФАЙЛ] [--reset]".ljust(40) + "➜ Кількість і затримки (p50/p95/p99) команд і збережень")
     print("   help".ljust(40) + "➜ Показати це меню команд")
     print("   exit / close / quit".ljust(40) + "➜ Зберегти дані та вийти з програми")
 
@@ -41,71 +72,483 @@ def print_menu():
 
 
 
-def main():
-    # Завантажуємо книгу
-    book = app_func.load_data()
+class Pager:
+    """
+    Посторінковий вивід з паузою «далі» після кожних `per_page` контактів.
+    Обробник команди повертає Pager з лінивим генератором, а run_command показує
+    його вже після звільнення блокування книги: кожна сторінка рендериться під
+    `lock`, а очікування input() — без нього, тож фонове збереження й обробник
+    SIGTERM не чекають на користувача. Генератор має йти за знятим списком імен
+    (snapshot=True), бо між сторінками книга може змінитися.
+    """
 
-    print_menu()
+    def __init__(self, chunks, per_page: int, empty: str = None):
+        self.chunks = iter(chunks)
+        self.per_page = per_page
+        self.empty = empty
 
-    while True:
-        try:
-            user_input = input(Fore.BLUE + ">>> " + Style.RESET_ALL).strip()
-            if not user_input:
-                continue
+    def show(self, lock=None):
+        lock = lock if lock is not None else contextlib.nullcontext()
+        printed = 0
+        with lock:
+            page = list(islice(self.chunks, self.per_page + 1))
+        while page:
+            for chunk in page[:self.per_page]:
+                if printed:
+                    print()
+                print(chunk)
+                printed += 1
+            if len(page) <= self.per_page:
+                break
+            answer = input(Fore.YELLOW + "-- Далі: Enter, припинити: q -- " + Style.RESET_ALL)
+            if answer.strip().lower() == "q":
+                break
+            with lock:
+                page = page[self.per_page:] + list(islice(self.chunks, self.per_page))
+        if not printed and self.empty:
+            print(self.empty)
 
-            parts = user_input.split()
+
+def print_paged(chunks, page=None, per_page=app_func.DEFAULT_PAGE_SIZE) -> int:
+    """
+    Друкує відформатовані контакти з генератора по мірі їх формування.
+    Якщо задано `page` — лише цю сторінку. Повертає кількість надрукованих контактів.
+    """
+    if page is not None:
+        chunks = islice(chunks, (page - 1) * per_page, page * per_page)
+
+    printed = 0
+    for chunk in chunks:
+        if printed:
+            print()
+        print(chunk)
+        printed += 1
+    return printed
+
+
+def _interactive_paging(page) -> bool:
+    return page is None and sys.stdin.isatty()
+
+
+def parse_cli_args(argv=None):
+    parser = argparse.ArgumentParser(description="Особистий помічник — контакти та нотатки.")
+    parser.add_argument(
+        "--data",
+        default=app_func.DEFAULT_DATA_FILE,
+        help="файл даних: .pkl (знімок + журнал), .db/.sqlite (SQLite з лінивим завантаженням) "
+             "або .pabm (знімок для mmap + журнал, спільний для кількох процесів)",
+    )
+    parser.add_argument(
+        "--migrate-from",
+        metavar="PKL",
+        help="перед запуском перенести книгу з файлу .pkl у SQLite-базу або знімок .pabm, вказані в --data",
+    )
+    parser.add_argument(
+        "--upgrade-legacy",
+        action="store_true",
+        help="перед запуском переписати --data (або файл --migrate-from) зі старого формату pickle у поточний "
+             "(лише для довірених файлів: читання pickle може виконати довільний код)",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="виконати команди з файлу (або '-' — зі stdin) без інтерактивного меню",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=int,
+        default=0,
+        metavar="N",
+        help="у пакетному режимі зберігати дані кожні N команд (за замовчуванням — лише в кінці)",
+    )
+    parser.add_argument(
+        "--autosave",
+        type=float,
+        default=autosave.DEFAULT_DEBOUNCE,
+        metavar="SECONDS",
+        help="в інтерактивному режимі зберігати зміни у фоні після SECONDS секунд тиші "
+             f"(за замовчуванням {autosave.DEFAULT_DEBOUNCE}; 0 — зберігати одразу після команди)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="замість меню запустити локальний HTTP/JSON API над книгою",
+    )
+    parser.add_argument("--host", default=api_server.DEFAULT_HOST, help="адреса для --serve")
+    parser.add_argument("--port", type=int, default=api_server.DEFAULT_PORT, help="порт для --serve")
+    parser.add_argument(
+        "--metrics-file",
+        metavar="FILE",
+        help="під час виходу дописати статистику команд і збережень у FILE (JSON Lines)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="COMMAND",
+        help="виконати одну команду (у лапках) під cProfile, показати найгарячіші функції й вийти",
+    )
+    options = parser.parse_args(argv)
+    if options.migrate_from and not (app_func.sqlite_storage.is_sqlite_path(options.data)
+                                     or app_func.mapped_storage.is_mapped_path(options.data)):
+        parser.error("--migrate-from потребує --data з розширенням .db, .sqlite або .pabm")
+    return options
+
+
+EXIT_COMMANDS = ("exit", "close", "quit")
+COMPLETION_LIMIT = 100
+PROFILE_TOP = 25  # скільки найгарячіших функцій показує --profile
+
+
+def find_contacts(args: list, book):
+    args, page, per_page = app_func.parse_paging(args)
+    query = " ".join(args).strip().lower()
+    if not query:
+        return app_func.Contactss(args, book)
+    interactive = _interactive_paging(page)
+    matches = (app_func.format_contact(record)
+               for record in app_func.iter_matching_contacts(query, book, snapshot=interactive))
+    not_found = f"Нічого не знайдено за запитом: '{query}'."
+    if interactive:
+        return Pager(matches, per_page, not_found)
+    if not print_paged(matches, page, per_page):
+        print(not_found)
+
+
+def list_contacts(args: list, book):
+    _, page, per_page = app_func.parse_paging(args)
+    if not book.data:
+        print("Книга контактів порожня.")
+    elif _interactive_paging(page):
+        return Pager(app_func.iter_contacts(book, snapshot=True), per_page)
+    elif not print_paged(app_func.iter_contacts(book), page, per_page):
+        print(f"Сторінка {page} порожня.")
+
+
+def show_stats(args: list, book) -> str:
+    """
+    Показує кількість викликів і затримки команд, save_data / load_data та обсяг записаного.
+    Синтаксис: stats [--export ФАЙЛ] [--reset]
+    """
+    export_to, reset = None, False
+    tokens = iter(args)
+    for token in tokens:
+        if token == "--export":
+            export_to = next(tokens, None)
+            if export_to is None:
+                return "Помилка: Вкажіть файл після --export."
+        elif token == "--reset":
+            reset = True
+        else:
+            return f"Помилка: Невідомий параметр '{token}'. Синтаксис: {COMMAND_PATTERNS['stats']}"
+
+    report = metrics.METRICS.format()
+    if export_to:
+        metrics.METRICS.export(export_to)
+        report += f"\n💾 Метрики дописано у {export_to}"
+    if reset:
+        metrics.METRICS.reset()
+        report += "\n🔄 Статистику скинуто."
+    return report
+
+
+class Command(NamedTuple):
+    """
+    Запис реєстру команд.
+    handler(args, book) друкує вивід сам або повертає рядок результату чи Pager.
+    completions — що доповнювати Tab-ом у позиційних аргументах:
+    "contact" (ім'я контакту) або "tag" (тег); None — нічого.
+    """
+    handler: Callable[[list, object], Optional[Union[str, "Pager"]]]
+    completions: Tuple[Optional[str], ...] = ()
+
+
+# Реєстр команд; набір назв збігається з COMMAND_PATTERNS (підказки й доповнення).
+COMMANDS = {
+    "help": Command(lambda args, book: print_menu()),
+    "add": Command(lambda args, book: app_func.add_contact(*args, book), ("contact",)),
+    "birthdays": Command(lambda args, book: app_func.get_upcoming_birthdays(*args, book)),
+    "find": Command(find_contacts, ("contact",)),
+    "contacts": Command(list_contacts),
+    "edit": Command(lambda args, book: app_func.edit_contact(*args, book), ("contact",)),
+    "delete": Command(lambda args, book: app_func.delete_contact(*args, book), ("contact",)),
+    "add-note": Command(app_func.add_note, ("contact",)),
+    "edit-note": Command(app_func.edit_note, ("contact",)),
+    "delete-note": Command(app_func.delete_note, ("contact",)),
+    "search-notes": Command(app_func.search_notes, ("tag",)),
+    "notes-by-tag": Command(app_func.sort_notes_by_tag),
+    "import": Command(bulk_io.import_contacts),
+    "export": Command(bulk_io.export_contacts),
+    "undo": Command(app_func.undo),
+    "redo": Command(app_func.redo),
+    "begin": Command(app_func.begin_transaction),
+    "commit": Command(app_func.commit_transaction),
+    "rollback": Command(app_func.rollback_transaction),
+    "stats": Command(show_stats),
+}
+if set(COMMANDS) != set(COMMAND_PATTERNS):
+    raise RuntimeError("Реєстр команд і COMMAND_PATTERNS розійшлися: "
+                       f"{sorted(set(COMMANDS) ^ set(COMMAND_PATTERNS))}")
+
+
+def run_command(command: str, args: list, book, lock=None) -> bool:
+    """
+    Виконує одну команду (крім виходу) через реєстр COMMANDS і друкує результат.
+    Обробник працює під `lock` (блокування автозбереження), а посторінковий вивід
+    (Pager) показується вже без нього.
+    Повертає False, якщо команда невідома або повернула повідомлення про помилку.
+    """
+    spec = COMMANDS.get(command)
+    if spec is None:
+        suggestions = suggest_commands(command, args)
+        print(Fore.RED + f"❌ Невідома команда: {command}.")
+        if suggestions:
+            readable = ", ".join(COMMAND_PATTERNS[s] for s in suggestions[:3])
+            print(Fore.YELLOW + f"💡 Можливо, ви мали на увазі: {readable}")
+        print(Fore.YELLOW + "ℹ️ Введіть 'help' для повного списку команд.")
+        metrics.METRICS.count("command.unknown")
+        return False
+
+    with lock if lock is not None else contextlib.nullcontext():
+        with metrics.METRICS.timer(f"command:{command}"), book.undoable():
+            result = spec.handler(args, book)
+    if isinstance(result, Pager):
+        result.show(lock)
+        return True
+    if result is not None:
+        print(result)
+        if result.startswith(app_func.ERROR_PREFIXES):
+            metrics.METRICS.count("command.errors")
+            return False
+    return True
+
+
+def profile_command(line: str, book):
+    """
+    Виконує один рядок команди під cProfile і друкує PROFILE_TOP функцій
+    з найбільшим власним часом (tottime), а також їх сумарний час (cumtime).
+    """
+    parts = line.split()
+    if not parts:
+        print(Fore.RED + "❌ Порожня команда для --profile.")
+        return
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        run_command(parts[0].lower(), parts[1:], book)
+    finally:
+        profiler.disable()
+    elapsed = time.perf_counter() - started
+    print(Fore.CYAN + f"\n⏱ '{line}' виконано за {elapsed * 1000:.1f} мс. Найгарячіші функції:")
+    pstats.Stats(profiler, stream=sys.stdout).strip_dirs().sort_stats("tottime").print_stats(PROFILE_TOP)
+
+
+def completion_candidates(line: str, text: str, book) -> list:
+    """
+    Варіанти Tab-доповнення для слова `text`, перед яким у рядку стоїть `line`.
+    Перше слово — команда; далі — ім'я контакту чи тег згідно з Command.completions.
+    Теги доповнюються також у `tags:a,b` (add-note, edit-note) та `#тег` (search-notes).
+    """
+    words = line.split()
+    if not words:
+        commands = complete_command(text) + [c for c in EXIT_COMMANDS if c.startswith(text.lower())]
+        return sorted(commands)
+
+    spec = COMMANDS.get(words[0].lower())
+    if spec is None:
+        return []
+    if text.startswith("tags:"):
+        done, _, last = text[len("tags:"):].rpartition(",")
+        head = "tags:" + (done + "," if done else "")
+        return [head + tag for tag in book.complete_tags(last, COMPLETION_LIMIT)]
+    if text.startswith("#"):
+        return ["#" + tag for tag in book.complete_tags(text[1:], COMPLETION_LIMIT)]
+
+    position = len(words) - 1
+    kind = spec.completions[position] if position < len(spec.completions) else None
+    if kind == "contact":
+        return book.complete_names(text, COMPLETION_LIMIT)
+    if kind == "tag":
+        return book.complete_tags(text, COMPLETION_LIMIT)
+    return []
+
+
+def setup_completion(book, lock=contextlib.nullcontext()):
+    """
+    Вмикає Tab-доповнення команд, імен контактів і тегів у readline (якщо доступний).
+    """
+    if readline is None:
+        return
+    matches = []
+
+    def completer(text, state):
+        if state == 0:
+            line = readline.get_line_buffer()[:readline.get_begidx()]
+            with lock:
+                matches[:] = completion_candidates(line, text, book)
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer_delims(" \t\n")
+    readline.set_completer(completer)
+    readline.parse_and_bind("tab: complete")
+
+
+def run_batch(lines, book, checkpoint_every: int = 0) -> int:
+    """
+    Виконує команди з ітерованого джерела рядків (файл або stdin) в одному процесі.
+    Порожні рядки та коментарі (#) пропускаються, exit/close/quit завершує пакет.
+    Збереження відкладається до кінця пакета (або робиться кожні `checkpoint_every` команд).
+    Повертає кількість команд, що завершилися помилкою.
+    """
+    executed = failed = 0
+    started = time.perf_counter()
+
+    with app_func.deferred_saves(book):
+        for line_no, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split()
             command = parts[0].lower()
-            args = parts[1:]
+            if command in EXIT_COMMANDS:
+                break
 
-            if command in ["exit", "close", "quit"]:
-                app_func.save_data(book)
-                print(Fore.YELLOW + "✅ Збережено. До зустрічі!")
-                sys.exit(0)
+            print(Fore.BLUE + f"[{line_no}] >>> {line}")
+            try:
+                ok = run_command(command, parts[1:], book)
+            except Exception as e:
+                print(Fore.RED + f"⚠️ Виникла помилка: {str(e)}")
+                ok = False
+            executed += 1
+            failed += not ok
 
-            elif command == "help":
-                print_menu()
+            if checkpoint_every and executed % checkpoint_every == 0:
+                app_func.save_data(book, force=True)
 
-            elif command == "add":
-                print(app_func.add_contact(*args, book))
+        if book.in_transaction:
+            print(Fore.YELLOW + app_func.commit_transaction([], book))
 
-            elif command == "birthdays":
-                print(app_func.get_upcoming_birthdays(book))
+    elapsed = time.perf_counter() - started
+    rate = executed / elapsed if elapsed else 0.0
+    print(Fore.YELLOW + f"✅ Виконано команд: {executed} (з помилками: {failed}) "
+                        f"за {elapsed:.3f} с — {rate:.0f} команд/с. Дані збережено.")
+    return failed
 
-            elif command == "find":
-                print(app_func.Contactss(args, book))
 
-            elif command == "contacts":
-                print(app_func.show_all_contacts(book))
+def serve_api(book, options):
+    """
+    Режим --serve: HTTP/JSON API до SIGINT / SIGTERM / SIGHUP, потім збереження даних.
+    """
+    saver = app_func.enable_autosave(book, options.autosave) if options.autosave > 0 else None
+    server = api_server.ApiServer(book, options.host, options.port)
 
-            elif command == "edit":
-                print(app_func.edit_contact(*args, book))
+    def ready(server):
+        print(Fore.YELLOW + f"🌐 HTTP API слухає на http://{server.host}:{server.port} (Ctrl+C — зупинити)")
 
-            elif command == "delete":
-                print(app_func.delete_contact(*args, book))
+    try:
+        asyncio.run(server.serve(ready))
+    except OSError as e:  # порт зайнятий або адреса недоступна
+        print(Fore.RED + f"❌ Не вдалося запустити сервер: {e}")
+        return
+    finally:
+        if saver is not None:
+            app_func.disable_autosave(book)
+        else:
+            app_func.save_data(book)
+    print(Fore.YELLOW + "✅ Збережено. Сервер зупинено.")
+    if server.latency.count:
+        print(Fore.CYAN + server.latency.format("⏱ Запити"))
 
-            elif command == "add-note":
-                print(app_func.add_note(args, book))
 
-            elif command == "edit-note":
-                print(app_func.edit_note(args, book))
+def main():
+    options = parse_cli_args()
+    try:
+        if options.upgrade_legacy:
+            upgraded = app_func.upgrade_legacy_data(options.migrate_from or options.data)
+            print(Fore.YELLOW + f"✅ Переписано у новий формат контактів: {upgraded}")
+        if options.migrate_from:
+            migrated = app_func.migrate_data(options.migrate_from, options.data)
+            print(Fore.YELLOW + f"✅ Перенесено контактів у {options.data}: {migrated}")
+
+        # Завантажуємо книгу
+        book = app_func.load_data(options.data)
+    except (ValueError, FileNotFoundError) as e:
+        print(Fore.RED + str(e))
+        sys.exit(1)
 
-            elif command == "delete-note":
-                print(app_func.delete_note(args, book))
+    def export_metrics():
+        if options.metrics_file:
+            metrics.METRICS.export(options.metrics_file)
 
-            elif command == "search-notes":
-                print(app_func.search_notes(args, book))
+    if options.profile is not None:
+        profile_command(options.profile, book)
+        app_func.save_data(book)
+        export_metrics()
+        return
+
+    if options.batch:
+        if options.batch == "-":
+            failed = run_batch(sys.stdin, book, options.checkpoint)
+        else:
+            with open(options.batch, encoding="utf-8") as script:
+                failed = run_batch(script, book, options.checkpoint)
+        export_metrics()
+        sys.exit(1 if failed else 0)
+
+    if options.serve:
+        serve_api(book, options)
+        export_metrics()
+        return
+
+    print_menu()
+    saver = app_func.enable_autosave(book, options.autosave) if options.autosave > 0 else None
+    lock = saver.lock if saver is not None else contextlib.nullcontext()
+    latency = metrics.LatencyHistogram()
+    setup_completion(book, lock)
+
+    def shutdown(*_):
+        with lock:
+            if book.in_transaction:
+                print(Fore.YELLOW + app_func.commit_transaction([], book))
+        if saver is not None:
+            app_func.disable_autosave(book)
+        else:
+            app_func.save_data(book)
+        print(Fore.YELLOW + "✅ Збережено. До зустрічі!")
+        if latency.count:
+            print(Fore.CYAN + latency.format("⏱ Команди"))
+        if saver is not None and saver.save_latency.count:
+            print(Fore.CYAN + saver.save_latency.format("💾 Фонові записи"))
+        export_metrics()
+        sys.exit(0)
+
+    # SIGTERM / SIGHUP (закриття термінала) теж зберігають дані перед виходом.
+    for signal_name in ("SIGTERM", "SIGHUP"):
+        if hasattr(signal, signal_name):
+            signal.signal(getattr(signal, signal_name), shutdown)
+
+    while True:
+        try:
+            user_input = input(Fore.BLUE + ">>> " + Style.RESET_ALL).strip()
+            if not user_input:
+                continue
+
+            parts = user_input.split()
+            command = parts[0].lower()
+            args = parts[1:]
 
-            elif command == "notes-by-tag":
-                print(app_func.sort_notes_by_tag(args, book))
+            if command in EXIT_COMMANDS:
+                shutdown()
 
-            else:
-                suggestions = suggest_commands(command, args)
-                print(Fore.RED + f"❌ Невідома команда: {command}.")
-                if suggestions:
-                    readable = ", ".join(COMMAND_PATTERNS[s] for s in suggestions[:3])
-                    print(Fore.YELLOW + f"💡 Можливо, ви мали на увазі: {readable}")
-                print(Fore.YELLOW + "ℹ️ Введіть 'help' для повного списку команд.")
+            started = time.perf_counter()
+            with lock:
+                # Інші сесії могли змінити той самий файл даних — підтягуємо їхні зміни.
+                app_func.sync_data(book)
+            run_command(command, args, book, lock)
+            latency.add(time.perf_counter() - started)
 
+        except (KeyboardInterrupt, EOFError):
+            print()
+            shutdown()
         except Exception as e:
             print(Fore.RED + f"⚠️ Виникла помилка: {str(e)}")
 
@@ -0,0 +1,943 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import ItemsView, MutableMapping, Sequence, ValuesView
+from datetime import date
+from itertools import accumulate, islice
+
+import book_format
+import indexes
+import storage
+
+"""
+Незмінний знімок AddressBook, який читається через mmap (файли .pabm).
+
+Файл — набір секцій фіксованої розкладки: таблиці зсувів (масиви uint32) для
+контактів, нотаток, наборів тегів, а також «плити» рядків UTF-8. Відкриття — це
+mmap і перевірка заголовка, тож час запуску не залежить від розміру книги, а
+кілька процесів читають ту саму книгу зі спільного page cache ОС без власних копій.
+
+MappedRecords підміняє book.data (як SqliteRecords): контакт декодується з
+відображення лише при зверненні. Ітерація (contacts, побудова індексів) створює
+тимчасові контакти з лінивими нотатками (MappedNotes) і не тримає їх у пам'яті;
+book.data[name] кешує контакт, бо команди змінюють його «на місці», а peek(name)
+(результати find і birthdays) повертає тимчасовий контакт без кешування.
+
+У знімку також лежать готові таблиці пошуку, якими користуються команди читання
+замість індексів у пам'яті: впорядковані імена (точний пошук), дні народження
+за (місяць, день) — birthdays, текст полів і нотаток у нижньому регістрі для
+підрядкового пошуку — find, нотатки за тегами — notes-by-tag, search-notes #тег,
+і словник слів нотаток із частотами та довжинами нотаток — ранжування search-notes
+за BM25. Зміни після знімка (журнал + незбережені) накладаються поверх цих таблиць.
+
+Знімок не змінюється: зміни дописуються в журнал storage.Journal (той самий формат
+записів, що й для .pkl), а компакція будує новий файл і атомарно підміняє старий —
+процеси, що вже відобразили старий файл, дочитують його без змін (POSIX-семантика
+перейменування; на Windows відображений файл замінити не можна).
+
+Рядок, що вже в нижньому регістрі (телефони, email, часто й тексти нотаток),
+не дублюється: його запис посилається прямо в search_text — на це вказує старший
+біт довжини (_IN_SEARCH).
+
+Розкладка (little-endian): заголовок <4sB3xII (magic, версія, кількість секцій,
+CRC32 даних усіх секцій; у версії 1 — без CRC даних), таблиця секцій <QQ (зсув,
+довжина) у порядку SECTIONS, CRC32 заголовка й таблиці; секції вирівняні на 8 байтів.
+Файли версій 1–2 не мають таблиць слів (text_terms і далі) — для них search-notes
+будує indexes.TextIndex у пам'яті, як для .pkl.
+CRC даних при відкритті не перевіряється (це зробило б запуск O(розміру)) — від
+обірваного запису захищає атомарна заміна файлу; він лише робить ідентифікатор
+знімка для заголовка журналу (snapshot_id) залежним від вмісту.
+"""
+
+MAPPED_SUFFIXES = (".pabm",)
+FORMAT_VERSION = 3  # версія 1 — заголовок без CRC даних, 2 — без таблиць слів нотаток
+MAGIC = b"PABM"
+
+SECTIONS = (
+    "contacts",        # на контакт 11 × u32: ім'я, телефон, email, адреса (зсув, довжина), ДН (ординал), перша нотатка, кількість
+    "notes",           # на нотатку 4 × u32: текст (зсув, довжина), набір тегів, контакт
+    "tagsets",         # на набір 2 × u32: перше посилання в tag_refs, кількість
+    "tag_refs",        # u32: номер тегу
+    "tags",            # на тег 2 × u32: зсув, довжина
+    "name_order",      # u32: номери контактів, упорядковані за байтами імені
+    "birthday_order",  # u32: номери контактів із ДН, упорядковані за (місяць, день)
+    "birthday_keys",   # u32: місяць * 100 + день для birthday_order
+    "search_offsets",  # u32 × (контакти + 1): межі контактів у search_text
+    "tag_keys",        # на ключ 2 × u32: тег у нижньому регістрі (зсув, довжина), упорядковано
+    "tag_ranges",      # u32 × (ключі + 1): межі в tag_postings
+    "tag_postings",    # u32: номери нотаток із тегом у порядку книги
+    "strings",         # UTF-8 рядки контактів, нотаток і тегів
+    "search_text",     # поля контактів і нотаток у нижньому регістрі, розділені \0
+    "text_terms",      # на термін 2 × u32: слово нотаток (зсув, довжина), упорядковано за байтами
+    "text_ranges",     # u32 × (терміни + 1): межі в text_postings (у парах)
+    "text_postings",   # на входження 2 × u32: номер нотатки, частота — у порядку книги
+    "note_lengths",    # u32: кількість слів нотатки (indexes.note_words)
+)
+_V2_SECTIONS = SECTIONS[:SECTIONS.index("text_terms")]
+_CONTACT_FIELDS = 11
+_NOTE_FIELDS = 4
+_U32_MAX = 2 ** 32 - 1
+_IN_SEARCH = 1 << 31  # прапорець у довжині рядка: байти лежать у search_text
+
+_HEADER = struct.Struct("<4sB3xII")
+_HEADER_V1 = struct.Struct("<4sB3xI")  # спільний початок заголовків усіх версій
+_SECTION = struct.Struct("<QQ")
+_CRC = struct.Struct("<I")
+_ALIGN = 8
+
+
+def is_mapped_path(filename: str) -> bool:
+    return filename.lower().endswith(MAPPED_SUFFIXES)
+
+
+def _sections(version: int) -> tuple:
+    return SECTIONS if version >= 3 else _V2_SECTIONS
+
+
+def _header_size(version: int) -> int:
+    """
+    Довжина заголовка, таблиці секцій і CRC заголовка для версії формату `version`.
+    """
+    prefix = _HEADER_V1.size if version < 2 else _HEADER.size
+    return prefix + _SECTION.size * len(_sections(version)) + _CRC.size
+
+
+def snapshot_id(filename: str):
+    """
+    Ідентифікатор знімка .pabm для заголовка журналу: CRC32 заголовка й таблиці
+    секцій (з версії 2 вони містять CRC32 даних) або None, якщо файлу немає.
+    """
+    try:
+        with open(filename, "rb") as file:
+            header = file.read(_HEADER_V1.size)
+            if len(header) < _HEADER_V1.size:
+                return zlib.crc32(header)
+            header += file.read(_header_size(header[4]) - len(header))
+    except OSError:
+        return None
+    return zlib.crc32(header)
+
+
+def _u32(values) -> bytes:
+    values = array("I", values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _tag_keys(note) -> set:
+    return {tag.lower() for tag in note.tags} or {indexes.TagIndex.UNTAGGED}
+
+
+class _StringSlab:
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def add(self, data: bytes) -> tuple:
+        """
+        Дописує байти й повертає їхні (зсув, довжина).
+        """
+        offset = self.size
+        self.parts.append(data)
+        self.size += len(data)
+        if self.size > _U32_MAX or len(data) >= _IN_SEARCH:
+            raise ValueError("Книга завелика для формату .pabm (рядки понад 4 ГБ).")
+        return offset, len(data)
+
+    def add_text(self, text) -> tuple:
+        """
+        Дописує рядок у UTF-8; None і порожній рядок — (0, 0).
+        """
+        return self.add(text.encode("utf-8")) if text else (0, 0)
+
+
+def _encode_sections(items) -> dict:
+    strings, search_text = _StringSlab(), _StringSlab()
+    contacts, notes, tag_refs = array("I"), array("I"), array("I")
+    names, birthdays, search_offsets = [], [], [0]
+    tagset_ids, tag_ids, postings = {}, {}, {}
+    note_lengths, term_postings = array("I"), {}
+    for position, (name, contact) in enumerate(items):
+        name_bytes = name.encode("utf-8")
+        names.append(name_bytes)
+        birthday = contact.birthday
+        if birthday:
+            birthdays.append((birthday.month * 100 + birthday.day, position))
+        # Поля в search_text ідуть у порядку contact_search_fields: ім'я, телефон,
+        # email, адреса, далі для кожної нотатки — текст і її теги.
+        fields = indexes.contact_search_fields(contact)
+        encoded = [field.encode("utf-8") for field in fields]
+        starts = list(accumulate((len(field) + 1 for field in encoded), initial=search_text.size))
+
+        def text_ref(text, field: int) -> tuple:
+            if text and text == fields[field]:
+                return starts[field], len(encoded[field]) | _IN_SEARCH
+            return strings.add_text(text)
+
+        contacts.extend(text_ref(name, 0) + text_ref(contact.phone, 1) + text_ref(contact.email, 2)
+                        + text_ref(contact.address, 3))
+        contacts.extend((birthday.toordinal() if birthday else 0, len(notes) // _NOTE_FIELDS, len(contact.notes)))
+        field = 4
+        for note in contact.notes:
+            note_id = len(notes) // _NOTE_FIELDS
+            tags = tuple(note.tags)
+            if tags not in tagset_ids:
+                tagset_ids[tags] = len(tagset_ids)
+                tag_refs.extend(tag_ids.setdefault(tag, len(tag_ids)) for tag in tags)
+            notes.extend(text_ref(note.text, field) + (tagset_ids[tags], position))
+            field += 1 + len(tags)
+            for key in _tag_keys(note):
+                postings.setdefault(key, []).append(note_id)
+            words = indexes.note_words(note)
+            note_lengths.append(len(words))
+            frequencies = {}
+            for word in words:
+                frequencies[word] = frequencies.get(word, 0) + 1
+            for term, count in frequencies.items():
+                term_postings.setdefault(term, []).extend((note_id, count))
+        search_text.add(b"\0".join(encoded) + b"\0")
+        search_offsets.append(search_text.size)
+
+    tagsets, start = array("I"), 0
+    for tags in tagset_ids:
+        tagsets.extend((start, len(tags)))
+        start += len(tags)
+    tags = array("I")
+    for tag in tag_ids:
+        tags.extend(strings.add_text(tag))
+    tag_keys, tag_ranges, tag_postings = array("I"), [0], array("I")
+    for key in sorted(postings):
+        tag_keys.extend(strings.add_text(key))
+        tag_postings.extend(postings[key])
+        tag_ranges.append(len(tag_postings))
+    text_terms, text_ranges, text_postings = array("I"), [0], array("I")
+    for term in sorted(term_postings):
+        text_terms.extend(strings.add_text(term))
+        text_postings.extend(term_postings[term])
+        text_ranges.append(len(text_postings) // 2)
+    birthdays.sort()
+
+    return {
+        "contacts": _u32(contacts),
+        "notes": _u32(notes),
+        "tagsets": _u32(tagsets),
+        "tag_refs": _u32(tag_refs),
+        "tags": _u32(tags),
+        "name_order": _u32(sorted(range(len(names)), key=names.__getitem__)),
+        "birthday_order": _u32(position for _, position in birthdays),
+        "birthday_keys": _u32(key for key, _ in birthdays),
+        "search_offsets": _u32(search_offsets),
+        "tag_keys": _u32(tag_keys),
+        "tag_ranges": _u32(tag_ranges),
+        "tag_postings": _u32(tag_postings),
+        "strings": b"".join(strings.parts),
+        "search_text": b"".join(search_text.parts),
+        "text_terms": _u32(text_terms),
+        "text_ranges": _u32(text_ranges),
+        "text_postings": _u32(text_postings),
+        "note_lengths": _u32(note_lengths),
+    }
+
+
+def write_snapshot(address_book, filename: str) -> int:
+    """
+    Атомарно записує AddressBook у файл .pabm (див. storage.write_atomic).
+    Returns:
+        int: Розмір файлу в байтах.
+    """
+    sections = _encode_sections(address_book.data.items())
+    table, parts, data_crc = [], [], 0
+    offset = _header_size(FORMAT_VERSION)
+    for name in SECTIONS:
+        padding = -offset % _ALIGN
+        parts.append(b"\0" * padding + sections[name])
+        data_crc = zlib.crc32(parts[-1], data_crc)
+        offset += padding
+        table.append(_SECTION.pack(offset, len(sections[name])))
+        offset += len(sections[name])
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(SECTIONS), data_crc) + b"".join(table)
+    return storage.write_atomic(filename, [header, _CRC.pack(zlib.crc32(header))] + parts)
+
+
+class MappedNotes(Sequence):
+    """
+    Нотатки контакту, що декодуються зі знімка при зверненні (лише для читання).
+    """
+
+    __slots__ = ("_snapshot", "_first", "_count")
+
+    def __init__(self, snapshot, first: int, count: int):
+        self._snapshot = snapshot
+        self._first = first
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._snapshot.note(self._first + index)
+
+
+class MappedSnapshot:
+    """
+    Відкритий через mmap файл .pabm. Усі методи лише читають відображення.
+
+    Атрибути:
+        path (str): Шлях до файлу.
+        factories (book_format.Factories): Конструктори контактів і нотаток.
+    """
+
+    def __init__(self, path: str, factories: book_format.Factories):
+        self.path = path
+        self.factories = factories
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._spans = self._read_header()
+        except Exception:
+            self._map.close()
+            raise
+        self._views = {}
+        for name in self._spans:
+            if name not in ("strings", "search_text"):
+                self._views[name] = self._u32_view(*self._spans[name])
+        self._strings = self._spans["strings"][0]
+        self._search = self._spans["search_text"][0]
+        self._contacts = self._views["contacts"]
+        self._notes = self._views["notes"]
+        self._tagsets = {}
+        self._tag_table = {}
+        self._tag_keys = None
+        self._text_stats = None
+        self.has_text_index = "text_terms" in self._spans  # немає у файлах версій 1–2
+
+    def _read_header(self) -> dict:
+        data = self._map
+        if len(data) < _HEADER_V1.size:
+            raise ValueError(f"Обрізаний знімок: {self.path}")
+        magic, version, count = _HEADER_V1.unpack_from(data)
+        table_start = _HEADER_V1.size if version < 2 else _HEADER.size
+        table_end = _header_size(version) - _CRC.size
+        if len(data) < table_end + _CRC.size:
+            raise ValueError(f"Обрізаний знімок: {self.path}")
+        if magic != MAGIC:
+            raise ValueError(f"Не файл .pabm: {self.path}")
+        if version > FORMAT_VERSION:
+            raise storage.UnsupportedVersionError(
+                f"Помилка: {self.path} записано новішою версією формату ({version}), "
+                f"ніж підтримує програма ({FORMAT_VERSION}). Оновіть програму."
+            )
+        sections = _sections(version)
+        if count < len(sections) or _CRC.unpack_from(data, table_end)[0] != zlib.crc32(data[:table_end]):
+            raise ValueError(f"Пошкоджений заголовок знімка: {self.path}")
+        spans = {}
+        for position, name in enumerate(sections):
+            offset, length = _SECTION.unpack_from(data, table_start + position * _SECTION.size)
+            if offset + length > len(data):
+                raise ValueError(f"Обрізаний знімок: {self.path}")
+            spans[name] = (offset, offset + length)
+        return spans
+
+    def _u32_view(self, start: int, end: int):
+        if sys.byteorder == "big":
+            values = array("I", self._map[start:end])
+            values.byteswap()
+            return values
+        return memoryview(self._map)[start:end].cast("I")
+
+    def close(self):
+        for view in self._views.values():
+            if isinstance(view, memoryview):
+                view.release()
+        self._views = {}
+        self._map.close()
+
+    # --- рядки та записи ---
+    def _bytes(self, offset: int, length: int) -> bytes:
+        if length & _IN_SEARCH:
+            start = self._search + offset
+            return self._map[start:start + (length ^ _IN_SEARCH)]
+        start = self._strings + offset
+        return self._map[start:start + length]
+
+    def _text(self, offset: int, length: int) -> str:
+        return self._bytes(offset, length).decode("utf-8")
+
+    def __len__(self):
+        return len(self._contacts) // _CONTACT_FIELDS
+
+    def name(self, position: int) -> str:
+        base = position * _CONTACT_FIELDS
+        return self._text(self._contacts[base], self._contacts[base + 1])
+
+    def _name_bytes(self, position: int) -> bytes:
+        base = position * _CONTACT_FIELDS
+        return self._bytes(self._contacts[base], self._contacts[base + 1])
+
+    def index_of(self, name: str):
+        """
+        Номер контакту з іменем `name` (двійковий пошук за name_order) або None.
+        """
+        order = self._views["name_order"]
+        key = name.encode("utf-8")
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_bytes(order[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and self._name_bytes(order[low]) == key:
+            return order[low]
+        return None
+
+    def _tag(self, tag_id: int) -> str:
+        tag = self._tag_table.get(tag_id)
+        if tag is None:
+            tags = self._views["tags"]
+            tag = self._tag_table[tag_id] = sys.intern(self._text(tags[2 * tag_id], tags[2 * tag_id + 1]))
+        return tag
+
+    def _tagset(self, tagset_id: int) -> tuple:
+        tagset = self._tagsets.get(tagset_id)
+        if tagset is None:
+            start, count = self._views["tagsets"][2 * tagset_id:2 * tagset_id + 2]
+            refs = self._views["tag_refs"][start:start + count]
+            tagset = self._tagsets[tagset_id] = tuple(map(self._tag, refs))
+        return tagset
+
+    def note(self, note_id: int):
+        base = note_id * _NOTE_FIELDS
+        text = self._text(self._notes[base], self._notes[base + 1])
+        return self.factories.note(text, self._tagset(self._notes[base + 2]))
+
+    def note_contact(self, note_id: int) -> int:
+        return self._notes[note_id * _NOTE_FIELDS + 3]
+
+    def note_range(self, position: int) -> range:
+        """
+        Номери нотаток контакту `position`.
+        """
+        first, count = self._contacts[position * _CONTACT_FIELDS + 9:(position + 1) * _CONTACT_FIELDS]
+        return range(first, first + count)
+
+    def contact(self, position: int, lazy_notes: bool = False):
+        """
+        Декодує контакт. З lazy_notes=True нотатки читаються лише при зверненні (MappedNotes).
+        """
+        fields = self._contacts[position * _CONTACT_FIELDS:(position + 1) * _CONTACT_FIELDS]
+        name, phone, email, address = (self._text(fields[i], fields[i + 1]) for i in range(0, 8, 2))
+        birthday = date.fromordinal(fields[8]) if fields[8] else None
+        first, count = fields[9], fields[10]
+        if lazy_notes:
+            notes = MappedNotes(self, first, count)
+        else:
+            notes = [self.note(note_id) for note_id in range(first, first + count)]
+        return self.factories.contact(name, phone or None, email or None, address or None, birthday, notes)
+
+    # --- готові таблиці пошуку ---
+    def birthday_positions(self, key: int):
+        """
+        Номери контактів (за зростанням) із днем народження місяць * 100 + день == key.
+        """
+        keys = self._views["birthday_keys"]
+        return sorted(self._views["birthday_order"][bisect_left(keys, key):bisect_right(keys, key)])
+
+    def search(self, query: str):
+        """
+        Номери контактів (за зростанням), чиї поля або нотатки містять `query`
+        (у нижньому регістрі). Пошук — mmap.find по відображенню, без копій.
+        """
+        needle = query.encode("utf-8")
+        start, end = self._spans["search_text"]
+        offsets = self._views["search_offsets"]
+        positions = []
+        found = self._map.find(needle, start, end)
+        while found != -1:
+            position = bisect_right(offsets, found - start) - 1
+            positions.append(position)
+            found = self._map.find(needle, start + offsets[position + 1], end)
+        return positions
+
+    def tag_keys(self) -> list:
+        """
+        Теги (у нижньому регістрі, разом із TagIndex.UNTAGGED) у відсортованому порядку.
+        """
+        if self._tag_keys is None:
+            keys = self._views["tag_keys"]
+            self._tag_keys = [self._text(keys[i], keys[i + 1]) for i in range(0, len(keys), 2)]
+        return self._tag_keys
+
+    def tag_notes(self, tag: str):
+        """
+        Номери нотаток із тегом `tag` у порядку книги.
+        """
+        keys = self.tag_keys()
+        position = bisect_left(keys, tag)
+        if position == len(keys) or keys[position] != tag:
+            return ()
+        ranges = self._views["tag_ranges"]
+        return self._views["tag_postings"][ranges[position]:ranges[position + 1]]
+
+    def _term_bytes(self, term_id: int) -> bytes:
+        terms = self._views["text_terms"]
+        return self._bytes(terms[2 * term_id], terms[2 * term_id + 1])
+
+    def text_terms(self, prefix: str) -> list:
+        """
+        Пари (термін, номер терміна) слів нотаток, що починаються з `prefix`
+        (двійковий пошук за text_terms; порядок байтів UTF-8 збігається з порядком рядків).
+        """
+        key = prefix.encode("utf-8")
+        count = len(self._views["text_terms"]) // 2
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_bytes(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        terms = []
+        while low < count:
+            term = self._term_bytes(low)
+            if not term.startswith(key):
+                break
+            terms.append((term.decode("utf-8"), low))
+            low += 1
+        return terms
+
+    def text_postings(self, term_id: int):
+        """
+        Входження терміна плоским масивом [нотатка, частота, нотатка, частота, ...] у порядку книги.
+        """
+        ranges = self._views["text_ranges"]
+        return self._views["text_postings"][2 * ranges[term_id]:2 * ranges[term_id + 1]]
+
+    def note_length(self, note_id: int) -> int:
+        return self._views["note_lengths"][note_id]
+
+    def text_stats(self) -> tuple:
+        """
+        (кількість нотаток зі словами, сумарна кількість слів) для BM25. Обчислюється
+        один раз — прохід по note_lengths без декодування нотаток.
+        """
+        if self._text_stats is None:
+            lengths = self._views["note_lengths"]
+            self._text_stats = (len(lengths) - lengths.tolist().count(0), sum(lengths))
+        return self._text_stats
+
+
+def open_snapshot(filename: str, factories: book_format.Factories):
+    """
+    Відкриває найновіше неушкоджене покоління знімка .pabm.
+    Returns:
+        MappedSnapshot або None, якщо жодного покоління ще немає.
+    Raises:
+        ValueError: Якщо всі наявні покоління пошкоджені.
+    """
+    found = False
+    for path in storage.snapshot_generations(filename):
+        if not os.path.exists(path):
+            continue
+        found = True
+        try:
+            return MappedSnapshot(path, factories)
+        except storage.UnsupportedVersionError:
+            raise
+        except (OSError, ValueError):
+            continue
+    if found:
+        raise ValueError(f"Не вдалося прочитати жодне покоління знімка {filename}.")
+    return None
+
+
+def read_snapshot(filename: str, factories: book_format.Factories):
+    """
+    Повністю декодує знімок .pabm у звичайну AddressBook (для компакції журналу).
+    """
+    snapshot = open_snapshot(filename, factories)
+    if snapshot is None:
+        return None
+    try:
+        address_book = factories.address_book()
+        for position in range(len(snapshot)):
+            contact = snapshot.contact(position)
+            address_book.data[contact.name] = contact
+        return address_book
+    finally:
+        snapshot.close()
+
+
+class _RecordsValues(ValuesView):
+    def __iter__(self):
+        for _, contact in self._mapping._iter_items():
+            yield contact
+
+
+class _RecordsItems(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class MappedRecords(MutableMapping):
+    """
+    Словник «ім'я → Contact» поверх MappedSnapshot зі змінами в пам'яті.
+
+    Порядок ітерації — як у dict: контакти знімка на своїх місцях, нові
+    (і видалені, а потім додані знову) — у кінці в порядку додавання.
+    """
+
+    def __init__(self, snapshot: MappedSnapshot):
+        self.snapshot = snapshot
+        self._cache = {}       # звернені або нові контакти
+        self._added = {}       # ім'я → порядковий номер додавання (імена не на своєму місці у знімку)
+        self._deleted = set()  # імена зі знімка, видалені або перенесені в кінець
+        self._counter = 0
+
+    def _iter_items(self):
+        snapshot = self.snapshot
+        for position in range(len(snapshot)):
+            name = snapshot.name(position)
+            if name in self._deleted or name in self._added:
+                continue
+            contact = self._cache.get(name)
+            yield name, contact if contact is not None else snapshot.contact(position, lazy_notes=True)
+        for name in list(self._added):
+            yield name, self._cache[name]
+
+    def order_key(self, name: str) -> tuple:
+        """
+        Ключ сортування імені (присутнього в книзі) у порядку ітерації.
+        """
+        if name in self._added:
+            return 1, self._added[name]
+        return 0, self.snapshot.index_of(name)
+
+    def changed_names(self) -> set:
+        """
+        Імена, стан яких може відрізнятися від знімка (звернені, додані, видалені).
+        """
+        return set(self._cache) | set(self._added) | self._deleted
+
+    def prebuilt_index(self, kind: str):
+        """
+        Індекс `kind`, що читає готові таблиці знімка, або None (тоді AddressBook
+        будує звичайний індекс у пам'яті).
+        """
+        factory = MAPPED_INDEXES.get(kind)
+        if factory is None or not factory.available(self.snapshot):
+            return None
+        return factory(self)
+
+    def peek(self, name: str):
+        """
+        Контакт для читання: з кешу, якщо вже звернені, інакше тимчасовий об'єкт
+        з відображення (з лінивими нотатками), який не кешується.
+        """
+        if name in self._cache:
+            return self._cache[name]
+        position = None if name in self._deleted else self.snapshot.index_of(name)
+        if position is None:
+            raise KeyError(name)
+        return self.snapshot.contact(position, lazy_notes=True)
+
+    # --- інтерфейс MutableMapping ---
+    def __getitem__(self, name):
+        if name in self._cache:
+            return self._cache[name]
+        if name in self._deleted:
+            raise KeyError(name)
+        position = self.snapshot.index_of(name)
+        if position is None:
+            raise KeyError(name)
+        contact = self._cache[name] = self.snapshot.contact(position)
+        return contact
+
+    def __setitem__(self, name, contact):
+        if name not in self._added and (name in self._deleted or self.snapshot.index_of(name) is None):
+            self._added[name] = self._counter
+            self._counter += 1
+        self._cache[name] = contact
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._cache.pop(name, None)
+        self._added.pop(name, None)
+        if self.snapshot.index_of(name) is not None:
+            self._deleted.add(name)
+
+    def __contains__(self, name):
+        if name in self._cache or name in self._added:
+            return True
+        if name in self._deleted:
+            return False
+        return self.snapshot.index_of(name) is not None
+
+    def __iter__(self):
+        snapshot = self.snapshot
+        for position in range(len(snapshot)):
+            name = snapshot.name(position)
+            if name not in self._deleted and name not in self._added:
+                yield name
+        yield from list(self._added)
+
+    def __len__(self):
+        return len(self.snapshot) - len(self._deleted) + len(self._added)
+
+    def values(self):
+        return _RecordsValues(self)
+
+    def items(self):
+        return _RecordsItems(self)
+
+
+class _MappedIndex:
+    """
+    Основа індексів над таблицями знімка: контакти, змінені після знімка,
+    виключаються з відповідей таблиць і перевіряються напряму (їх небагато).
+    """
+
+    def __init__(self, records: MappedRecords):
+        self._records = records
+        self._snapshot = records.snapshot
+        self._overlay = {}    # ім'я → актуальний контакт
+        self._masked = set()  # номери контактів знімка, записи яких застаріли
+        for name in records.changed_names():
+            self.update(name, records.get(name))
+
+    @staticmethod
+    def available(snapshot: MappedSnapshot) -> bool:
+        """
+        Чи є у знімку таблиці для цього індексу (старші версії формату мають не всі).
+        """
+        return True
+
+    def update(self, name: str, contact):
+        position = self._snapshot.index_of(name)
+        if position is not None:
+            self._masked.add(position)
+        if contact is None:
+            self._overlay.pop(name, None)
+        else:
+            self._overlay[name] = contact
+
+    def _in_book_order(self, positions, names):
+        """
+        Об'єднує номери контактів знімка та імена зі змін у порядку книги.
+        """
+        keyed = [((0, position), position) for position in positions if position not in self._masked]
+        if not names:
+            return [self._snapshot.name(position) for _, position in keyed]
+        keyed = [(key, self._snapshot.name(position)) for key, position in keyed]
+        keyed += [(self._records.order_key(name), name) for name in names]
+        return [name for _, name in sorted(keyed)]
+
+
+class MappedBirthdayIndex(_MappedIndex):
+    """
+    Замінник indexes.birthday_index(): кошики (місяць, день) → імена.
+    """
+
+    def get(self, value):
+        month, day = value
+        names = [name for name, contact in self._overlay.items()
+                 if contact.birthday and (contact.birthday.month, contact.birthday.day) == value]
+        return self._in_book_order(self._snapshot.birthday_positions(month * 100 + day), names)
+
+
+class MappedSearchIndex(_MappedIndex):
+    """
+    Замінник indexes.TrigramIndex: точні збіги підрядка за mmap.find.
+    """
+
+    def candidates(self, query: str):
+        if not query:
+            return None
+        names = [name for name, contact in self._overlay.items()
+                 if any(query in field for field in indexes.contact_search_fields(contact))]
+        return self._in_book_order(self._snapshot.search(query), names)
+
+
+class MappedTagIndex(_MappedIndex):
+    """
+    Замінник indexes.TagIndex: нотатки за тегами з таблиць знімка.
+    """
+
+    UNTAGGED = indexes.TagIndex.UNTAGGED
+
+    def _live(self, note_ids) -> bool:
+        return any(self._snapshot.note_contact(note_id) not in self._masked for note_id in note_ids)
+
+    def tags(self):
+        tags = {tag for tag in self._snapshot.tag_keys() if self._live(self._snapshot.tag_notes(tag))}
+        for contact in self._overlay.values():
+            for note in contact.notes:
+                tags |= _tag_keys(note)
+        return sorted(tags)
+
+    def complete(self, prefix: str, limit=None):
+        tags = (tag for tag in self.tags() if tag.startswith(prefix) and tag != self.UNTAGGED)
+        return list(islice(tags, limit))
+
+    def notes(self, tag: str):
+        keyed = []
+        for note_id in self._snapshot.tag_notes(tag):
+            position = self._snapshot.note_contact(note_id)
+            if position not in self._masked:
+                keyed.append(((0, position), note_id, position, None))
+        for name, contact in self._overlay.items():
+            for position, note in enumerate(contact.notes):
+                if tag in _tag_keys(note):
+                    keyed.append((self._records.order_key(name), position, name, note))
+        if self._overlay:
+            keyed.sort(key=lambda item: item[:2])
+        names = {}
+        result = []
+        for _, note_id, source, note in keyed:
+            if note is None:
+                if source not in names:
+                    names[source] = self._snapshot.name(source)
+                result.append((names[source], self._snapshot.note(note_id)))
+            else:
+                result.append((source, note))
+        return result
+
+
+class MappedTextIndex(_MappedIndex):
+    """
+    Замінник indexes.TextIndex: BM25 за таблицями слів нотаток зі знімка.
+
+    Нотатки змінених контактів індексує звичайний TextIndex, а їхні застарілі
+    записи у знімку віднімаються від статистики (кількість документів, слів і
+    нотаток із терміном), тож оцінки збігаються з індексом у пам'яті. Документ
+    знімка — номер нотатки; він перекладається в (ім'я, позиція) лише для результатів.
+    """
+
+    def __init__(self, records: MappedRecords):
+        self._live = indexes.TextIndex()
+        self._docs, self._length = records.snapshot.text_stats()
+        self._masked_df = {}  # термін → кількість застарілих нотаток знімка з ним
+        super().__init__(records)
+
+    @staticmethod
+    def available(snapshot: MappedSnapshot) -> bool:
+        return snapshot.has_text_index
+
+    def update(self, name: str, contact):
+        position = self._snapshot.index_of(name)
+        if position is not None and position not in self._masked:
+            self._mask_notes(position)
+        super().update(name, contact)
+        self._live.update(name, contact)
+
+    def _mask_notes(self, position: int):
+        for note_id in self._snapshot.note_range(position):
+            length = self._snapshot.note_length(note_id)
+            if not length:
+                continue
+            self._docs -= 1
+            self._length -= length
+            for term in set(indexes.note_words(self._snapshot.note(note_id))):
+                self._masked_df[term] = self._masked_df.get(term, 0) + 1
+
+    def _term_scores(self, word: str) -> dict:
+        snapshot, masked = self._snapshot, self._masked
+        live_docs, live_length = self._live.stats()
+        total_docs = self._docs + live_docs
+        average_length = (self._length + live_length) / total_docs
+        terms = {term: (term_id, {}) for term, term_id in snapshot.text_terms(word)}
+        for term, docs in self._live.postings(word):
+            terms[term] = (terms.get(term, (None,))[0], docs)
+        scores = {}
+        for term, (term_id, live) in terms.items():
+            postings = snapshot.text_postings(term_id) if term_id is not None else ()
+            idf = indexes.bm25_idf(total_docs, len(postings) // 2 - self._masked_df.get(term, 0) + len(live))
+            for i in range(0, len(postings), 2):
+                note_id = postings[i]
+                if masked and snapshot.note_contact(note_id) in masked:
+                    continue
+                score = indexes.bm25_score(idf, postings[i + 1], snapshot.note_length(note_id), average_length)
+                if score > scores.get(note_id, 0.0):
+                    scores[note_id] = score
+            for doc, frequency in live.items():
+                score = indexes.bm25_score(idf, frequency, self._live.length(doc), average_length)
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def _rank(self, doc):
+        if isinstance(doc, tuple):
+            name, position = doc
+            return self._records.order_key(name), position
+        return (0, self._snapshot.note_contact(doc)), doc
+
+    def _address(self, doc) -> tuple:
+        if isinstance(doc, tuple):
+            return doc
+        position = self._snapshot.note_contact(doc)
+        return self._snapshot.name(position), doc - self._snapshot.note_range(position).start
+
+    def search(self, groups, limit=None):
+        """
+        Те саме, що indexes.TextIndex.search(): (кількість збігів, трійки (оцінка, ім'я, позиція)).
+        """
+        if not self._docs + self._live.stats()[0]:
+            return 0, []
+        total, best = indexes.rank_text_matches(groups, self._term_scores, self._rank, limit)
+        return total, [(score,) + self._address(doc) for doc, score in best]
+
+
+MAPPED_INDEXES = {
+    "birthday": MappedBirthdayIndex,
+    "trigram": MappedSearchIndex,
+    "tags": MappedTagIndex,
+    "text": MappedTextIndex,
+}
+
+
+class MappedStorage(storage.SnapshotStorage):
+    """
+    Сховище .pabm: незмінний mmap-знімок + журнал змін storage.Journal.
+    Журнал, блокування між процесами й sync() — як у storage.SnapshotStorage.
+
+    Атрибути:
+        filename (str): Абсолютний шлях до знімка.
+        factories (book_format.Factories): Конструктори книги, контактів і нотаток.
+    """
+
+    snapshot_id = staticmethod(snapshot_id)
+
+    def _read_book(self, address_book_factory):
+        """
+        Відображає знімок (O(1) від розміру книги) замість читання.
+        """
+        address_book = address_book_factory()
+        snapshot = open_snapshot(self.filename, self.factories)
+        if snapshot is not None:
+            address_book.data = MappedRecords(snapshot)
+        return address_book
+
+    def _compact_async(self):
+        self.journal.compact_async(self.filename, read_snapshot, write_snapshot, on_compacted=self._rebase)
+
+    def _write_snapshot(self, address_book):
+        """
+        Записує новий знімок. Книга зі звичайним словником перемикається на читання
+        з відображення (контакти більше не тримаються в пам'яті).
+        """
+        written = write_snapshot(address_book, self.filename)
+        if not isinstance(address_book.data, MappedRecords):
+            address_book.data = MappedRecords(open_snapshot(self.filename, self.factories))
+        return written
@@ -0,0 +1,157 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+"""
+Гістограми затримок і лічильники для вимірювання швидкодії команд, збережень
+і завантажень.
+
+Значення розкладаються в логарифмічні кошики (по BUCKETS_PER_DECADE на кожен
+порядок величини), тож гістограма займає сталу пам'ять незалежно від кількості
+вимірів, а перцентилі обчислюються з точністю до ширини кошика (~12%).
+METRICS — спільний для процесу реєстр, у який пишуть REPL, автозбереження та сервер.
+"""
+
+BUCKETS_PER_DECADE = 20
+MIN_SECONDS = 1e-6  # усе коротше за мікросекунду потрапляє в перший кошик
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self._buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        bucket = max(0, math.ceil(math.log10(max(seconds, MIN_SECONDS) / MIN_SECONDS) * BUCKETS_PER_DECADE))
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Повертає верхню межу кошика, у який потрапляє `fraction` (0..1) вимірів.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(MIN_SECONDS * 10 ** (bucket / BUCKETS_PER_DECADE), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+    def format(self, label: str) -> str:
+        summary = self.summary()
+        return (f"{label}: {summary['count']} шт., p50 {summary['p50_ms']} мс, p95 {summary['p95_ms']} мс, "
+                f"p99 {summary['p99_ms']} мс, макс. {summary['max_ms']} мс")
+
+
+def format_bytes(count: int) -> str:
+    for unit in ("Б", "КБ", "МБ"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "Б" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} ГБ"
+
+
+class Metrics:
+    """
+    Реєстр гістограм затримок (за назвою операції) і лічильників.
+    Потокобезпечний: у нього пишуть і REPL, і фонові потоки.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.counters = {}
+        self.started = time.monotonic()
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                histogram = self.latencies[name] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Записує тривалість блоку в гістограму `name` (навіть якщо блок кинув виняток).
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def reset(self):
+        with self._lock:
+            self.latencies.clear()
+            self.counters.clear()
+            self.started = time.monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "uptime_s": round(time.monotonic() - self.started, 3),
+                "latency": {name: histogram.summary() for name, histogram in sorted(self.latencies.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def export(self, filename: str):
+        """
+        Дописує поточний знімок метрик одним рядком JSON у `filename` (формат JSON Lines),
+        тож файл зберігає історію знімків між запусками.
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, "a", encoding="utf-8") as file:
+            file.write(json.dumps(self.snapshot(), ensure_ascii=False) + "\n")
+
+    def format(self) -> str:
+        """
+        Таблиця для команди stats: кількість викликів і затримки кожної операції, лічильники.
+        """
+        snapshot = self.snapshot()
+        lines = [f"📊 Статистика за {snapshot['uptime_s'] / 60:.1f} хв:"]
+        if snapshot["latency"]:
+            width = max(len(name) for name in snapshot["latency"]) + 2
+            lines.append("Операція".ljust(width) + "К-сть".rjust(8) + "p50, мс".rjust(10) + "p95, мс".rjust(10)
+                         + "p99, мс".rjust(10) + "макс., мс".rjust(11))
+            for name, summary in snapshot["latency"].items():
+                lines.append(name.ljust(width) + str(summary["count"]).rjust(8)
+                             + "".join(f"{summary[key]:.3f}".rjust(10) for key in ("p50_ms", "p95_ms", "p99_ms"))
+                             + f"{summary['max_ms']:.3f}".rjust(11))
+        else:
+            lines.append("Ще не виконано жодної команди.")
+        for name, value in snapshot["counters"].items():
+            shown = format_bytes(value) if name.endswith(".bytes") else value
+            lines.append(f"{name}: {shown}")
+        return "\n".join(lines)
+
+
+METRICS = Metrics()
@@ -0,0 +1,446 @@
+import json
+import os
+import sqlite3
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from datetime import date
+
+"""
+SQLite-сховище AddressBook з лінивим завантаженням контактів.
+
+SqliteRecords підміняє словник book.data: при відкритті бази нічого не читається,
+контакт (разом із нотатками) завантажується з таблиць лише при першому зверненні
+і далі кешується, тож зміни «на місці» працюють як зі звичайним словником.
+Кеш скидається (sync), коли базу змінює інше з'єднання — PRAGMA data_version.
+Нові та видалені контакти тримаються в пам'яті до save_data(), яке записує
+лише змінені рядки.
+
+Схема: contacts, notes, tags + note_tags (теги через таблицю зв'язків).
+База працює в режимі WAL — читачі в інших процесах не блокуються записом.
+"""
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    name     TEXT NOT NULL UNIQUE,
+    phone    TEXT,
+    email    TEXT,
+    address  TEXT,
+    birthday TEXT
+);
+CREATE INDEX IF NOT EXISTS contacts_phone ON contacts(phone);
+CREATE INDEX IF NOT EXISTS contacts_email ON contacts(email);
+CREATE TABLE IF NOT EXISTS notes (
+    id          INTEGER PRIMARY KEY,
+    contact_seq INTEGER NOT NULL REFERENCES contacts(seq) ON DELETE CASCADE,
+    position    INTEGER NOT NULL,
+    text        TEXT NOT NULL,
+    UNIQUE (contact_seq, position)
+);
+CREATE TABLE IF NOT EXISTS tags (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS note_tags (
+    note_id  INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag_id   INTEGER NOT NULL REFERENCES tags(id),
+    PRIMARY KEY (note_id, position)
+);
+CREATE INDEX IF NOT EXISTS note_tags_tag ON note_tags(tag_id);
+"""
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_FETCH_SIZE = 500
+
+
+def is_sqlite_path(filename: str) -> bool:
+    return filename.lower().endswith(SQLITE_SUFFIXES)
+
+
+def _table_exists(connection: sqlite3.Connection, name: str) -> bool:
+    row = connection.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row is not None
+
+
+def _migrate_v1(connection: sqlite3.Connection):
+    """
+    Переносить нотатки зі схеми v1 (теги JSON-рядком у notes.tags, таблиця
+    перейменована на notes_v1) у схему v2. Виконується однією транзакцією.
+    """
+    rows = connection.execute("SELECT contact_seq, position, text, tags FROM notes_v1").fetchall()
+    for contact_seq, position, text, tags in rows:
+        note_id = connection.execute(
+            "INSERT INTO notes (contact_seq, position, text) VALUES (?, ?, ?)", (contact_seq, position, text)
+        ).lastrowid
+        _write_note_tags(connection, note_id, json.loads(tags))
+    connection.execute("DROP TABLE notes_v1")
+
+
+def connect(filename: str) -> sqlite3.Connection:
+    """
+    Відкриває базу, створює або мігрує схему.
+    """
+    # З'єднання використовує і потік автозбереження; доступ серіалізує AutoSaver.lock.
+    connection = sqlite3.connect(filename, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA foreign_keys = ON")
+
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(notes)")]
+    if "tags" in columns:
+        connection.execute("ALTER TABLE notes RENAME TO notes_v1")
+    connection.executescript(SCHEMA)
+    # Бази попередніх версій мали FTS5-індекс нотаток; search-notes шукає власним
+    # індексом у пам'яті, тож таблицю прибираємо, щоб не підтримувати її на кожен запис.
+    if _table_exists(connection, "notes_fts"):
+        connection.execute("DROP TABLE notes_fts")
+    if _table_exists(connection, "notes_v1"):
+        with connection:
+            _migrate_v1(connection)
+    # Без зайвого запису: інакше кожне відкриття бази змінювало б data_version інших з'єднань.
+    if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return connection
+
+
+# --- запис рядків ---
+def _tag_id(connection: sqlite3.Connection, tag: str) -> int:
+    row = connection.execute("SELECT id FROM tags WHERE name = ?", (tag,)).fetchone()
+    if row is not None:
+        return row[0]
+    return connection.execute("INSERT INTO tags (name) VALUES (?)", (tag,)).lastrowid
+
+
+def _write_note_tags(connection: sqlite3.Connection, note_id: int, tags):
+    connection.executemany(
+        "INSERT INTO note_tags (note_id, position, tag_id) VALUES (?, ?, ?)",
+        [(note_id, position, _tag_id(connection, tag)) for position, tag in enumerate(tags)],
+    )
+
+
+def _delete_notes(connection: sqlite3.Connection, seq: int):
+    connection.execute("DELETE FROM notes WHERE contact_seq = ?", (seq,))
+
+
+def _write_contact(connection: sqlite3.Connection, name: str, contact) -> int:
+    """
+    Записує контакт разом із нотатками. Повертає логічний обсяг записаних даних
+    у байтах (UTF-8 значень полів, текстів нотаток і тегів, без накладних витрат SQLite).
+    """
+    birthday = contact.birthday.isoformat() if contact.birthday else None
+    values = (contact.phone, contact.email, contact.address, birthday, name)
+    cursor = connection.execute(
+        "UPDATE contacts SET phone = ?, email = ?, address = ?, birthday = ? WHERE name = ?", values
+    )
+    if cursor.rowcount == 0:
+        connection.execute(
+            "INSERT INTO contacts (phone, email, address, birthday, name) VALUES (?, ?, ?, ?, ?)", values
+        )
+    (seq,) = connection.execute("SELECT seq FROM contacts WHERE name = ?", (name,)).fetchone()
+    _delete_notes(connection, seq)
+    written = sum(len(value.encode("utf-8")) for value in values if value)
+    for position, note in enumerate(contact.notes):
+        written += len(note.text.encode("utf-8")) + sum(len(tag.encode("utf-8")) for tag in note.tags)
+        note_id = connection.execute(
+            "INSERT INTO notes (contact_seq, position, text) VALUES (?, ?, ?)", (seq, position, note.text)
+        ).lastrowid
+        _write_note_tags(connection, note_id, note.tags)
+    return written
+
+
+def _delete_contact(connection: sqlite3.Connection, name: str):
+    row = connection.execute("SELECT seq FROM contacts WHERE name = ?", (name,)).fetchone()
+    if row is None:
+        return
+    _delete_notes(connection, row[0])
+    connection.execute("DELETE FROM contacts WHERE seq = ?", row)
+
+
+class _RecordsValues(ValuesView):
+    def __iter__(self):
+        for _, contact in self._mapping._iter_items():
+            yield contact
+
+
+class _RecordsItems(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class SqliteRecords(MutableMapping):
+    """
+    Словник «ім'я → Contact», що читає контакти з SQLite на вимогу.
+
+    Порядок ітерації збігається з порядком вставки, як у dict: повторне
+    присвоєння наявного імені зберігає позицію, видалення й нове додавання
+    переносить контакт у кінець.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, contact_factory, note_factory):
+        self.connection = connection
+        self._contact_factory = contact_factory
+        self._note_factory = note_factory
+        self._cache = {}     # завантажені або нові контакти
+        self._added = {}     # імена, яких ще немає на своїй позиції в БД (впорядковано)
+        self._deleted = set()  # імена з БД, видалені або перенесені в кінець
+
+    # --- читання з БД ---
+    def _db_contains(self, name: str) -> bool:
+        row = self.connection.execute("SELECT 1 FROM contacts WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def _build_contact(self, row, notes):
+        _, name, phone, email, address, birthday = row
+        contact = self._contact_factory(name)
+        contact.phone = phone
+        contact.email = email
+        contact.address = address
+        contact.birthday = date.fromisoformat(birthday) if birthday else None
+        contact.notes = [self._note_factory(text, tags) for text, tags in notes]
+        return contact
+
+    def _note_rows(self, where: str = "", params=()):
+        """
+        Повертає курсор (contact_seq, text, tags) — теги зібрані в рядок через \\x1f.
+        """
+        return self.connection.execute(
+            "SELECT n.contact_seq, n.text, "
+            "       (SELECT group_concat(name, char(31)) FROM ("
+            "            SELECT t.name AS name FROM note_tags nt JOIN tags t ON t.id = nt.tag_id"
+            "            WHERE nt.note_id = n.id ORDER BY nt.position)) "
+            f"FROM notes n {where} ORDER BY n.contact_seq, n.position",
+            params,
+        )
+
+    @staticmethod
+    def _split_tags(tags):
+        return tags.split("\x1f") if tags else []
+
+    def _load(self, name: str):
+        row = self.connection.execute(
+            "SELECT seq, name, phone, email, address, birthday FROM contacts WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        notes = [(text, self._split_tags(tags))
+                 for _, text, tags in self._note_rows("WHERE n.contact_seq = ?", (row[0],))]
+        return self._build_contact(row, notes)
+
+    def _iter_items(self):
+        """
+        Потоково читає контакти разом із нотатками двома впорядкованими курсорами
+        (без окремого запиту на кожен контакт). Уже завантажені контакти
+        віддаються з кешу, решта — свіжозібраними і не кешуються.
+        """
+        contacts = self.connection.execute(
+            "SELECT seq, name, phone, email, address, birthday FROM contacts ORDER BY seq"
+        )
+        notes = self._note_rows()
+        pending_note = notes.fetchone()
+        while True:
+            rows = contacts.fetchmany(_FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                seq, name = row[0], row[1]
+                contact_notes = []
+                while pending_note is not None and pending_note[0] <= seq:
+                    if pending_note[0] == seq:
+                        contact_notes.append((pending_note[1], self._split_tags(pending_note[2])))
+                    pending_note = notes.fetchone()
+                if name in self._deleted or name in self._added:
+                    continue
+                # Прохід по книзі не кешує контакти: у кеш потрапляє лише те,
+                # що дістали через __getitem__ (перед зміною), інакше show-all
+                # тримав би в пам'яті всю базу.
+                contact = self._cache.get(name)
+                yield name, contact if contact is not None else self._build_contact(row, contact_notes)
+        for name in list(self._added):
+            yield name, self._cache[name]
+
+    def peek(self, name):
+        """
+        Контакт лише для читання: з кешу або прочитаний з бази без кешування.
+        """
+        if name in self._cache:
+            return self._cache[name]
+        contact = None if name in self._deleted else self._load(name)
+        if contact is None:
+            raise KeyError(name)
+        return contact
+
+    # --- інтерфейс MutableMapping ---
+    def __getitem__(self, name):
+        if name in self._cache:
+            return self._cache[name]
+        if name in self._deleted:
+            raise KeyError(name)
+        contact = self._load(name)
+        if contact is None:
+            raise KeyError(name)
+        self._cache[name] = contact
+        return contact
+
+    def __setitem__(self, name, contact):
+        if name not in self._added and (name in self._deleted or not self._db_contains(name)):
+            self._added[name] = None
+        self._cache[name] = contact
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._cache.pop(name, None)
+        self._added.pop(name, None)
+        if self._db_contains(name):
+            self._deleted.add(name)
+
+    def __contains__(self, name):
+        if name in self._cache or name in self._added:
+            return True
+        if name in self._deleted:
+            return False
+        return self._db_contains(name)
+
+    def __iter__(self):
+        cursor = self.connection.execute("SELECT name FROM contacts ORDER BY seq")
+        while True:
+            rows = cursor.fetchmany(_FETCH_SIZE)
+            if not rows:
+                break
+            for (name,) in rows:
+                if name not in self._deleted and name not in self._added:
+                    yield name
+        yield from list(self._added)
+
+    def __len__(self):
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM contacts").fetchone()
+        return count - len(self._deleted) + len(self._added)
+
+    def values(self):
+        return _RecordsValues(self)
+
+    def items(self):
+        return _RecordsItems(self)
+
+    def invalidate(self, keep=()):
+        """
+        Забуває завантажені з бази контакти (крім незбережених змін `keep` і нових),
+        щоб наступне звернення прочитало їх заново.
+        """
+        keep = set(keep)
+        for name in list(self._cache):
+            if name not in keep and name not in self._added:
+                del self._cache[name]
+
+    # --- запис ---
+    def flush(self, names):
+        """
+        Записує в БД поточний стан контактів `names` однією транзакцією.
+        Нові контакти вставляються в порядку додавання, щоб зберегти порядок книги.
+        Повертає логічний обсяг записаних даних у байтах (див. _write_contact).
+        """
+        names = set(names)
+        written = 0
+        with self.connection:
+            for name in names:
+                if name in self._added:
+                    continue
+                if name in self._deleted:
+                    _delete_contact(self.connection, name)
+                    self._deleted.discard(name)
+                elif name in self._cache:
+                    written += _write_contact(self.connection, name, self._cache[name])
+            for name in list(self._added):
+                if name not in names:
+                    continue
+                if name in self._deleted:
+                    _delete_contact(self.connection, name)
+                    self._deleted.discard(name)
+                written += _write_contact(self.connection, name, self._cache[name])
+                del self._added[name]
+        return written
+
+
+class SqliteStorage:
+    """
+    Сховище AddressBook у базі SQLite (файли .db / .sqlite).
+
+    Атрибути:
+        filename (str): Абсолютний шлях до бази.
+    """
+
+    def __init__(self, filename: str, contact_factory, note_factory):
+        self.filename = os.path.abspath(filename)
+        self._contact_factory = contact_factory
+        self._note_factory = note_factory
+        self._connection = None
+        self._data_version = None  # PRAGMA data_version, якому відповідає кеш книги
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            self._connection = connect(self.filename)
+        return self._connection
+
+    def _records(self) -> SqliteRecords:
+        return SqliteRecords(self.connection, self._contact_factory, self._note_factory)
+
+    def _read_data_version(self) -> int:
+        # Змінюється лише після комітів інших з'єднань (зокрема інших процесів).
+        (version,) = self.connection.execute("PRAGMA data_version").fetchone()
+        return version
+
+    def load(self, address_book_factory):
+        """
+        Повертає AddressBook, контакти якої читаються з бази на вимогу.
+        """
+        address_book = address_book_factory()
+        address_book.data = self._records()
+        self._data_version = self._read_data_version()
+        return address_book
+
+    def sync(self, address_book, keep=()):
+        """
+        Якщо базу змінило інше з'єднання, скидає кеш завантажених контактів
+        (крім незбережених змін `keep`) — вони перечитаються з бази при зверненні.
+        Returns:
+            set: Порожня множина, якщо змін не було, або None — книга змінилася
+            невідомо де, тож індекси треба перебудувати.
+        """
+        version = self._read_data_version()
+        if version == self._data_version:
+            return set()
+        self._data_version = version
+        address_book.data.invalidate(keep)
+        return None
+
+    def write_changes(self, address_book, names):
+        """
+        Записує лише змінені контакти — кілька індексованих UPDATE/INSERT.
+        Повертає логічний обсяг записаних даних у байтах.
+        """
+        return address_book.data.flush(names)
+
+    def write_all(self, address_book):
+        """
+        Повністю замінює вміст бази контактами книги (однією транзакцією)
+        і перемикає книгу на ліниве читання з цієї бази.
+        Повертає логічний обсяг записаних даних у байтах.
+        """
+        connection = self.connection
+        records = self._records()
+        written = 0
+        with connection:
+            connection.execute("DELETE FROM note_tags")
+            connection.execute("DELETE FROM notes")
+            connection.execute("DELETE FROM tags")
+            connection.execute("DELETE FROM contacts")
+            for name, contact in address_book.data.items():
+                written += _write_contact(connection, name, contact)
+                records._cache[name] = contact
+        address_book.data = records
+        self._data_version = self._read_data_version()
+        return written
@@ -0,0 +1,649 @@
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+import book_format
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокування лише між потоками одного процесу
+    fcntl = None
+
+"""
+Журнальне сховище AddressBook (write-ahead log).
+
+Замість повного перезапису data/addressbook.pkl після кожної зміни мутації
+дописуються невеликими записами у файл-журнал поруч зі знімком
+(data/addressbook.pkl.journal). load_data() відтворює журнал поверх останнього
+знімка, а коли журнал перевищує поріг — у фоновому потоці виконується компакція:
+новий знімок будується з диска (знімок + журнал), після чого журнал обрізається.
+
+Формат запису журналу: 4 байти довжини + 4 байти CRC32 + payload: байт версії
+формату, байт операції та контакт у форматі book_format (для видалення — лише ім'я).
+Недописаний або пошкоджений «хвіст» після аварії відкидається під час читання.
+Журнал починається із заголовка <4sBI (magic PABJ, версія, ідентифікатор знімка —
+CRC32 його заголовка, що сам містить контрольну суму даних). Журнал, який не
+відповідає знімку поруч (чужий файл, скопійований разом із каталогом, або залишок
+після аварії між записом знімка й скиданням журналу), не відтворюється, а
+відкладається як addressbook.pkl.journal.orphaned.
+
+Знімки пишуться атомарно (тимчасовий файл + fsync + os.replace) із заголовком
+(магічне число з версією формату, довжина, CRC32); дані — у компактному
+стовпцевому форматі book_format. Кілька попередніх поколінь зберігаються як
+addressbook.pkl.1, .2, ... і використовуються, якщо новіший знімок пошкоджено.
+
+Знімки й записи журналу попередньої версії (pickle) звичайне завантаження не читає:
+pickle може виконати довільний код, тож такий файл відхиляється (LegacyFormatError),
+а переписати його в новий формат можна лише явно — upgrade_legacy (main.py --upgrade-legacy).
+Файл новішої версії, ніж відома цій програмі, не читається (і не перезаписується).
+Контакти й нотатки створюються через фабрики book_format.Factories,
+які передає app_func.
+
+Кілька процесів можуть працювати з тим самим файлом: запис у журнал, компакція
+й повний запис знімка виконуються під блокуванням FileLock (fcntl.flock на
+addressbook.pkl.lock). Кожне сховище пам'ятає покоління знімка (inode, mtime, розмір)
+і скільки байтів журналу вже прочитано, тож sync() перед записом дочитує лише
+чужі записи журналу; повне перечитування потрібне, тільки якщо знімок замінено.
+"""
+
+JOURNAL_SUFFIX = ".journal"
+ORPHANED_SUFFIX = ".orphaned"
+LOCK_SUFFIX = ".lock"
+COMPACT_THRESHOLD = 1024 * 1024  # розмір журналу (байти), після якого запускається компакція
+
+OP_PUT = "put"
+OP_DELETE = "del"
+
+_RECORD_HEADER = struct.Struct("<II")  # довжина payload, crc32
+_JOURNAL_HEADER = struct.Struct("<4sBI")  # magic, версія, ідентифікатор знімка
+JOURNAL_MAGIC = b"PABJ"
+JOURNAL_VERSION = 1
+_OP_CODES = {OP_PUT: 0, OP_DELETE: 1}
+_OPS = {code: op for op, code in _OP_CODES.items()}
+_PICKLE_PROTO = 0x80  # перший байт pickle (протокол 2+) — записи журналу версії 1
+
+SNAPSHOT_PREFIX = b"PABK"
+SNAPSHOT_MAGIC = SNAPSHOT_PREFIX + bytes((book_format.FORMAT_VERSION,))
+SNAPSHOT_GENERATIONS = 2  # скільки попередніх знімків зберігати (addressbook.pkl.1, .2, ...)
+_SNAPSHOT_HEADER = struct.Struct("<5sQI")  # magic, довжина payload, crc32
+
+
+class UnsupportedVersionError(ValueError):
+    """
+    Файл записано новішою версією програми, формат якої тут невідомий.
+    """
+
+
+class LegacyFormatError(UnsupportedVersionError):
+    """
+    Файл (або запис журналу) у старому форматі pickle: звичайне завантаження його
+    не читає, бо pickle.loads може виконати довільний код.
+    """
+
+    def __init__(self, path: str, reason: str = "у старому форматі pickle, який небезпечно читати з неперевірених файлів"):
+        super().__init__(
+            f"Помилка: {path} збережено {reason}. Якщо це ваш файл, перетворіть його: "
+            f"python main.py --data <файл> --upgrade-legacy"
+        )
+
+
+def _check_version(version: int, path: str):
+    if version > book_format.FORMAT_VERSION:
+        raise UnsupportedVersionError(
+            f"Помилка: {path} записано новішою версією формату ({version}), "
+            f"ніж підтримує програма ({book_format.FORMAT_VERSION}). Оновіть програму."
+        )
+
+
+class FileLock:
+    """
+    Реентерабельне блокування, спільне для потоків і процесів: потоковий RLock
+    плюс fcntl.flock на файлі `path` (без fcntl — лише RLock).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            if self._depth == 0 and fcntl is not None:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._file = open(self.path, "ab")
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            self._lock.release()
+            raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._lock.release()
+
+
+def snapshot_generation(filename: str):
+    """
+    Покоління знімка: (inode, mtime у нс, розмір) або None, якщо файлу немає.
+    Атомарна заміна знімка (write_atomic) завжди змінює покоління.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def snapshot_id(filename: str):
+    """
+    Ідентифікатор знімка для заголовка журналу: CRC32 заголовка знімка
+    (magic, довжина й CRC32 даних) або None, якщо файлу немає.
+    """
+    try:
+        with open(filename, "rb") as file:
+            return zlib.crc32(file.read(_SNAPSHOT_HEADER.size))
+    except OSError:
+        return None
+
+
+def _encode_record(op: str, name: str, contact) -> bytes:
+    if op == OP_PUT:
+        body = book_format.dumps([(name, contact)])
+    else:
+        body = name.encode("utf-8")
+    payload = bytes((book_format.FORMAT_VERSION, _OP_CODES[op])) + body
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _decode_record(payload: bytes, factories: book_format.Factories, allow_pickle: bool = False):
+    if payload[0] == _PICKLE_PROTO:
+        if not allow_pickle:
+            raise LegacyFormatError("журнал")
+        return pickle.loads(payload)
+    _check_version(payload[0], "журнал")
+    op, body = _OPS[payload[1]], payload[2:]
+    if op == OP_PUT:
+        name, contact = next(iter(book_format.iter_loads(body, factories)))
+        return op, name, contact
+    return op, body.decode("utf-8"), None
+
+
+def _decode_records(data: bytes, factories: book_format.Factories, allow_pickle: bool = False):
+    """
+    Розбирає байти журналу. Записи pickle читаються лише з allow_pickle=True.
+    Returns:
+        tuple: (список записів, довжина цілої частини журналу в байтах)
+    Raises:
+        UnsupportedVersionError: Якщо запис має новішу версію формату
+            (LegacyFormatError — якщо це pickle, а allow_pickle=False).
+    """
+    records = []
+    offset = 0
+    while offset + _RECORD_HEADER.size <= len(data):
+        length, crc = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        end = start + length
+        if end > len(data) or zlib.crc32(data[start:end]) != crc:
+            break
+        try:
+            records.append(_decode_record(data[start:end], factories, allow_pickle))
+        except UnsupportedVersionError:
+            raise
+        except Exception:
+            break
+        offset = end
+    return records, offset
+
+
+def apply_records(address_book, records):
+    """
+    Застосовує записи журналу до AddressBook (без позначення змін).
+    Записи ідемпотентні, тож повторне відтворення безпечне.
+    """
+    for op, name, contact in records:
+        if op == OP_PUT:
+            address_book.data[name] = contact
+        else:
+            address_book.data.pop(name, None)
+
+
+def change_records(address_book, names):
+    """
+    Записи журналу з поточним станом контактів `names` (видалені — OP_DELETE).
+    """
+    return [
+        (OP_PUT, name, address_book.data[name]) if name in address_book.data else (OP_DELETE, name, None)
+        for name in names
+    ]
+
+
+def _fsync_dir(path: str):
+    """
+    Синхронізує каталог, щоб перейменування файлу пережило аварійне вимкнення.
+    На системах без O_DIRECTORY (Windows) нічого не робить.
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path or ".", os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def snapshot_generations(filename: str):
+    """
+    Повертає шляхи до поколінь знімка: від найновішого (сам `filename`)
+    до найстарішого (`filename.N`).
+    """
+    return [filename] + [f"{filename}.{i}" for i in range(1, SNAPSHOT_GENERATIONS + 1)]
+
+
+def write_snapshot(address_book, filename: str):
+    """
+    Атомарно записує повний знімок AddressBook:
+    тимчасовий файл → fsync → зсув кільця поколінь → os.replace() → fsync каталогу.
+    Знімок має заголовок з магічним числом (і версією формату), довжиною та CRC32 даних.
+    Returns:
+        int: Розмір записаного знімка в байтах.
+    """
+    payload = book_format.dumps(address_book.data.items())
+    header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(payload), zlib.crc32(payload))
+    return write_atomic(filename, (header, payload))
+
+
+def write_atomic(filename: str, parts) -> int:
+    """
+    Записує байтові частини `parts` у `filename` так, що після аварії на диску
+    лишається або старий, або новий файл цілком; попередні версії зсуваються
+    в кільце поколінь (filename.1, .2, ...).
+    Returns:
+        int: Кількість записаних байтів.
+    """
+    written = 0
+    tmp_name = filename + ".tmp"
+    with open(tmp_name, "wb") as file:
+        for part in parts:
+            written += file.write(part)
+        file.flush()
+        os.fsync(file.fileno())
+
+    generations = snapshot_generations(filename)
+    for older, newer in zip(reversed(generations[1:]), reversed(generations[:-1])):
+        if os.path.exists(newer):
+            os.replace(newer, older)
+    os.replace(tmp_name, filename)
+    _fsync_dir(os.path.dirname(filename))
+    return written
+
+
+def _read_snapshot_file(path: str, factories: book_format.Factories, allow_pickle: bool = False):
+    with open(path, "rb") as file:
+        data = file.read()
+    if data.startswith(SNAPSHOT_PREFIX):
+        magic, length, crc = _SNAPSHOT_HEADER.unpack_from(data)
+        _check_version(magic[-1], path)
+        payload = data[_SNAPSHOT_HEADER.size:]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            raise ValueError(f"Пошкоджений знімок: {path}")
+        if magic[-1] == 1:  # версія 1: pickle з заголовком
+            if not allow_pickle:
+                raise LegacyFormatError(path)
+            return pickle.loads(payload)
+        return book_format.loads(payload, factories)
+    if data[:1] != bytes((_PICKLE_PROTO,)):
+        raise ValueError(f"Не знімок AddressBook: {path}")
+    # Старі файли без заголовка (звичайний pickle) — без перевірки контрольної суми.
+    if not allow_pickle:
+        raise LegacyFormatError(path)
+    return pickle.loads(data)
+
+
+def read_snapshot(filename: str, factories: book_format.Factories, allow_pickle: bool = False):
+    """
+    Читає найновіше неушкоджене покоління знімка.
+    Знімки у форматі pickle читаються лише з allow_pickle=True (upgrade_legacy).
+    Returns:
+        AddressBook або None, якщо жодного покоління ще немає.
+    Raises:
+        ValueError: Якщо всі наявні покоління пошкоджені.
+        UnsupportedVersionError: Якщо знімок записано новішою версією формату —
+            тоді старіші покоління не підставляються, щоб не втратити нові дані.
+        LegacyFormatError: Якщо знімок у форматі pickle, а allow_pickle=False.
+    """
+    found = False
+    for path in snapshot_generations(filename):
+        if not os.path.exists(path):
+            continue
+        found = True
+        try:
+            return _read_snapshot_file(path, factories, allow_pickle)
+        except UnsupportedVersionError:
+            raise
+        except Exception:
+            continue
+    if found:
+        raise ValueError(f"Не вдалося прочитати жодне покоління знімка {filename}.")
+    return None
+
+
+class Journal:
+    """
+    Файл-журнал змін для одного знімка.
+
+    Атрибути:
+        path (str): Шлях до файлу журналу.
+        factories (book_format.Factories): Конструктори книги, контактів і нотаток для читання.
+        fsync (bool): Чи викликати os.fsync() після кожного дописування.
+        lock (FileLock): Блокування журналу й знімка між потоками та процесами.
+        snapshot_path (str): Знімок, зміни якого дописує журнал.
+        identify: Функція шлях → ідентифікатор знімка (snapshot_id або аналог іншого формату).
+    """
+
+    def __init__(self, path: str, factories: book_format.Factories, fsync: bool = True, lock_path: str = None,
+                 snapshot_path: str = None):
+        self.path = path
+        self.factories = factories
+        self.fsync = fsync
+        self.lock = FileLock(lock_path or path + LOCK_SUFFIX)
+        self.snapshot_path = snapshot_path or path[:-len(JOURNAL_SUFFIX)]
+        self.identify = snapshot_id
+        self._compactor = None
+
+    def _header(self) -> bytes:
+        return _JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self.identify(self.snapshot_path) or 0)
+
+    def append(self, records) -> int:
+        """
+        Дописує записи (операція, ім'я, контакт) у кінець журналу; новий журнал
+        починається із заголовка з ідентифікатором поточного знімка.
+        Returns:
+            int: Кількість записаних байтів (разом із заголовком).
+        """
+        if not records:
+            return 0
+        blob = b"".join(_encode_record(*record) for record in records)
+        with self.lock:
+            if self.size() == 0:
+                blob = self._header() + blob
+            with open(self.path, "ab") as file:
+                file.write(blob)
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+        return len(blob)
+
+    def read(self):
+        """
+        Повертає всі цілі записи журналу; пошкоджений хвіст обрізається.
+        """
+        return self.read_from(0)[0]
+
+    def read_from(self, offset: int, legacy: bool = False):
+        """
+        Читає цілі записи, що починаються з байта `offset`. Під блокуванням ніхто
+        не пише, тож недочитаний хвіст — слід аварії, і він обрізається.
+        Журнал іншого знімка відкладається (ORPHANED_SUFFIX), а не відтворюється;
+        журнал без заголовка (старої версії) відхиляється — LegacyFormatError.
+        legacy=True (лише upgrade_legacy) читає журнал старого формату: без заголовка
+        і з записами pickle.
+        Returns:
+            tuple: (список записів, довжина цілої частини журналу в байтах)
+        """
+        with self.lock:
+            if not os.path.exists(self.path):
+                return [], 0
+            with open(self.path, "rb") as file:
+                header = file.read(_JOURNAL_HEADER.size)
+                if len(header) == _JOURNAL_HEADER.size and header.startswith(JOURNAL_MAGIC):
+                    offset = max(offset, _JOURNAL_HEADER.size)
+                elif header and not legacy:
+                    raise LegacyFormatError(self.path, "без заголовка, тож невідомо, до якого знімка він належить")
+                orphaned = not legacy and header != b"" and header != self._header()
+                if not orphaned:
+                    file.seek(offset)
+                    data = file.read()
+            if orphaned:
+                os.replace(self.path, self.path + ORPHANED_SUFFIX)
+                return [], 0
+            records, valid_length = _decode_records(data, self.factories, allow_pickle=legacy)
+            if valid_length < len(data):
+                with open(self.path, "r+b") as file:
+                    file.truncate(offset + valid_length)
+        return records, offset + valid_length
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def reset(self):
+        """
+        Видаляє журнал (після запису повного знімка він більше не потрібен).
+        """
+        with self.lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def compact_async(self, snapshot_path: str, read=None, write=None, on_compacted=None):
+        """
+        Запускає компакцію у фоновому потоці, якщо вона ще не виконується.
+        """
+        with self.lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(
+                target=self.compact, args=(snapshot_path, read, write, on_compacted), name="journal-compactor"
+            )
+            self._compactor.start()
+
+    def compact(self, snapshot_path: str, read=None, write=None, on_compacted=None):
+        """
+        Будує новий знімок з диска (старий знімок + журнал) і обрізає журнал.
+        Не торкається книги в пам'яті, тому безпечна паралельно з REPL; увесь час
+        тримає блокування, щоб інший процес не дописав журнал і не замінив знімок посередині.
+        `read(path, factories)` / `write(book, path)` — функції читання й запису знімка
+        іншого формату (за замовчуванням read_snapshot / write_snapshot).
+        `on_compacted(старе покоління, нове покоління, кількість прибраних байтів журналу)`
+        викликається після успішної компакції (ще під блокуванням).
+        """
+        read = read or read_snapshot
+        write = write or write_snapshot
+        with self.lock:
+            if not os.path.exists(self.path) or not os.path.exists(snapshot_path):
+                return
+            records, compacted_length = self.read_from(0)
+            address_book = read(snapshot_path, self.factories)
+            if address_book is None or not compacted_length:
+                return
+            before = snapshot_generation(snapshot_path)
+            apply_records(address_book, records)
+            write(address_book, snapshot_path)
+
+            with open(self.path, "rb") as file:
+                tail = file.read()[compacted_length:]
+            tmp_name = self.path + ".tmp"
+            with open(tmp_name, "wb") as file:
+                file.write(self._header() + tail if tail else b"")
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+            os.replace(tmp_name, self.path)
+            if on_compacted is not None:
+                on_compacted(before, snapshot_generation(snapshot_path), compacted_length - _JOURNAL_HEADER.size)
+
+    def wait(self):
+        """
+        Чекає завершення фонової компакції (якщо вона є).
+        """
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+
+class SnapshotStorage:
+    """
+    Сховище за замовчуванням: знімок + журнал змін.
+
+    Атрибути:
+        filename (str): Абсолютний шлях до знімка.
+        factories (book_format.Factories): Конструктори книги, контактів і нотаток.
+    """
+
+    def __init__(self, filename: str, factories: book_format.Factories):
+        self.filename = os.path.abspath(filename)
+        self.factories = factories
+        self.journal = get_journal(self.filename, factories)
+        self.journal.identify = self.snapshot_id
+        self._seen = (None, 0)  # (покоління знімка, прочитана довжина журналу), яким відповідає книга
+
+    snapshot_id = staticmethod(snapshot_id)  # ідентифікатор знімка для заголовка журналу
+
+    def locked(self):
+        """
+        Блокування сховища між процесами: зміни з диска, що підтягнуті sync()
+        під ним, не можуть застаріти до наступного запису.
+        """
+        return self.journal.lock
+
+    def _read_book(self, address_book_factory):
+        address_book = read_snapshot(self.filename, self.factories)
+        return address_book if address_book is not None else address_book_factory()
+
+    def _compact_async(self):
+        self.journal.compact_async(self.filename, on_compacted=self._rebase)
+
+    def _rebase(self, before, after, dropped: int):
+        """
+        Після власної компакції книга відповідає новому знімку — повне перечитування не потрібне.
+        """
+        generation, offset = self._seen
+        if generation == before and offset >= dropped:
+            self._seen = (after, offset - dropped)
+
+    def load(self, address_book_factory):
+        """
+        Читає знімок (або створює порожню книгу) і відтворює поверх нього журнал.
+        """
+        self.journal.wait()
+        return self._load(address_book_factory)
+
+    def _load(self, address_book_factory):
+        with self.journal.lock:
+            address_book = self._read_book(address_book_factory)
+            records, offset = self.journal.read_from(0)
+            apply_records(address_book, records)
+            self._seen = (snapshot_generation(self.filename), offset)
+        return address_book
+
+    def sync(self, address_book, keep=()):
+        """
+        Підтягує в книгу зміни, які інші процеси записали після останнього
+        читання чи запису. Контакти з `keep` (змінені тут і ще не збережені)
+        лишаються як є — при записі вони перекриють версію з диска.
+        Якщо нічого не змінилося, це лише два виклики stat().
+        Returns:
+            set: Імена контактів, оновлених з диска, або None, якщо знімок
+            замінено (компакція чи повний запис) і книгу перечитано повністю.
+        """
+        with self.journal.lock:
+            generation, offset = self._seen
+            if snapshot_generation(self.filename) != generation:
+                fresh = self._load(self.factories.address_book)
+                for name in keep:
+                    if name in address_book.data:
+                        fresh.data[name] = address_book.data[name]
+                    else:
+                        fresh.data.pop(name, None)
+                address_book.data = fresh.data
+                return None
+            if self.journal.size() == offset:
+                return set()
+            records, end = self.journal.read_from(offset)
+            self._seen = (generation, end)
+        records = [record for record in records if record[1] not in keep]
+        apply_records(address_book, records)
+        return {name for _, name, _ in records}
+
+    def write_changes(self, address_book, names):
+        """
+        Дописує у журнал стан змінених контактів; великий журнал компактується у фоні.
+        Returns:
+            int: Кількість записаних байтів.
+        """
+        with self.journal.lock:
+            if not os.path.exists(self.filename):
+                return self.write_all(address_book)
+            generation, offset = self._seen
+            before = self.journal.size()
+            written = self.journal.append(change_records(address_book, names))
+            if offset == before:
+                self._seen = (generation, before + written)
+        if self.journal.size() >= COMPACT_THRESHOLD:
+            self._compact_async()
+        return written
+
+    def write_all(self, address_book):
+        """
+        Записує повний знімок і скидає журнал. Повертає розмір знімка в байтах.
+        """
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        with self.journal.lock:
+            written = self._write_snapshot(address_book)
+            self.journal.reset()
+            self._seen = (snapshot_generation(self.filename), 0)
+        return written
+
+    def _write_snapshot(self, address_book):
+        return write_snapshot(address_book, self.filename)
+
+
+def upgrade_legacy(filename: str, factories: book_format.Factories) -> int:
+    """
+    Явно переписує знімок і журнал старого формату (pickle) у поточний формат.
+    pickle може виконати довільний код, тому викликати лише для довірених файлів.
+    Returns:
+        int: Кількість контактів у переписаній книзі.
+    Raises:
+        FileNotFoundError: Якщо знімка немає.
+    """
+    filename = os.path.abspath(filename)
+    journal = get_journal(filename, factories)
+    journal.wait()
+    with journal.lock:
+        address_book = read_snapshot(filename, factories, allow_pickle=True)
+        if address_book is None:
+            raise FileNotFoundError(filename)
+        apply_records(address_book, journal.read_from(0, legacy=True)[0])
+        write_snapshot(address_book, filename)
+        journal.reset()
+    return len(address_book.data)
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(snapshot_path: str, factories: book_format.Factories = None) -> Journal:
+    """
+    Повертає (єдиний на процес) журнал для знімка `snapshot_path`.
+    Фабрики потрібні під час першого звернення (його робить SnapshotStorage).
+    """
+    key = os.path.abspath(snapshot_path)
+    with _journals_lock:
+        if key not in _journals:
+            _journals[key] = Journal(key + JOURNAL_SUFFIX, factories, lock_path=key + LOCK_SUFFIX, snapshot_path=key)
+        elif factories is not None:
+            _journals[key].factories = factories
+        return _journals[key]
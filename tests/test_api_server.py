@@ -0,0 +1,111 @@
+import asyncio
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import api_server
+import app_func
+
+
+class TestApiServer(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.filename = os.path.join(tmp_dir.name, "addressbook.pkl")
+        self.book = app_func.load_data(self.filename)
+        app_func.add_contact("Іван", "0671234567", "12.05.1990", self.book)
+
+        self.server = api_server.ApiServer(self.book, port=0)
+        started = threading.Event()
+        self.thread = threading.Thread(target=asyncio.run, args=(self.server.serve(lambda _: started.set()),))
+        self.thread.start()
+        self.assertTrue(started.wait(5))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join(5)
+
+    def request(self, method, path, body=None):
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.port, timeout=5)
+        try:
+            payload = json.dumps(body).encode("utf-8") if body is not None else None
+            connection.request(method, quote(path, safe="/?=&"), payload)
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    def test_contacts_and_notes_crud(self):
+        status, result = self.request("POST", "/contacts",
+                                      {"name": "Олена", "phone": "0501112233", "birthday": "01.02.1995"})
+        self.assertEqual((status, result["message"]), (200, "Контакт додано."))
+        status, _ = self.request("POST", "/contacts/Олена/notes", {"text": "Купити квіти", "tags": ["Свято"]})
+        self.assertEqual(status, 200)
+        self.request("PUT", "/contacts/Олена/notes/1", {"text": "Купити торт", "tags": ["свято"]})
+        self.request("PATCH", "/contacts/Олена", {"email": "olena@example.com"})
+
+        status, contact = self.request("GET", "/contacts/Олена")
+        self.assertEqual(status, 200)
+        self.assertEqual(contact["email"], "olena@example.com")
+        self.assertEqual(contact["notes"], [{"text": "Купити торт", "tags": ["свято"]}])
+
+        _, found = self.request("GET", "/notes/search?q=торт")
+        self.assertEqual((found["total"], found["notes"][0]["contact"]), (1, "Олена"))
+        _, found = self.request("GET", "/find?q=olena")
+        self.assertEqual([c["name"] for c in found["contacts"]], ["Олена"])
+
+        self.request("DELETE", "/contacts/Олена/notes/1")
+        self.request("DELETE", "/contacts/Олена")
+        _, listed = self.request("GET", "/contacts")
+        self.assertEqual((listed["total"], [c["name"] for c in listed["contacts"]]), (1, ["Іван"]))
+
+    def test_errors_are_reported_with_status(self):
+        status, result = self.request("GET", "/contacts/Іванн")
+        self.assertEqual((status, result["suggestions"]), (404, ["Іван"]))
+        status, result = self.request("POST", "/contacts", {"name": "Петро", "phone": "123", "birthday": "01.01.1990"})
+        self.assertEqual(status, 400)
+        self.assertTrue(result["error"].startswith("❌"))
+        self.assertEqual(self.request("GET", "/birthdays?days=0")[0], 400)
+        self.assertEqual(self.request("PUT", "/contacts")[0], 405)
+        self.assertEqual(self.request("GET", "/nothing")[0], 404)
+
+    def test_concurrent_writes_are_all_applied_and_saved(self):
+        def add(i):
+            return self.request("POST", "/contacts/Іван/notes", {"text": f"Нотатка {i}"})[0]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(add, range(40)))
+            reads = list(pool.map(lambda _: self.request("GET", "/contacts/Іван")[0], range(20)))
+        self.assertEqual(set(statuses) | set(reads), {200})
+
+        self.server.shutdown()
+        self.thread.join(5)
+        saved = app_func.load_data(self.filename).get_contact("Іван").notes
+        self.assertEqual(sorted(note.text for note in saved), sorted(f"Нотатка {i}" for i in range(40)))
+
+    def test_other_sessions_are_synced_only_by_the_writer(self):
+        other = app_func.load_data(self.filename)
+        app_func.add_contact("Олег", "0501112233", "01.01.1990", other)
+
+        # Збереження під час роботи сервера (як у потоці автозбереження) книгу не змінює.
+        app_func.save_data(self.book, force=True)
+        self.assertEqual(self.request("GET", "/contacts")[1]["total"], 1)
+
+        self.request("POST", "/contacts", {"name": "Петро", "phone": "0509876543", "birthday": "01.02.1995"})
+        _, listed = self.request("GET", "/contacts")
+        self.assertEqual([c["name"] for c in listed["contacts"]], ["Іван", "Олег", "Петро"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import storage
+
+
+class TestAutoSave(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.filename = os.path.join(tmp_dir.name, "addressbook.pkl")
+        self.book = app_func.load_data(self.filename)
+        app_func.add_contact("Іван", "0671234567", "12.05.1990", self.book)
+
+    def _notes(self):
+        return [note.text for note in app_func.load_data(self.filename).get_contact("Іван").notes]
+
+    def test_burst_of_edits_is_written_once_after_debounce(self):
+        writes = patch.object(storage.SnapshotStorage, "write_changes", autospec=True,
+                              side_effect=storage.SnapshotStorage.write_changes)
+        with writes as mock_write:
+            saver = app_func.enable_autosave(self.book, debounce=0.2)
+            with saver.lock:
+                for i in range(5):
+                    app_func.add_note(["Іван", f"Нотатка{i}"], self.book)
+                app_func.add_contact("Іван", "0500000000", None, self.book)
+
+            self.assertEqual(mock_write.call_count, 0)
+            deadline = time.monotonic() + 5
+            while not mock_write.call_count and time.monotonic() < deadline:
+                time.sleep(0.02)
+            time.sleep(0.3)
+            app_func.disable_autosave(self.book)
+
+        self.assertEqual(mock_write.call_count, 1)
+        self.assertEqual(self._notes(), [f"Нотатка{i}" for i in range(5)])
+        self.assertEqual(app_func.load_data(self.filename).get_contact("Іван").phone, "0500000000")
+
+    def test_disable_flushes_but_keeps_open_transaction_unsaved(self):
+        app_func.enable_autosave(self.book, debounce=60)
+        app_func.add_note(["Іван", "Збережена"], self.book)
+        app_func.begin_transaction([], self.book)
+        app_func.add_note(["Іван", "Незавершена"], self.book)
+
+        app_func.disable_autosave(self.book)
+
+        self.assertEqual(self._notes(), [])
+        app_func.commit_transaction([], self.book)
+        self.assertEqual(self._notes(), ["Збережена", "Незавершена"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import unittest
+import zlib
+from datetime import date
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import book_format
+import storage
+
+
+def _state(book):
+    return [(name, contact.name, contact.phone, contact.email, contact.address, contact.birthday,
+             [(note.text, note.tags) for note in contact.notes]) for name, contact in book.data.items()]
+
+
+def _sample_book() -> app_func.AddressBook:
+    book = app_func.AddressBook()
+    full = app_func.Contact("Іван")
+    full.add_phone("0671234567")
+    full.set_email("ivan@example.com")
+    full.set_address("вул. Шевченка, 1")
+    full.birthday = date(1990, 5, 12)
+    full.notes = [app_func.Note("Купити квіти", ["свято", "сім'я"]), app_func.Note("Без тегів"),
+                  app_func.Note("Ще", ["свято", "сім'я"])]
+    book.add_contact(full)
+    book.add_contact(app_func.Contact("Порожній"))
+    odd = app_func.Contact("Нуль\0в імені")
+    odd.notes = [app_func.Note("текст\0з нулем", ["тег\0"])]
+    book.add_contact(odd)
+    return book
+
+
+class TestBookFormat(unittest.TestCase):
+    def test_round_trip_keeps_fields_order_and_interns_tags(self):
+        book = _sample_book()
+
+        loaded = book_format.loads(book_format.dumps(book.data.items()), app_func.BOOK_FACTORIES)
+
+        self.assertEqual(_state(loaded), _state(book))
+        first, third = loaded.data["Іван"].notes[0], loaded.data["Іван"].notes[2]
+        self.assertIs(first.tags, third.tags)
+        self.assertIsNone(loaded.data["Порожній"].phone)
+
+    def test_truncated_or_corrupted_payload_is_rejected(self):
+        data = book_format.dumps(_sample_book().data.items())
+        for broken in (data[:-1], data[:5], data[:-4] + b"\xff\xff\xff\xff"):
+            with self.assertRaises(ValueError):
+                book_format.loads(broken, app_func.BOOK_FACTORIES)
+
+
+class TestSnapshotVersions(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.filename = os.path.join(tmp_dir.name, "addressbook.pkl")
+
+    def test_version_1_snapshot_and_journal_are_refused_until_upgraded(self):
+        book = _sample_book()
+        payload = pickle.dumps(book, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self.filename, "wb") as file:
+            file.write(struct.pack("<5sQI", b"PABK\x01", len(payload), zlib.crc32(payload)))
+            file.write(payload)
+        record = pickle.dumps((storage.OP_DELETE, "Порожній", None), protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self.filename + storage.JOURNAL_SUFFIX, "wb") as file:
+            file.write(struct.pack("<II", len(record), zlib.crc32(record)) + record)
+
+        with self.assertRaises(storage.LegacyFormatError):
+            app_func.load_data(self.filename)
+        app_func.upgrade_legacy_data(self.filename)
+        loaded = app_func.load_data(self.filename)
+        app_func.add_note(["Іван", "Нова"], loaded)
+        app_func.save_data(loaded)
+        storage.get_journal(self.filename).compact(self.filename)
+
+        with open(self.filename, "rb") as file:
+            self.assertEqual(file.read(5), storage.SNAPSHOT_MAGIC)
+        reloaded = app_func.load_data(self.filename)
+        self.assertEqual(list(reloaded.data), ["Іван", "Нуль\0в імені"])
+        self.assertEqual(reloaded.data["Іван"].notes[-1].text, "Нова")
+
+    def test_newer_version_is_refused_without_falling_back(self):
+        storage.write_snapshot(_sample_book(), self.filename)
+        storage.write_snapshot(_sample_book(), self.filename)
+        with open(self.filename, "r+b") as file:
+            file.seek(4)
+            file.write(bytes((book_format.FORMAT_VERSION + 1,)))
+
+        with self.assertRaises(storage.UnsupportedVersionError):
+            app_func.load_data(self.filename)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import bulk_io
+
+
+class TestBulkImportExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_csv_import_collects_row_errors(self):
+        path = self._path("contacts.csv")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("name,phone,email,address,birthday\n"
+                       "Іван,0671234567,ivan@example.com,Київ,12.05.1990\n"
+                       "Петро,123,,,\n"
+                       "Марія,0931112233,bad-email,,\n"
+                       ",0931112233,,,\n"
+                       "Олег,0501112233,,,\n")
+        book = app_func.AddressBook()
+
+        with patch("app_func.save_data") as mock_save:
+            result = bulk_io.import_contacts([path], book)
+
+        self.assertTrue(result.startswith("Імпортовано контактів: 2, рядків з помилками: 3."))
+        self.assertIn("рядок 3: Телефон повинен містити рівно 10 цифр.", result)
+        self.assertIn("рядок 4: Невірний формат email.", result)
+        self.assertEqual(list(book.data), ["Іван", "Олег"])
+        self.assertEqual(book.get_contact("Іван").birthday.isoformat(), "1990-05-12")
+        mock_save.assert_called_once_with(book)
+
+    def test_jsonl_round_trip_keeps_notes(self):
+        book = app_func.AddressBook()
+        contact = app_func.Contact("Іван")
+        contact.add_phone("0671234567")
+        contact.add_birthday("12.05.1990")
+        book.add_contact(contact)
+        app_func.add_note(["Іван", "Купити", "квіти", "tags:свято"], book)
+        path = self._path("contacts.jsonl")
+
+        self.assertEqual(bulk_io.export_contacts([path], book), f"Експортовано контактів у '{path}': 1.")
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("{not json\n")
+        imported = app_func.AddressBook()
+        with patch("app_func.save_data"):
+            result = bulk_io.import_contacts([path], imported)
+
+        self.assertIn("рядок 2: некоректний JSON", result)
+        note = imported.get_contact("Іван").notes[0]
+        self.assertEqual((note.text, note.tags), ("Купити квіти", ("свято",)))
+
+    def test_parallel_import_matches_sequential(self):
+        path = self._path("contacts.csv")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("name,phone,birthday\n")
+            for i in range(50):
+                phone = f"{i:010d}" if i % 7 else "bad"
+                file.write(f"Контакт{i % 40},{phone},01.0{1 + i % 9}.1990\n")
+        sequential, parallel = app_func.AddressBook(), app_func.AddressBook()
+
+        with patch("app_func.save_data"), patch("bulk_io.IMPORT_CHUNK_SIZE", 8):
+            expected = bulk_io.import_contacts([path], sequential)
+            result = bulk_io.import_contacts([path, "--workers", "2"], parallel)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(list(parallel.data), list(sequential.data))
+        self.assertEqual([c.phone for c in parallel.data.values()],
+                         [c.phone for c in sequential.data.values()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import command_suggestion
+from command_suggestion import COMMAND_CONTEXT, KeywordMatcher, complete_command, suggest_commands
+
+
+class TestCommandSuggestion(unittest.TestCase):
+    def test_keyword_matcher_matches_substring_scan(self):
+        keywords = {"he": "a", "she": "b", "his": "c", "hers": "d", "note": "e", "notes": "e"}
+        matcher = KeywordMatcher(keywords)
+        rng = random.Random(7)
+        for _ in range(500):
+            text = "".join(rng.choice("hersinot ") for _ in range(rng.randint(0, 12)))
+            expected = {label for keyword, label in keywords.items() if keyword in text}
+            self.assertEqual(matcher.labels(text), expected, text)
+
+    def test_suggestions_use_synonyms_typos_prefixes_and_context(self):
+        # "redo" — схожа назва (difflib ratio рівно 0.6), а не синонім.
+        self.assertEqual(suggest_commands("remove", []), ["delete", "delete-note", "redo"])
+        self.assertEqual(suggest_commands("contatcs", [])[0], "contacts")
+        self.assertIn("notes-by-tag", suggest_commands("notes", []))
+        suggestions = suggest_commands("xyz", ["my", "Birthdays"])
+        self.assertEqual(suggestions, COMMAND_CONTEXT["birthdays"]["commands"])
+
+    def test_prefix_completion_and_cache(self):
+        self.assertEqual(complete_command("de"), ["delete", "delete-note"])
+        self.assertEqual(complete_command("EX"), ["export"])
+        self.assertEqual(complete_command("zz"), [])
+        self.assertEqual(complete_command("rem"), ["delete", "delete-note"])
+        self.assertEqual(complete_command("tim"), ["stats"])
+        self.assertIn("add", complete_command(""))
+
+        command_suggestion._command_candidates.cache_clear()
+        suggest_commands("delet", [])
+        suggest_commands("delet", ["note"])
+        self.assertEqual(command_suggestion._command_candidates.cache_info().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import storage
+
+
+def _run(book, function, *args):
+    with book.undoable():
+        return function(*args)
+
+
+def _state(book):
+    return [(c.name, c.phone, c.email, [(n.text, n.tags) for n in c.notes]) for c in book.data.values()]
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.filename = os.path.join(tmp_dir.name, "addressbook.pkl")
+        self.book = app_func.load_data(self.filename)
+        _run(self.book, app_func.add_contact, "Іван", "0671234567", "12.05.1990", self.book)
+        _run(self.book, app_func.add_note, ["Іван", "Купити", "квіти", "tags:свято"], self.book)
+
+    def test_undo_and_redo_each_command(self):
+        book = self.book
+        before = _state(book)
+        _run(book, app_func.edit_contact, "Іван", "Іванна", "-", "ivanna@example.com", book)
+        _run(book, app_func.edit_note, ["Іванна", "1", "Подарунок"], book)
+        after = _state(book)
+
+        self.assertIn("Скасовано", app_func.undo([], book))
+        app_func.undo([], book)
+        self.assertEqual(_state(book), before)
+        self.assertEqual(app_func.search_notes(["#свято"], book).splitlines()[0],
+                         "Знайдено нотаток з тегом 'свято': 1")
+
+        app_func.redo([], book)
+        app_func.redo([], book)
+        self.assertEqual(_state(book), after)
+        app_func.save_data(book)
+        self.assertEqual(_state(app_func.load_data(self.filename)), after)
+        self.assertEqual(app_func.redo([], book), "Немає змін для повторення.")
+
+    def test_rejected_or_unchanged_phone_does_not_add_undo_step(self):
+        book = self.book
+        self.assertIn("10 цифр", _run(book, app_func.add_contact, "Іван", "123", None, book))
+        _run(book, app_func.add_contact, "Іван", "0671234567", None, book)
+
+        app_func.undo([], book)
+        self.assertEqual(book.get_contact("Іван").notes, [])
+
+    def test_transaction_saves_once_and_rolls_back(self):
+        book = self.book
+        before = _state(book)
+        app_func.save_data(book)
+
+        writes = patch.object(storage.SnapshotStorage, "write_changes", autospec=True,
+                              side_effect=storage.SnapshotStorage.write_changes)
+        with writes as mock_write:
+            self._transactions(book, before)
+
+        # Команди всередині транзакцій не зберігалися окремо: лише rollback, commit і undo.
+        self.assertEqual(mock_write.call_count, 3)
+        self.assertEqual(_state(app_func.load_data(self.filename)), before)
+
+    def _transactions(self, book, before):
+        _run(book, app_func.begin_transaction, [], book)
+        _run(book, app_func.delete_contact, "Іван", book)
+        _run(book, app_func.add_contact, "Олег", "0501112233", "01.01.1990", book)
+        self.assertTrue(app_func.undo([], book).startswith("Помилка"))
+        _run(book, app_func.rollback_transaction, [], book)
+
+        self.assertEqual(_state(book), before)
+        self.assertFalse(book.in_transaction)
+
+        app_func.begin_transaction([], book)
+        _run(book, app_func.delete_contact, "Іван", book)
+        _run(book, app_func.add_contact, "Олег", "0501112233", "01.01.1990", book)
+        self.assertIn("змінено контактів: 2", app_func.commit_transaction([], book))
+        self.assertEqual(list(book.data), ["Олег"])
+
+        app_func.undo([], book)
+        self.assertEqual(_state(book), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,302 @@
+import sys
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from unittest.mock import patch
+
+import app_func
+
+
+def _make_book() -> app_func.AddressBook:
+    book = app_func.AddressBook()
+    for name, phone, email in [
+        ("Іван", "0671234567", "ivan@example.com"),
+        ("Петро", "0509876543", "petro@mail.ua"),
+        ("Марія", "0931112233", None),
+        ("Ivanka", "0671110000", "ivanka@example.com"),
+    ]:
+        contact = app_func.Contact(name)
+        contact.add_phone(phone)
+        if email:
+            contact.set_email(email)
+        book.add_contact(contact)
+    app_func.add_note(["Марія", "Купити", "квіти", "tags:", "Свято"], book)
+    app_func.add_note(["Петро", "Зустріч", "о", "10:00"], book)
+    return book
+
+
+def _brute_force_find(book, query):
+    return [
+        record.name for record in book.data.values()
+        if query in record.name.lower()
+        or query in str(record.phone or "").lower()
+        or query in str(record.email or "").lower()
+        or query in str(record.address or "").lower()
+        or any(query in note.text.lower() or any(query in t.lower() for t in note.tags)
+               for note in record.notes)
+    ]
+
+
+class TestTrigramIndex(unittest.TestCase):
+    QUERIES = ["іва", "iva", "067", "example.com", "квіти", "свят", "10:00", "ma", "zzz", "ivanka@"]
+
+    def _assert_matches_brute_force(self, book):
+        for query in self.QUERIES:
+            names = [record.name for record in book.search_candidates(query)
+                     if record.name in _brute_force_find(book, query)]
+            self.assertEqual(names, _brute_force_find(book, query), query)
+
+    def test_candidates_match_linear_scan(self):
+        self._assert_matches_brute_force(_make_book())
+
+    def test_index_follows_edits_and_deletes(self):
+        book = _make_book()
+        book.index("trigram")  # індекс уже побудований — далі лише інкрементальні оновлення
+
+        with patch("app_func.save_data"):
+            app_func.edit_contact("Іван", "Іванна", "-", "ivanna@example.com", book)
+            app_func.delete_contact("Ivanka", book)
+        app_func.edit_note(["Марія", "1", "Подарунок", "tags:", "свято,дім"], book)
+        app_func.delete_note(["Петро", "1"], book)
+
+        self._assert_matches_brute_force(book)
+        result = app_func.Contactss(["ivanna"], book)
+        self.assertIn("Name: Іванна", result)
+        self.assertIn("Нічого не знайдено", app_func.Contactss(["10:00"], book))
+
+
+class TestFieldIndexes(unittest.TestCase):
+    def test_exact_lookups(self):
+        book = _make_book()
+
+        self.assertEqual([c.name for c in book.find_by_phone("0671234567")], ["Іван"])
+        self.assertEqual([c.name for c in book.find_by_email("IVAN@example.com")], ["Іван"])
+        self.assertEqual([c.name for c in book.find_by_name("марія")], ["Марія"])
+        self.assertEqual(book.find_by_phone("0000000000"), [])
+
+    def test_lookups_follow_rename_and_delete(self):
+        book = _make_book()
+        book.find_by_phone("0671234567")
+
+        with patch("app_func.save_data"):
+            app_func.edit_contact("Іван", "Іванна", "0991234567", book)
+            app_func.delete_contact("Петро", book)
+            app_func.add_contact("Олег", "0991234567", "01.01.1990", book)
+
+        self.assertEqual(book.find_by_phone("0671234567"), [])
+        self.assertEqual([c.name for c in book.find_by_phone("0991234567")], ["Іванна", "Олег"])
+        self.assertEqual([c.name for c in book.find_by_email("ivan@example.com")], ["Іванна"])
+        self.assertEqual(book.find_by_name("іван"), [])
+        self.assertEqual(book.find_by_email("petro@mail.ua"), [])
+
+
+def _brute_force_tag_groups(book):
+    groups = {}
+    for name, record in book.data.items():
+        for note in record.notes:
+            for tag in {tag.lower() for tag in note.tags} or {"#Без тегу"}:
+                groups.setdefault(tag, []).append((name, note.text))
+    return groups
+
+
+class TestTagIndex(unittest.TestCase):
+    def _assert_matches_brute_force(self, book):
+        tags = book.index("tags")
+        expected = _brute_force_tag_groups(book)
+        self.assertEqual(tags.tags(), sorted(expected))
+        for tag in expected:
+            self.assertEqual([(name, note.text) for name, note in tags.notes(tag)], expected[tag], tag)
+
+    def test_index_follows_note_and_contact_changes(self):
+        book = _make_book()
+        app_func.add_note(["Іван", "Привітати", "tags:свято,Сім'я"], book)
+        self._assert_matches_brute_force(book)
+
+        with patch("app_func.save_data"):
+            app_func.edit_contact("Марія", "Марина", book)
+            app_func.delete_contact("Іван", book)
+        app_func.add_note(["Ivanka", "Квитки", "tags:свято"], book)
+        app_func.edit_note(["Петро", "1", "Зустріч", "tags:робота"], book)
+        app_func.delete_note(["Марина", "1"], book)
+
+        self._assert_matches_brute_force(book)
+        self.assertIn("--- Тег: РОБОТА ---\n  - [Петро] Зустріч", app_func.sort_notes_by_tag([], book))
+
+    def test_full_build_sorts_tags_once(self):
+        book = _make_book()
+        app_func.add_note(["Іван", "Привітати", "tags:свято,Сім'я"], book)
+
+        with patch("indexes.insort") as insort:
+            self._assert_matches_brute_force(book)
+        insort.assert_not_called()
+
+    def test_exact_tag_search(self):
+        book = _make_book()
+        app_func.add_note(["Іван", "Святковий", "стіл", "tags:вечеря"], book)
+
+        result = app_func.search_notes(["#СВЯТО"], book)
+
+        self.assertIn("Знайдено нотаток з тегом 'свято': 1", result)
+        self.assertIn("Контакт: Марія", result)
+        self.assertIn("не знайдено", app_func.search_notes(["#свят"], book))
+
+
+class TestTextIndex(unittest.TestCase):
+    def _book(self):
+        book = _make_book()
+        app_func.add_note(["Іван", "Купити", "хліб", "і", "молоко"], book)
+        app_func.add_note(["Іван", "КИЇВ:", "купити", "квитки,", "купити", "подарунок"], book)
+        app_func.add_note(["Ivanka", "Buy", "milk", "tags:shopping"], book)
+        return book
+
+    def _found(self, result):
+        return [line.split(": ", 1)[1] for line in result.splitlines() if line.startswith("Нотатка:")]
+
+    def test_and_or_queries_with_ranking(self):
+        book = self._book()
+
+        self.assertEqual(self._found(app_func.search_notes(["купити"], book)),
+                         ["КИЇВ: купити квитки, купити подарунок", "Купити квіти [Свято]", "Купити хліб і молоко"])
+        self.assertEqual(self._found(app_func.search_notes(["купити", "молоко"], book)), ["Купити хліб і молоко"])
+        self.assertEqual(len(self._found(app_func.search_notes(["київ", "OR", "MILK"], book))), 2)
+        self.assertEqual(self._found(app_func.search_notes(["свят"], book)), ["Купити квіти [Свято]"])
+        self.assertIn("не знайдено", app_func.search_notes(["купити", "milk"], book))
+
+    def test_full_build_sorts_terms_once(self):
+        book = self._book()
+
+        with patch("indexes.insort") as insort:
+            self.assertEqual(len(self._found(app_func.search_notes(["куп"], book))), 3)
+        insort.assert_not_called()
+        self.assertEqual(list(book.index("text")._expand("кв")), ["квитки", "квіти"])
+
+    def test_limit_and_incremental_updates(self):
+        book = self._book()
+
+        result = app_func.search_notes(["купити", "--limit", "1"], book)
+        self.assertIn("Знайдено нотаток за запитом 'купити': 3 (показано 1 найрелевантніших)", result)
+        self.assertEqual(len(self._found(result)), 1)
+        self.assertTrue(app_func.search_notes(["х", "--limit", "0"], book).startswith("Помилка"))
+
+        app_func.delete_note(["Іван", "1"], book)
+        app_func.edit_note(["Марія", "1", "Замовити", "торт"], book)
+        with patch("app_func.save_data"):
+            app_func.edit_contact("Іван", "Іванна", book)
+
+        result = app_func.search_notes(["купити", "OR", "торт"], book)
+        self.assertIn(": 2", result.splitlines()[0])
+        self.assertIn("Контакт: Іванна\nНотатка: КИЇВ: купити квитки, купити подарунок", result)
+
+
+class TestFuzzyNameIndex(unittest.TestCase):
+    def test_lookup_matches_brute_force(self):
+        import indexes
+
+        names = ["Олександр", "Олександра", "Олексій", "Oleksandr", "Іван", "Іванна", "Ivan", "Марія", "Мар'яна"]
+        index = indexes.FuzzyNameIndex()
+        for name in names:
+            index.update(name, app_func.Contact(name))
+
+        for name in names[4:6]:
+            index.update(name, None)
+        del names[4:6]
+        index.update("Іван", app_func.Contact("Іван"))
+        names.append("Іван")
+
+        for query in ["олександер", "Олексадр", "Олекасндр", "іавн", "Iavn", "Марiя", "Мар'яана", "Петро", "ivan", "Іванн"]:
+            expected = sorted((indexes.edit_distance(query.casefold(), name.casefold(), 1), position, name)
+                              for position, name in enumerate(names))
+            expected = [name for distance, _, name in expected if distance <= 1][:3]
+            self.assertEqual(index.lookup(query), expected, query)
+
+    def test_not_found_messages_suggest_names(self):
+        book = _make_book()
+
+        with patch("app_func.save_data"):
+            self.assertEqual(app_func.delete_contact("Петор", book),
+                             "Помилка: Контакт не знайдено.\n💡 Можливо, ви мали на увазі: Петро")
+            app_func.edit_contact("Іван", "Іванна", book)
+        self.assertIn("мали на увазі: Марія", app_func.add_note(["марiя", "Текст"], book))
+        self.assertIn("мали на увазі: Іванна", app_func.edit_note(["Іванна1", "1", "Текст"], book))
+        self.assertNotIn("💡", app_func.delete_note(["Зовсім", "1"], book))
+
+
+class TestPrefixCompletion(unittest.TestCase):
+    def test_names_and_tags_follow_changes(self):
+        book = _make_book()
+        app_func.add_note(["Іван", "Подзвонити", "tags:Сім'я,свята"], book)
+
+        self.assertEqual(book.complete_names("ІВ"), ["Іван"])
+        self.assertEqual(book.complete_names("i"), ["Ivanka"])
+        self.assertEqual(book.complete_tags("св"), ["свята", "свято"])
+        self.assertEqual(book.complete_tags("", limit=1), ["свята"])
+
+        with patch("app_func.save_data"):
+            app_func.edit_contact("Іван", "Іванна", book)
+            app_func.add_contact("Іва", "0501112233", "01.01.1990", book)
+        app_func.delete_note(["Марія", "1"], book)
+
+        self.assertEqual(book.complete_names("іва"), ["Іва", "Іванна"])
+        self.assertEqual(book.complete_names("іва", limit=1), ["Іва"])
+        self.assertEqual(book.complete_tags("св"), ["свята"])
+
+    def test_full_build_sorts_names_once(self):
+        book = _make_book()
+
+        with patch("indexes.insort") as insort:
+            names = book.complete_names("")
+        insort.assert_not_called()
+        self.assertEqual(names, sorted(book.data, key=str.casefold))
+
+
+def _brute_force_birthdays(book, days):
+    today = datetime.today().date()
+    end_date = today + timedelta(days=days)
+    result = []
+    for contact in book.data.values():
+        bday = contact.birthday.replace(year=today.year)
+        if bday < today:
+            bday = bday.replace(year=today.year + 1)
+        if bday.weekday() == 5:
+            bday += timedelta(days=2)
+        elif bday.weekday() == 6:
+            bday += timedelta(days=1)
+        if today <= bday <= end_date:
+            result.append((contact.name, bday.strftime("%Y.%m.%d")))
+    return sorted(result)
+
+
+class TestBirthdayIndex(unittest.TestCase):
+    def test_matches_linear_scan(self):
+        book = app_func.AddressBook()
+        today = datetime.today().date()
+        for offset in range(-10, 400, 3):
+            day = today + timedelta(days=offset)
+            if (day.month, day.day) == (2, 29):
+                continue
+            contact = app_func.Contact(f"Контакт {offset}")
+            contact.add_birthday(day.replace(year=1990).strftime("%d.%m.%Y"))
+            book.add_contact(contact)
+
+        for days in (1, 7, 30, 200, 365, 400):
+            indexed = sorted((item["name"], item["congratulation_date"])
+                             for item in book.get_upcoming_birthdays(days))
+            self.assertEqual(indexed, _brute_force_birthdays(book, days), days)
+
+    def test_leap_day_birthday_is_reported_once(self):
+        book = app_func.AddressBook()
+        contact = app_func.Contact("Високосний")
+        contact.birthday = date(2000, 2, 29)
+        book.add_contact(contact)
+
+        upcoming = book.get_upcoming_birthdays(366)
+
+        self.assertEqual([item["name"] for item in upcoming], ["Високосний"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+try:
+    import colorama  # noqa: F401
+except ImportError:
+    # colorama потрібен лише для кольорів: без нього CLI перевіряється з порожніми кодами.
+    class _NoColor:
+        def __getattr__(self, name):
+            return ""
+
+    colorama = types.ModuleType("colorama")
+    colorama.init = lambda **kwargs: None
+    colorama.Fore = colorama.Style = _NoColor()
+    sys.modules["colorama"] = colorama
+
+import app_func
+import main
+import metrics
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.filename = os.path.join(tmp_dir.name, "addressbook.pkl")
+        self.book = app_func.load_data(self.filename)
+
+    def run_quietly(self, function, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = function(*args)
+        return result, output.getvalue()
+
+    def test_run_command_dispatches_through_the_registry(self):
+        ok, output = self.run_quietly(main.run_command, "add", ["Іван", "0671234567", "12.05.1990"], self.book)
+        self.assertTrue(ok)
+        self.assertIn("Контакт додано.", output)
+
+        ok, output = self.run_quietly(main.run_command, "add", ["Петро", "123", "12.05.1990"], self.book)
+        self.assertFalse(ok)
+
+        ok, output = self.run_quietly(main.run_command, "remove", ["Іван"], self.book)
+        self.assertFalse(ok)
+        self.assertIn("Невідома команда: remove", output)
+        self.assertIn(main.COMMAND_PATTERNS["delete"], output)
+
+        _, output = self.run_quietly(main.run_command, "contacts", ["--page", "1"], self.book)
+        self.assertIn("Name: Іван", output)
+
+    def test_batch_runs_commands_and_saves_once_at_the_end(self):
+        script = [
+            "# коментар",
+            "add Іван 0671234567 12.05.1990",
+            "",
+            "add-note Іван Купити квіти tags:свято",
+            "edit-note Нікого 1 текст",
+            "exit",
+            "add Петро 0509876543 01.01.1990",
+        ]
+        failed, output = self.run_quietly(main.run_batch, script, self.book)
+
+        self.assertEqual(failed, 1)
+        self.assertIn("[4] >>> add-note", output)
+        saved = app_func.load_data(self.filename)
+        self.assertEqual(list(saved.data), ["Іван"])
+        self.assertEqual(saved.get_contact("Іван").notes[0].tags, ("свято",))
+
+    def test_completion_of_commands_names_and_tags(self):
+        app_func.add_contact("Іван", "0671234567", "12.05.1990", self.book)
+        app_func.add_note(["Іван", "Купити", "tags:свято"], self.book)
+
+        self.assertEqual(main.completion_candidates("", "de", self.book), ["delete", "delete-note"])
+        self.assertIn("exit", main.completion_candidates("", "ex", self.book))
+        self.assertEqual(main.completion_candidates("edit ", "І", self.book), ["Іван"])
+        self.assertEqual(main.completion_candidates("search-notes ", "#св", self.book), ["#свято"])
+        self.assertEqual(main.completion_candidates("add-note Іван текст ", "tags:св", self.book),
+                         ["tags:свято"])
+        self.assertEqual(main.completion_candidates("nothing ", "І", self.book), [])
+
+    def test_stats_and_profile(self):
+        metrics.METRICS.reset()
+        self.run_quietly(main.run_command, "add", ["Іван", "0671234567", "12.05.1990"], self.book)
+
+        report = main.show_stats([], self.book)
+        self.assertIn("add", report)
+        self.assertTrue(main.show_stats(["--bogus"], self.book).startswith("Помилка"))
+
+        _, output = self.run_quietly(main.profile_command, "birthdays 30", self.book)
+        self.assertIn("'birthdays 30' виконано за", output)
+        self.assertIn("tottime", output)
+
+    def test_interactive_paging_renders_lazily_and_prompts_without_the_lock(self):
+        names = [f"Контакт{i}" for i in range(7)]
+        for name in names:
+            app_func.add_contact(name, "0671234567", "12.05.1990", self.book)
+        lock = threading.RLock()
+        formatted = []
+        format_contact = app_func.format_contact
+        prompts = []
+
+        def counting_format(record):
+            formatted.append(record.name)
+            return format_contact(record)
+
+        def answer(prompt):
+            # Поки користувач читає сторінку, замок вільний і книгу можна змінити.
+            acquired = []
+            thread = threading.Thread(target=lambda: acquired.append(lock.acquire(timeout=1)) or lock.release())
+            thread.start()
+            thread.join()
+            prompts.append((list(formatted), acquired))
+            app_func.delete_contact("Контакт4", self.book)
+            return "q" if len(prompts) == 2 else ""
+
+        with patch.object(sys.stdin, "isatty", return_value=True), \
+                patch("builtins.input", answer), patch("app_func.format_contact", counting_format):
+            _, output = self.run_quietly(main.run_command, "contacts", ["--per-page", "2"], self.book, lock)
+
+        self.assertEqual(prompts[0], (names[:3], [True]))
+        self.assertEqual(prompts[1], (names[:4] + names[5:6], [True]))
+        self.assertIn("Name: Контакт3", output)
+        self.assertNotIn("Name: Контакт4", output)
+        self.assertNotIn("Name: Контакт5", output)
+
+    def test_interactive_find_reports_no_matches(self):
+        app_func.add_contact("Іван", "0671234567", "12.05.1990", self.book)
+        with patch.object(sys.stdin, "isatty", return_value=True):
+            _, output = self.run_quietly(main.run_command, "find", ["нікого"], self.book)
+        self.assertIn("Нічого не знайдено за запитом: 'нікого'.", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import indexes
+import mapped_storage
+import storage
+
+
+class TestMappedStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "addressbook.pabm")
+        self.soon = date.today() + timedelta(days=2)
+
+    def tearDown(self):
+        storage.get_journal(self.filename).wait()
+        self.tmp_dir.cleanup()
+
+    def _populate(self):
+        """
+        Будує книгу в .pkl і записує її одним знімком .pabm (без журналу).
+        """
+        pickle_filename = os.path.join(self.tmp_dir.name, "populate.pkl")
+        book = app_func.load_data(pickle_filename)
+        birthday = self.soon.replace(year=1990).strftime("%d.%m.%Y")
+        for name, phone in [("Іван", "0671234567"), ("Петро", "0509876543"), ("Марія", "0931112233")]:
+            app_func.add_contact(name, phone, birthday, book)
+        app_func.add_note(["Марія", "Купити", "квіти", "tags:Свято,дім"], book)
+        app_func.add_note(["Іван", "Звіт", "tags:робота"], book)
+        app_func.save_data(book, self.filename)
+        return book
+
+    def test_round_trip_reads_contacts_from_the_mapping(self):
+        self._populate()
+
+        book = app_func.load_data(self.filename)
+
+        self.assertIsInstance(book.data, mapped_storage.MappedRecords)
+        self.assertEqual(list(book.data), ["Іван", "Петро", "Марія"])
+        maria = book.get_contact("Марія")
+        self.assertEqual(maria.phone, "0931112233")
+        self.assertEqual(maria.birthday, self.soon.replace(year=1990))
+        self.assertEqual([(n.text, n.tags) for n in maria.notes], [("Купити квіти", ("Свято", "дім"))])
+
+    def test_read_commands_do_not_decode_the_book(self):
+        self._populate()
+        book = app_func.load_data(self.filename)
+
+        self.assertIn("Name: Марія", app_func.Contactss(["купити"], book))
+        self.assertIn("Іван", app_func.get_upcoming_birthdays(book))
+        self.assertIn("Звіт", app_func.search_notes(["#робота"], book))
+        self.assertIn("--- Тег: СВЯТО ---", app_func.sort_notes_by_tag([], book))
+        self.assertIn("Звіт", app_func.search_notes(["звіт"], book))
+        self.assertEqual([c.name for c in book.find_by_phone("0509876543")], ["Петро"])
+        self.assertEqual([c.name for c in book.find_by_name("марія")], ["Марія"])
+        self.assertEqual(book.data._cache, {})
+
+    def test_prebuilt_indexes_see_unsaved_changes(self):
+        self._populate()
+        book = app_func.load_data(self.filename)
+
+        app_func.delete_contact("Марія", book)
+        app_func.add_contact("Олег", "0501112233", "01.01.1990", book)
+        app_func.add_note(["Олег", "Купити", "хліб", "tags:свято"], book)
+
+        self.assertNotIn("Марія", app_func.Contactss(["купити"], book))
+        self.assertIn("Name: Олег", app_func.Contactss(["купити"], book))
+        self.assertEqual([name for name, _ in book.index("tags").notes("свято")], ["Олег"])
+
+    def test_search_notes_ranks_words_from_the_snapshot_tables(self):
+        self._populate()
+        expected = mapped_storage.read_snapshot(self.filename, app_func.BOOK_FACTORIES)
+        book = app_func.load_data(self.filename)
+        queries = ["купити", "св OR звіт", "квіти свято", "робот", "нічого"]
+
+        def assert_same_results():
+            with patch.object(book.data.snapshot, "contact", side_effect=AssertionError("decoded")):
+                for query in queries:
+                    groups = indexes.parse_text_query(query)
+                    self.assertEqual(book.index("text").search(groups),
+                                     expected.index("text").search(groups), query)
+
+        self.assertIsInstance(book.index("text"), mapped_storage.MappedTextIndex)
+        assert_same_results()
+        for changed in (book, expected):
+            app_func.delete_contact("Марія", changed)
+            app_func.add_contact("Олег", "0501112233", "01.01.1990", changed)
+            app_func.add_note(["Олег", "Купити", "хліб", "tags:свято"], changed)
+            app_func.add_note(["Іван", "Купити", "папір", "для", "звіту"], changed)
+        assert_same_results()
+        self.assertEqual(app_func.search_notes(["купити"], book), app_func.search_notes(["купити"], expected))
+
+        book.data.snapshot.has_text_index = False  # знімок версії 2 — індекс будується в пам'яті
+        self.assertIsNone(book.data.prebuilt_index("text"))
+
+    def test_changes_are_journaled_and_compacted_into_new_snapshot(self):
+        self._populate()
+        snapshot_size = os.path.getsize(self.filename)
+        book = app_func.load_data(self.filename)
+
+        app_func.edit_contact("Іван", "Іванна", "-", "ivanna@example.com", book)
+        app_func.delete_contact("Петро", book)
+        app_func.save_data(book)
+
+        self.assertEqual(os.path.getsize(self.filename), snapshot_size)
+        reloaded = app_func.load_data(self.filename)
+        self.assertEqual(list(reloaded.data), ["Марія", "Іванна"])
+        self.assertEqual(reloaded.get_contact("Іванна").email, "ivanna@example.com")
+
+        storage.get_journal(self.filename).compact(self.filename, mapped_storage.read_snapshot,
+                                                   mapped_storage.write_snapshot)
+        compacted = app_func.load_data(self.filename)
+        self.assertEqual(list(compacted.data), ["Марія", "Іванна"])
+        self.assertEqual(os.path.getsize(self.filename + storage.JOURNAL_SUFFIX), 0)
+
+    def test_sync_overlays_other_session_changes_on_prebuilt_indexes(self):
+        self._populate()
+        first = app_func.load_data(self.filename)
+        second = app_func.load_data(self.filename)
+        self.assertIn("Name: Марія", app_func.Contactss(["купити"], first))
+
+        app_func.delete_contact("Марія", second)
+        app_func.add_contact("Олег", "0501112233", "01.01.1990", second)
+        app_func.add_note(["Олег", "Купити", "хліб"], second)
+        app_func.save_data(second)
+
+        self.assertEqual(app_func.sync_data(first), 2)
+        self.assertNotIn("Марія", app_func.Contactss(["купити"], first))
+        self.assertIn("Name: Олег", app_func.Contactss(["купити"], first))
+
+    def test_migrate_from_pickle(self):
+        pickle_filename = os.path.join(self.tmp_dir.name, "addressbook.pkl")
+        book = app_func.load_data(pickle_filename)
+        app_func.add_contact("Іван", "0671234567", "12.05.1990", book)
+        app_func.add_note(["Іван", "Нотатка", "tags:робота"], book)
+        app_func.save_data(book)
+
+        migrated = app_func.migrate_data(pickle_filename, self.filename)
+
+        self.assertEqual(migrated, 1)
+        note = app_func.load_data(self.filename).get_contact("Іван").notes[0]
+        self.assertEqual((note.text, note.tags), ("Нотатка", ("робота",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
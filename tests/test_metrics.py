@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import metrics
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_are_within_bucket_width(self):
+        histogram = metrics.LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.add(ms / 1000)
+        summary = histogram.summary()
+        self.assertEqual((summary["count"], summary["max_ms"]), (100, 100.0))
+        for key, expected in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99)):
+            self.assertGreaterEqual(summary[key], expected)
+            self.assertLessEqual(summary[key], expected * 1.13)
+        self.assertAlmostEqual(histogram.percentile(1.0), 0.1)
+        self.assertEqual(histogram.format("⏱ Команди"),
+                         f"⏱ Команди: 100 шт., p50 {summary['p50_ms']} мс, p95 {summary['p95_ms']} мс, "
+                         f"p99 {summary['p99_ms']} мс, макс. 100.0 мс")
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        metrics.METRICS.reset()
+        self.addCleanup(metrics.METRICS.reset)
+
+    def test_export_appends_json_lines(self):
+        with metrics.METRICS.timer("command:add"):
+            pass
+        metrics.METRICS.count("command.errors")
+        filename = os.path.join(self.tmp_dir, "metrics", "stats.jsonl")
+        metrics.METRICS.export(filename)
+        metrics.METRICS.export(filename)
+
+        with open(filename, encoding="utf-8") as file:
+            snapshots = [json.loads(line) for line in file]
+        self.assertEqual(len(snapshots), 2)
+        self.assertEqual(snapshots[0]["latency"]["command:add"]["count"], 1)
+        self.assertEqual(snapshots[0]["counters"], {"command.errors": 1})
+
+    def test_stats_table_lists_operations_and_counters(self):
+        self.assertIn("Ще не виконано жодної команди.", metrics.METRICS.format())
+        metrics.METRICS.observe("command:find", 0.004)
+        metrics.METRICS.count("save_data.bytes", 2048)
+        metrics.METRICS.count("command.errors")
+
+        lines = metrics.METRICS.format().splitlines()
+        self.assertTrue(lines[1].startswith("Операція"))
+        self.assertEqual(lines[2].split()[:2], ["command:find", "1"])
+        self.assertEqual(sorted(lines[3:]), ["command.errors: 1", "save_data.bytes: 2.0 КБ"])
+
+    def test_save_and_load_are_timed_and_bytes_counted(self):
+        for extension in ("pkl", "db"):
+            metrics.METRICS.reset()
+            filename = os.path.join(self.tmp_dir, f"addressbook.{extension}")
+            book = app_func.load_data(filename)
+            app_func.add_contact("Іван", "0671234567", "12.05.1990", book)
+            app_func.add_note(["Іван", "Купити", "квіти"], book)
+            app_func.save_data(book)
+
+            snapshot = metrics.METRICS.snapshot()
+            self.assertEqual(snapshot["latency"]["load_data"]["count"], 1)
+            self.assertEqual(snapshot["latency"]["save_data"]["count"], 2)
+            self.assertGreater(snapshot["counters"]["save_data.bytes"], len("Іван0671234567Купити квіти"))
+
+
+if __name__ == "__main__":
+    unittest.main()
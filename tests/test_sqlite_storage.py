@@ -0,0 +1,90 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "addressbook.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _populate(self):
+        book = app_func.load_data(self.filename)
+        for name, phone in [("Іван", "0671234567"), ("Петро", "0509876543"), ("Марія", "0931112233")]:
+            app_func.add_contact(name, phone, "12.05.1990", book)
+        app_func.add_note(["Марія", "Купити", "квіти", "tags:свято,дім"], book)
+        app_func.save_data(book)
+        return book
+
+    def test_round_trip_preserves_contacts_notes_and_order(self):
+        self._populate()
+
+        book = app_func.load_data(self.filename)
+
+        self.assertEqual(book.data._cache, {})
+        self.assertEqual(list(book.data), ["Іван", "Петро", "Марія"])
+        maria = book.get_contact("Марія")
+        self.assertEqual(maria.phone, "0931112233")
+        self.assertEqual(maria.birthday.isoformat(), "1990-05-12")
+        self.assertEqual([(n.text, n.tags) for n in maria.notes], [("Купити квіти", ("свято", "дім"))])
+        self.assertIn("Name: Петро", app_func.show_all_contacts(book))
+        self.assertEqual(list(book.data._cache), ["Марія"])
+
+    def test_only_changed_rows_are_written(self):
+        self._populate()
+        book = app_func.load_data(self.filename)
+
+        app_func.edit_contact("Іван", "Іванна", "-", "ivanna@example.com", book)
+        app_func.delete_contact("Петро", book)
+        app_func.add_note(["Марія", "Подзвонити"], book)
+        app_func.save_data(book)
+
+        reloaded = app_func.load_data(self.filename)
+        self.assertEqual(list(reloaded.data), ["Марія", "Іванна"])
+        self.assertEqual(len(reloaded.data), 2)
+        self.assertEqual(reloaded.get_contact("Іванна").email, "ivanna@example.com")
+        self.assertEqual(len(reloaded.get_contact("Марія").notes), 2)
+        self.assertIsNone(reloaded.get_contact("Петро"))
+
+    def test_sync_drops_contacts_changed_by_another_connection(self):
+        self._populate()
+        first = app_func.load_data(self.filename)
+        second = app_func.load_data(self.filename)
+        self.assertEqual([c.name for c in first.find_by_phone("0671234567")], ["Іван"])
+        self.assertEqual(app_func.sync_data(first), 0)
+
+        app_func.add_note(["Петро", "Новий"], first)
+        app_func.edit_contact("Іван", "-", "0990000000", second)
+
+        self.assertEqual(app_func.sync_data(first), 3)
+        self.assertEqual(first.get_contact("Іван").phone, "0990000000")
+        self.assertEqual([n.text for n in first.get_contact("Петро").notes], ["Новий"])
+        self.assertEqual([c.name for c in first.find_by_phone("0990000000")], ["Іван"])
+
+    def test_migrate_from_pickle(self):
+        pickle_filename = os.path.join(self.tmp_dir.name, "addressbook.pkl")
+        book = app_func.load_data(pickle_filename)
+        app_func.add_contact("Іван", "0671234567", "12.05.1990", book)
+        app_func.add_note(["Іван", "Нотатка", "tags:робота"], book)
+        app_func.save_data(book)
+
+        migrated = app_func.migrate_to_sqlite(pickle_filename, self.filename)
+
+        self.assertEqual(migrated, 1)
+        note = app_func.load_data(self.filename).get_contact("Іван").notes[0]
+        self.assertEqual((note.text, note.tags), ("Нотатка", ("робота",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,236 @@
+import os
+import pickle
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import app_func
+import storage
+
+
+def _make_contact(name: str, phone: str = "0123456789") -> app_func.Contact:
+    contact = app_func.Contact(name)
+    contact.add_phone(phone)
+    return contact
+
+
+class TestJournaledStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "addressbook.pkl")
+        self.journal_path = self.filename + storage.JOURNAL_SUFFIX
+
+    def tearDown(self):
+        storage.get_journal(self.filename).wait()
+        self.tmp_dir.cleanup()
+
+    def test_mutations_after_first_save_go_to_journal(self):
+        book = app_func.AddressBook()
+        book.add_contact(_make_contact("Іван"))
+        app_func.save_data(book, self.filename)
+        snapshot_size = os.path.getsize(self.filename)
+
+        book.add_contact(_make_contact("Петро"))
+        book.delete_contact("Іван")
+        app_func.save_data(book, self.filename)
+
+        self.assertEqual(os.path.getsize(self.filename), snapshot_size)
+        self.assertGreater(os.path.getsize(self.journal_path), 0)
+        loaded = app_func.load_data(self.filename)
+        self.assertEqual(list(loaded.data), ["Петро"])
+
+    def test_torn_journal_tail_is_ignored(self):
+        book = app_func.AddressBook()
+        app_func.save_data(book, self.filename)
+        book.add_contact(_make_contact("Іван"))
+        app_func.save_data(book, self.filename)
+        with open(self.journal_path, "ab") as file:
+            file.write(b"\x40\x00\x00\x00garbage")
+
+        loaded = app_func.load_data(self.filename)
+
+        self.assertEqual(list(loaded.data), ["Іван"])
+        loaded.add_contact(_make_contact("Марія"))
+        app_func.save_data(loaded, self.filename)
+        self.assertEqual(sorted(app_func.load_data(self.filename).data), ["Іван", "Марія"])
+
+    def test_pickle_journal_record_is_not_loaded(self):
+        book = app_func.AddressBook()
+        app_func.save_data(book, self.filename)
+        record = pickle.dumps((storage.OP_DELETE, "Іван", None))
+        with open(self.journal_path, "wb") as file:
+            file.write(struct.pack("<4sBI", storage.JOURNAL_MAGIC, storage.JOURNAL_VERSION,
+                                   storage.snapshot_id(self.filename)))
+            file.write(struct.pack("<II", len(record), zlib.crc32(record)) + record)
+
+        with self.assertRaises(storage.LegacyFormatError):
+            app_func.load_data(self.filename)
+
+    def test_journal_of_another_snapshot_is_set_aside(self):
+        other = os.path.join(self.tmp_dir.name, "other.pkl")
+        book = app_func.load_data(other)
+        app_func.add_contact("Чужий", "0501112233", "01.01.1990", book)
+        app_func.add_contact("Ще чужий", "0501112233", "01.01.1990", book)
+        storage.get_journal(other).wait()
+        fresh = app_func.AddressBook()
+        fresh.add_contact(_make_contact("Іван"))
+        app_func.save_data(fresh, self.filename)
+        os.replace(other + storage.JOURNAL_SUFFIX, self.journal_path)
+
+        loaded = app_func.load_data(self.filename)
+
+        self.assertEqual(list(loaded.data), ["Іван"])
+        self.assertFalse(os.path.exists(self.journal_path))
+        self.assertTrue(os.path.exists(self.journal_path + storage.ORPHANED_SUFFIX))
+        app_func.add_contact("Марія", "0931112233", "01.01.1990", loaded)
+        self.assertEqual(list(app_func.load_data(self.filename).data), ["Іван", "Марія"])
+
+    def test_journal_without_header_is_refused(self):
+        book = app_func.AddressBook()
+        app_func.save_data(book, self.filename)
+        with open(self.journal_path, "wb") as file:
+            file.write(storage._encode_record(storage.OP_DELETE, "Іван", None))
+
+        with self.assertRaises(storage.LegacyFormatError):
+            app_func.load_data(self.filename)
+
+    def test_compaction_folds_journal_into_snapshot(self):
+        book = app_func.AddressBook()
+        app_func.save_data(book, self.filename)
+        book.add_contact(_make_contact("Іван"))
+        app_func.save_data(book, self.filename)
+
+        storage.get_journal(self.filename).compact(self.filename)
+
+        self.assertEqual(os.path.getsize(self.journal_path), 0)
+        self.assertEqual(list(storage.read_snapshot(self.filename, app_func.BOOK_FACTORIES).data), ["Іван"])
+
+    def test_deferred_saves_flush_once(self):
+        book = app_func.load_data(self.filename)
+        app_func.save_data(book)
+
+        with patch.object(storage.SnapshotStorage, "write_changes", autospec=True,
+                          side_effect=storage.SnapshotStorage.write_changes) as write_changes:
+            with app_func.deferred_saves(book):
+                for i in range(5):
+                    app_func.add_contact(f"Контакт{i}", "0123456789", "01.01.1990", book)
+                self.assertEqual(write_changes.call_count, 0)
+
+        self.assertEqual(write_changes.call_count, 1)
+        self.assertEqual(len(app_func.load_data(self.filename).data), 5)
+
+
+class TestConcurrentSessions(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "addressbook.pkl")
+        book = app_func.AddressBook()
+        book.add_contact(_make_contact("Іван"))
+        app_func.save_data(book, self.filename)
+
+    def tearDown(self):
+        storage.get_journal(self.filename).wait()
+        self.tmp_dir.cleanup()
+
+    def test_sync_merges_changes_from_other_session(self):
+        first = app_func.load_data(self.filename)
+        second = app_func.load_data(self.filename)
+        self.assertEqual(first.find_by_phone("0123456789")[0].name, "Іван")
+
+        app_func.add_note(["Іван", "Подзвонити"], first)
+        app_func.save_data(first)
+        self.assertEqual(app_func.sync_data(second), 1)
+        app_func.edit_contact("Іван", "-", "0987654321", second)
+
+        self.assertEqual(app_func.sync_data(first), 1)
+        ivan = first.get_contact("Іван")
+        self.assertEqual((ivan.phone, [note.text for note in ivan.notes]), ("0987654321", ["Подзвонити"]))
+        self.assertEqual(first.find_by_phone("0123456789"), [])
+        self.assertEqual(app_func.sync_data(first), 0)
+
+    def test_unsaved_local_changes_win_over_disk(self):
+        first = app_func.load_data(self.filename)
+        second = app_func.load_data(self.filename)
+        with app_func.deferred_saves(first):
+            app_func.edit_contact("Іван", "-", "0501112233", first)
+            app_func.delete_contact("Іван", second)
+
+        self.assertIsNone(second.get_contact("Іван"))
+        self.assertEqual(app_func.load_data(self.filename).get_contact("Іван").phone, "0501112233")
+
+    def test_snapshot_replaced_by_other_session_is_reloaded(self):
+        first = app_func.load_data(self.filename)
+        second = app_func.load_data(self.filename)
+        app_func.add_contact("Петро", "0501112233", "01.01.1990", second)
+        storage.get_journal(self.filename).compact(self.filename)
+
+        with app_func.deferred_saves(first):
+            app_func.add_contact("Марія", "0931112233", "01.01.1990", first)
+            self.assertEqual(app_func.sync_data(first), 3)
+
+        self.assertEqual(list(first.data), ["Іван", "Петро", "Марія"])
+        self.assertEqual(list(app_func.load_data(self.filename).data), ["Іван", "Петро", "Марія"])
+
+    def test_parallel_processes_do_not_lose_contacts(self):
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]); import app_func\n"
+            "book = app_func.load_data(sys.argv[2])\n"
+            "for i in range(20):\n"
+            "    app_func.add_contact(f'{sys.argv[3]}{i}', '0123456789', '01.01.1990', book)\n"
+        )
+        workers = [
+            subprocess.Popen([sys.executable, "-c", script, str(ROOT_DIR), self.filename, prefix])
+            for prefix in ("Перший", "Другий")
+        ]
+        for worker in workers:
+            self.assertEqual(worker.wait(), 0)
+
+        self.assertEqual(len(app_func.load_data(self.filename).data), 41)
+
+
+class TestAtomicSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "addressbook.pkl")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_corrupted_snapshot_falls_back_to_previous_generation(self):
+        book = app_func.AddressBook()
+        book.add_contact(_make_contact("Іван"))
+        storage.write_snapshot(book, self.filename)
+        book.add_contact(_make_contact("Петро"))
+        storage.write_snapshot(book, self.filename)
+        with open(self.filename, "r+b") as file:
+            file.seek(-3, os.SEEK_END)
+            file.write(b"xyz")
+
+        loaded = app_func.load_data(self.filename)
+
+        self.assertEqual(list(loaded.data), ["Іван"])
+        self.assertFalse(os.path.exists(self.filename + ".tmp"))
+
+    def test_legacy_pickle_without_header_is_refused_until_upgraded(self):
+        book = app_func.AddressBook()
+        book.add_contact(_make_contact("Іван"))
+        with open(self.filename, "wb") as file:
+            pickle.dump(book, file)
+
+        with self.assertRaises(storage.LegacyFormatError):
+            app_func.load_data(self.filename)
+        self.assertEqual(app_func.upgrade_legacy_data(self.filename), 1)
+        self.assertEqual(list(app_func.load_data(self.filename).data), ["Іван"])
+
+
+if __name__ == "__main__":
+    unittest.main()